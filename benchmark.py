@@ -0,0 +1,197 @@
+"""
+Pomiary wydajności najczęściej wykonywanych operacji: tworzenia planszy, rozstawiania pionów,
+tworzenia i walidacji ruchów, wyliczania możliwych ruchów oraz całych losowych partii.
+
+Wyniki zapisywane są w formacie JSON. Po podaniu pliku z wcześniejszymi wynikami (`--baseline`)
+każdy pomiar jest z nim porównywany, a program kończy się kodem 1, jeśli któryś z pomiarów jest
+wolniejszy od wcześniejszego więcej niż `--threshold` razy.
+
+Przykład uruchomienia::
+
+    python benchmark.py --sizes 8x8 64x64 512x512 10000x10000 --output bench.json
+    python benchmark.py --output bench_new.json --baseline bench.json --threshold 1.25
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from decider_example import DeciderExample
+from definitions.board import Board, Move, Pawn
+from definitions.cli import parse_size
+
+DEFAULT_SIZES = [(8, 8), (64, 64), (512, 512), (10_000, 10_000)]
+MOVES_PER_SAMPLE = 1000
+
+
+class Benchmark(NamedTuple):
+    """
+    Opis pomiaru.
+
+    * `name` - nazwa pomiaru,
+    * `setup` - funkcja (n, m) -> stan przekazywany do pomiaru; jej czas nie jest mierzony,
+    * `run` - mierzona funkcja przyjmująca stan,
+    * `cost` - szacowana liczba operacji dla planszy (n, m); zbyt kosztowne pomiary są pomijane.
+    """
+    name: str
+    setup: Callable[[int, int], object]
+    run: Callable[[object], None]
+    cost: Callable[[int, int], int]
+
+
+def _validate_moves(board: Board) -> None:
+    for i in range(MOVES_PER_SAMPLE):
+        board.is_move_legal(Move(board, Pawn.Color.WHITE, i % board.n, 1))
+
+
+def _random_game(board: Board) -> None:
+    deciders = [DeciderExample(board, Pawn.Color.WHITE), DeciderExample(board, Pawn.Color.BLACK)]
+    while board.count_legal_moves(deciders[0].color):
+        deciders[0].move()
+        deciders.reverse()
+
+
+BENCHMARKS = [
+    Benchmark('construct_board',
+              lambda n, m: (n, m),
+              lambda size: Board(*size),
+              lambda n, m: n * m),
+    Benchmark('construct_compact_board',
+              lambda n, m: (n, m),
+              lambda size: Board(*size, compact=True),
+              lambda n, m: n),
+    Benchmark('place_default_pawns',
+              lambda n, m: Board(n, m, with_pawns=False),
+              lambda board: board.place_default_pawns(),
+              lambda n, m: n * m),
+    Benchmark('place_default_pawns_compact',
+              lambda n, m: Board(n, m, with_pawns=False, compact=True),
+              lambda board: board.place_default_pawns(),
+              lambda n, m: n),
+    Benchmark('move_create_and_validate',
+              lambda n, m: Board(n, m, compact=True),
+              _validate_moves,
+              lambda n, m: n + MOVES_PER_SAMPLE),
+    Benchmark('list_possible_moves',
+              lambda n, m: DeciderExample(Board(n, m, compact=True), Pawn.Color.WHITE),
+              lambda decider: decider.list_possible_moves(),
+              lambda n, m: n * m),
+    Benchmark('random_game',
+              lambda n, m: (n, m),
+              lambda size: _random_game(Board(*size, compact=True)),
+              lambda n, m: n * n * m),
+]
+
+
+def run_benchmarks(sizes: Sequence[Tuple[int, int]] = DEFAULT_SIZES,
+                   repeat: int = 5,
+                   max_cost: int = 20_000_000,
+                   names: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Wykonuje pomiary dla wszystkich rozmiarów plansz. Każdy pomiar powtarzany jest `repeat` razy
+    i zapisywany jest czas najkrótszy oraz mediana.
+
+    :param sizes: Rozmiary plansz jako pary (n, m)
+    :type sizes: Sequence[Tuple[int, int]]
+    :param repeat: Liczba powtórzeń każdego pomiaru
+    :type repeat: int
+    :param max_cost: Pomiary o szacowanym koszcie większym niż ta wartość są pomijane
+    :type max_cost: int
+    :param names: Nazwy pomiarów do wykonania; domyślnie wszystkie
+    :type names: Optional[Sequence[str]]
+
+    :return: Wyniki pomiarów
+    :type: List[Dict]
+    """
+    results = []
+    for benchmark in BENCHMARKS:
+        if names is not None and benchmark.name not in names:
+            continue
+        for n, m in sizes:
+            result = {'name': benchmark.name, 'n': n, 'm': m}
+            if benchmark.cost(n, m) > max_cost:
+                result['skipped'] = f'szacowany koszt {benchmark.cost(n, m)} > {max_cost}'
+                results.append(result)
+                continue
+            timings = []
+            for _ in range(repeat):
+                state = benchmark.setup(n, m)
+                start = perf_counter()
+                benchmark.run(state)
+                timings.append(perf_counter() - start)
+            result['seconds_min'] = min(timings)
+            result['seconds_median'] = statistics.median(timings)
+            result['repeat'] = repeat
+            results.append(result)
+    return results
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    """
+    Porównuje wyniki z wcześniejszymi. Porównywane są najkrótsze czasy pomiarów o tej samej nazwie
+    i rozmiarze planszy.
+
+    :param results: Bieżące wyniki
+    :type results: List[Dict]
+    :param baseline: Wcześniejsze wyniki
+    :type baseline: List[Dict]
+    :param threshold: Dopuszczalny stosunek czasu bieżącego do wcześniejszego
+    :type threshold: float
+
+    :return: Pomiary, które zwolniły bardziej niż dopuszcza `threshold`, z polem `ratio`
+    :type: List[Dict]
+    """
+    previous = {(result['name'], result['n'], result['m']): result
+                for result in baseline if 'seconds_min' in result}
+    regressions = []
+    for result in results:
+        old = previous.get((result['name'], result['n'], result['m']))
+        if old is None or 'seconds_min' not in result or old['seconds_min'] <= 0:
+            continue
+        ratio = result['seconds_min'] / old['seconds_min']
+        if ratio > threshold:
+            regressions.append({**result, 'baseline_seconds_min': old['seconds_min'], 'ratio': ratio})
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Pomiary wydajności planszy i programów decyzyjnych.')
+    parser.add_argument('--sizes', nargs='+', default=[f'{n}x{m}' for n, m in DEFAULT_SIZES])
+    parser.add_argument('--benchmarks', nargs='+', default=None,
+                        choices=[benchmark.name for benchmark in BENCHMARKS])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-cost', type=int, default=20_000_000)
+    parser.add_argument('--output', default=None, help='plik wyników JSON; domyślnie standardowe wyjście')
+    parser.add_argument('--baseline', default=None, help='plik z wcześniejszymi wynikami do porównania')
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks([parse_size(size) for size in args.sizes],
+                             args.repeat, args.max_cost, args.benchmarks)
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.baseline is not None:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            report['regressions'] = compare(results, json.load(baseline_file)['results'], args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(text + '\n')
+
+    for regression in report.get('regressions', []):
+        print(f"Regresja: {regression['name']} {regression['n']}x{regression['m']} "
+              f"{regression['ratio']:.2f}x wolniej", file=sys.stderr)
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
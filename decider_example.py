@@ -1,8 +1,7 @@
 """
 Przykładowy program decyzyjny. Stworzenie podobnego programu jest jednym z celi PZ2.
 """
-from random import choice
-from typing import List
+from typing import List, Optional, Tuple
 
 from definitions.board import Move
 from definitions.decider_base import DeciderBase
@@ -14,16 +13,10 @@ class DeciderExample(DeciderBase):
         :type: List[Move]
         """
         possible_moves = []
-        for i, col in enumerate(self.board.fields):
-            my_pawn = None
-            enemy_pawn = None
-            for j, field in enumerate(col):
-                if field.pawn is None:
-                    continue
-                if field.pawn.color == self.color:
-                    my_pawn = j
-                else:
-                    enemy_pawn = j
+        enemy_color = self.color.opposite()
+        for i in range(self.board.n):
+            my_pawn = self.board.pawn_row(self.color, i)
+            enemy_pawn = self.board.pawn_row(enemy_color, i)
             if my_pawn is None or enemy_pawn is None:
                 raise AttributeError("Plansza wygląda na błędnie zdefiniowaną - nie umiem znaleźć "
                                      "piona mojego lub przeciwnika.")
@@ -37,10 +30,12 @@ class DeciderExample(DeciderBase):
                     pass
         return possible_moves
 
-    def move(self) -> None:
+    def find_move(self) -> Optional[Tuple[int, int]]:
         """
-        Tworzy listę możliwych ruchów, a następnie wybiera i wykonuje losowy z nich.
+        Losuje jeden z możliwych ruchów. Ruch losowany jest przez `Board.random_legal_move`, więc
+        nie trzeba budować listy wszystkich ruchów.
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
         """
-        possible_moves = self.list_possible_moves()
-        move = choice(possible_moves)
-        self.board.move_pawn(move)
\ No newline at end of file
+        return self.board.random_legal_move(self.color)
\ No newline at end of file
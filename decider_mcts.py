@@ -0,0 +1,256 @@
+"""
+Program decyzyjny oparty na przeszukiwaniu drzewa gry metodą Monte Carlo (MCTS).
+
+Przeszukiwanie jest zrównoleglone na poziomie korzenia: każdy proces z puli
+`ProcessPoolExecutor` buduje własne drzewo z tej samej pozycji, a na koniec liczby odwiedzin ruchów
+z korzenia są sumowane. Procesy nie dostają zserializowanego grafu obiektów `Field`/`Pawn`, lecz
+jedynie wymiary planszy i dwie tablice wierszy pionów.
+"""
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from definitions.board import Board, Move, Pawn
+from definitions.decider_base import DeciderBase
+
+BoardSnapshot = Tuple[int, int, bytes, bytes]
+"""Zapis pozycji przesyłany do procesów: (n, m, wiersze pionów białych, wiersze pionów czarnych)."""
+
+
+def snapshot_board(board: Board) -> BoardSnapshot:
+    """
+    :return: Zwarty zapis pozycji planszy
+    :type: BoardSnapshot
+    """
+    return board.n, board.m, board._white.tobytes(), board._black.tobytes()
+
+
+def restore_board(snapshot: BoardSnapshot) -> Board:
+    """
+    Odtwarza planszę kompaktową z zapisu utworzonego przez `snapshot_board`.
+
+    :param snapshot: Zapis pozycji
+    :type snapshot: BoardSnapshot
+
+    :return: Plansza w zapisanej pozycji
+    :type: Board
+    """
+    n, m, white, black = snapshot
+    return Board.from_buffer(white + black, m)
+
+
+def random_playout(heaps: List[int], rng: random.Random) -> bool:
+    """
+    Rozgrywa losową partię do końca, traktując każdą kolumnę jako stos o wielkości `gap - 1`.
+    Każdy ruch losowany jest jednostajnie spośród wszystkich dozwolonych ruchów, tak jak
+    w `Board.random_legal_move`, ale dzięki drzewu Fenwicka trwa O(log n) zamiast O(n).
+
+    :param heaps: Wielkości stosów; lista jest modyfikowana
+    :type heaps: List[int]
+    :param rng: Generator liczb losowych
+    :type rng: random.Random
+
+    :return: True, jeśli wygrał gracz wykonujący pierwszy ruch (wykonał ostatni ruch partii)
+    :type: bool
+    """
+    n = len(heaps)
+    tree = [0] * (n + 1)
+    for i, heap in enumerate(heaps, 1):
+        tree[i] += heap
+        parent = i + (i & -i)
+        if parent <= n:
+            tree[parent] += tree[i]
+    total = sum(heaps)
+    top = 1 << n.bit_length()
+
+    first_player_moved_last = False
+    while total:
+        index = rng.randrange(total)
+        position = 0
+        step = top
+        while step:
+            candidate = position + step
+            if candidate <= n and tree[candidate] <= index:
+                position = candidate
+                index -= tree[candidate]
+            step >>= 1
+        taken = heaps[position] - index
+        heaps[position] = index
+        total -= taken
+        i = position + 1
+        while i <= n:
+            tree[i] -= taken
+            i += i & -i
+        first_player_moved_last = not first_player_moved_last
+    return first_player_moved_last
+
+
+class _Node:
+    """
+    Węzeł drzewa MCTS. `wins` liczy wygrane gracza, który wykonał ruch prowadzący do węzła.
+    """
+
+    __slots__ = ('move', 'parent', 'children', 'legal_moves', 'visits', 'wins')
+
+    def __init__(self, move: Optional[Tuple[int, int]], parent: Optional['_Node'], legal_moves: int) -> None:
+        self.move = move
+        self.parent = parent
+        self.children: Dict[Tuple[int, int], _Node] = {}
+        self.legal_moves = legal_moves
+        self.visits = 0
+        self.wins = 0
+
+    def select_child(self, exploration: float) -> '_Node':
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+def _untried_move(node: _Node, board: Board, color: Pawn.Color, rng: random.Random) -> Tuple[int, int]:
+    """
+    Wybiera losowy ruch, który nie ma jeszcze węzła w drzewie. Dopóki niewypróbowanych ruchów jest
+    dużo, losuje je bez budowania listy; potem przegląda ruchy po kolei.
+    """
+    if len(node.children) * 2 < node.legal_moves:
+        while True:
+            move = board.random_legal_move(color, rng)
+            if move not in node.children:
+                return move
+    for move in board.iter_legal_moves(color):
+        if move not in node.children:
+            return move
+    raise AssertionError("Wszystkie ruchy zostały już wypróbowane.")
+
+
+def search_tree(snapshot: BoardSnapshot,
+                color: Pawn.Color,
+                time_budget: float,
+                iterations: Optional[int],
+                exploration: float,
+                seed: int) -> Tuple[Dict[Tuple[int, int], int], int]:
+    """
+    Buduje jedno drzewo MCTS z pozycji `snapshot`, w której ruch wykonuje `color`. Funkcja jest
+    wykonywana w procesach puli.
+
+    :return: Liczby odwiedzin ruchów z korzenia oraz liczba rozegranych partii losowych
+    :type: Tuple[Dict[Tuple[int, int], int], int]
+    """
+    rng = random.Random(seed)
+    board = restore_board(snapshot)
+    root = _Node(None, None, board.count_legal_moves(color))
+    deadline = perf_counter() + time_budget
+    playouts = 0
+
+    while (playouts < iterations) if iterations is not None else (perf_counter() < deadline):
+        node = root
+        to_move = color
+        path: List[Move] = []
+
+        while node.legal_moves and len(node.children) == node.legal_moves:
+            node = node.select_child(exploration)
+            path.append(Move(board, to_move, *node.move))
+            board.move_pawn(path[-1])
+            to_move = to_move.opposite()
+
+        if node.legal_moves:
+            move = _untried_move(node, board, to_move, rng)
+            path.append(Move(board, to_move, *move))
+            board.move_pawn(path[-1])
+            to_move = to_move.opposite()
+            child = _Node(move, node, board.count_legal_moves(to_move))
+            node.children[move] = child
+            node = child
+
+        mover_won = not random_playout([board.gap(column) - 1 for column in range(board.n)], rng)
+        playouts += 1
+        while node is not None:
+            node.visits += 1
+            node.wins += mover_won
+            mover_won = not mover_won
+            node = node.parent
+
+        for move in reversed(path):
+            board.unmake_move(move)
+
+    return {move: child.visits for move, child in root.children.items()}, playouts
+
+
+class DeciderMCTS(DeciderBase):
+    def __init__(self,
+                 board: Board,
+                 color: Pawn.Color,
+                 time_budget: float = 1.0,
+                 workers: Optional[int] = None,
+                 iterations: Optional[int] = None,
+                 exploration: float = math.sqrt(2)) -> None:
+        """
+        :param board: Plansza, na której toczy się rozgrywka
+        :type board: Board
+        :param color: Kolor pionów programu
+        :type color: Pawn.Color
+        :param time_budget: Czas w sekundach, jaki każdy proces poświęca na budowę drzewa
+        :type time_budget: float
+        :param workers: Liczba procesów; domyślnie liczba rdzeni, a w procesie potomnym (np. procesie
+            puli turnieju) 0. 0 oznacza przeszukiwanie w bieżącym procesie
+        :type workers: Optional[int]
+        :param iterations: Stała liczba partii losowych na proces zamiast limitu czasu
+        :type iterations: Optional[int]
+        :param exploration: Stała eksploracji we wzorze UCT
+        :type exploration: float
+        """
+        super().__init__(board, color)
+        self.time_budget = time_budget
+        if workers is None:
+            workers = 0 if multiprocessing.parent_process() is not None else (os.cpu_count() or 1)
+        self.workers = workers
+        self.iterations = iterations
+        self.exploration = exploration
+        self.playouts = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def find_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Przeszukuje drzewo gry we wszystkich procesach i wybiera ruch z korzenia, który łącznie
+        został odwiedzony najwięcej razy.
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
+        """
+        if self.board.count_legal_moves(self.color) == 0:
+            return None
+
+        snapshot = snapshot_board(self.board)
+        seeds = [random.getrandbits(64) for _ in range(max(self.workers, 1))]
+        arguments = (snapshot, self.color, self.time_budget, self.iterations, self.exploration)
+        if self.workers == 0:
+            results = [search_tree(*arguments, seeds[0])]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [self._executor.submit(search_tree, *arguments, seed) for seed in seeds]
+            results = [future.result() for future in futures]
+
+        visits: Dict[Tuple[int, int], int] = {}
+        self.playouts = 0
+        for root_visits, playouts in results:
+            self.playouts += playouts
+            for move, count in root_visits.items():
+                visits[move] = visits.get(move, 0) + count
+        if not visits:
+            return self.board.random_legal_move(self.color)
+        return max(visits, key=visits.get)
+
+    def close(self) -> None:
+        """
+        Zamyka pulę procesów bez czekania na przeszukiwania, które wciąż trwają (np. po przekroczeniu
+        limitu czasu na ruch) - procesy kończą się po nich same. Program można dalej
+        wykorzystywać - pula zostanie utworzona ponownie przy następnym ruchu.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,259 @@
+"""
+Program decyzyjny przeszukujący drzewo gry algorytmem negamax z odcięciami alfa-beta.
+
+Przeszukiwanie odbywa się w miejscu - ruchy są wykonywane i cofane na planszy (`Board.move_pawn`
+i `Board.unmake_move`), bez kopiowania jej w każdym węźle. Głębokość zwiększana jest iteracyjnie,
+dopóki nie skończy się czas przydzielony na ruch; wtedy wykonywany jest najlepszy znaleziony ruch.
+
+Indeksy planszy, których budowa zajmuje czas O(n) (indeks stosów, klucz pozycji), budowane są już
+w konstruktorze, a potem utrzymywane przyrostowo, więc na dużych planszach nie zużywają czasu
+przydzielonego na ruch. Plansza podmieniona po utworzeniu programu buduje je w ramach tego czasu.
+"""
+from itertools import chain
+from time import perf_counter
+from typing import Iterator, Optional, Tuple
+
+from definitions.board import Board, Move, Pawn
+from definitions.decider_base import DeciderBase
+from definitions.transposition import TranspositionTable
+
+WIN_SCORE = 1_000_000
+"""Ocena pozycji wygranej. Wygrane szybsze otrzymują wyższą ocenę (WIN_SCORE - liczba półruchów)."""
+
+_BLACK_TO_MOVE = 0xF1E2D3C4B5A69788
+"""Klucz dołączany do hasza pozycji, gdy ruch wykonuje gracz czarny."""
+
+_WIN_THRESHOLD = WIN_SCORE - 1000
+"""Oceny o wartości bezwzględnej co najmniej tej wielkości oznaczają wygraną lub przegraną."""
+
+
+class _SearchTimeout(Exception):
+    """
+    Przerywa przeszukiwanie, gdy skończył się czas przydzielony na ruch.
+    """
+    pass
+
+
+class DeciderNegamax(DeciderBase):
+    def __init__(self,
+                 board: Board,
+                 color: Pawn.Color,
+                 time_budget: float = 1.0,
+                 max_depth: int = 64,
+                 table: Optional[TranspositionTable] = None,
+                 canonical_keys: bool = True) -> None:
+        """
+        :param board: Plansza, na której toczy się rozgrywka
+        :type board: Board
+        :param color: Kolor pionów programu
+        :type color: Pawn.Color
+        :param time_budget: Czas w sekundach, jaki może zająć jedno wywołanie `move`
+        :type time_budget: float
+        :param max_depth: Maksymalna głębokość przeszukiwania w półruchach
+        :type max_depth: int
+        :param table: Tablica transpozycji; można ją współdzielić między programami
+        :type table: Optional[TranspositionTable]
+        :param canonical_keys: Indeksowanie tablicy transpozycji kluczem `Board.canonical_key`, wspólnym
+            dla pozycji symetrycznych, zamiast haszem Zobrista
+        :type canonical_keys: bool
+        """
+        super().__init__(board, color)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table = table if table is not None else TranspositionTable()
+        self.canonical_keys = canonical_keys
+        self.nodes = 0
+        self.depth_reached = 0
+        self._killers: list[list[Tuple[int, int]]] = []
+        self._deadline = 0.0
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """
+        Buduje leniwe indeksy planszy używane w każdym węźle przeszukiwania: zbiór kolumn z ruchami
+        (`Board.iter_legal_moves`) i klucz pozycji tablicy transpozycji.
+        """
+        self.board.any_open_column()
+        if self.canonical_keys:
+            self.board.canonical_key(self.color)
+        else:
+            self.board.zobrist_hash
+
+    def evaluate(self, color: Pawn.Color) -> float:
+        """
+        Heurystyczna ocena pozycji z punktu widzenia gracza `color`, który wykonuje ruch. Metodę można
+        nadpisać w klasie pochodnej.
+
+        Domyślnie zakłada, że obaj gracze będą przesuwać piony o jedno pole - wtedy wygrywa ten, kto
+        wykona ostatni ruch, czyli gracz wykonujący ruch, gdy łączna liczba ruchów jest nieparzysta.
+
+        :param color: Kolor gracza wykonującego ruch
+        :type color: Pawn.Color
+
+        :return: Ocena pozycji - dodatnia, gdy pozycja jest korzystna dla `color`
+        :type: float
+        """
+        return 1.0 if self.board.count_legal_moves(color) % 2 else -1.0
+
+    def find_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Przeszukuje drzewo gry z iteracyjnie zwiększaną głębokością, aż do wyczerpania czasu,
+        osiągnięcia `max_depth` lub znalezienia wygranej. Zawsze zwraca najlepszy ruch znaleziony
+        do tej pory - także wtedy, gdy czas skończy się w trakcie pierwszej iteracji.
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
+        """
+        self._deadline = perf_counter() + self.time_budget
+        self.nodes = 0
+        self.depth_reached = 0
+        self._killers = [[] for _ in range(self.max_depth + 1)]
+
+        best_move = next(self._ordered_moves(self.color, 0), None)
+        if best_move is None:
+            return None
+
+        for depth in range(1, self.max_depth + 1):
+            iteration_best = None
+            alpha = -WIN_SCORE - 1
+            try:
+                for move in self._ordered_moves(self.color, 0, first=best_move):
+                    score = -self._search_move(move, self.color, depth, 0, alpha, WIN_SCORE + 1)
+                    if iteration_best is None or score > alpha:
+                        alpha = score
+                        iteration_best = move
+            except _SearchTimeout:
+                # Pierwszym przeszukanym ruchem był najlepszy ruch poprzedniej iteracji, więc
+                # częściowy wynik bieżącej iteracji nie może być od niego gorszy.
+                if iteration_best is not None:
+                    best_move = iteration_best
+                break
+            best_move = iteration_best
+            self.depth_reached = depth
+            if abs(alpha) >= _WIN_THRESHOLD:
+                break
+        return best_move
+
+    def _negamax(self, color: Pawn.Color, depth: int, ply: int, alpha: float, beta: float) -> float:
+        """
+        Zwraca ocenę pozycji z punktu widzenia gracza `color`, który wykonuje ruch.
+        """
+        self.nodes += 1
+        if perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        if self.canonical_keys:
+            key = self.board.canonical_key(color)
+        else:
+            key = self.board.zobrist_hash ^ (_BLACK_TO_MOVE if color == Pawn.Color.BLACK else 0)
+        entry = self.table.probe(key)
+        table_move = None
+        if entry is not None:
+            table_move = entry.move
+            if entry.depth >= depth:
+                value = self._from_table(entry.value, ply)
+                if entry.flag == TranspositionTable.EXACT:
+                    return value
+                if entry.flag == TranspositionTable.LOWER_BOUND and value >= beta:
+                    return value
+                if entry.flag == TranspositionTable.UPPER_BOUND and value <= alpha:
+                    return value
+
+        if self.board.count_legal_moves(color) == 0:
+            return -(WIN_SCORE - ply)
+        if depth == 0:
+            return self.evaluate(color)
+
+        moves = self._ordered_moves(color, ply, first=table_move)
+        first_move = next(moves)
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = first_move
+        for move in chain((first_move,), moves):
+            score = -self._search_move(move, color, depth, ply, alpha, beta)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._remember_killer(move, ply)
+                break
+
+        if best_score <= original_alpha:
+            flag = TranspositionTable.UPPER_BOUND
+        elif best_score >= beta:
+            flag = TranspositionTable.LOWER_BOUND
+        else:
+            flag = TranspositionTable.EXACT
+        self.table.store(key, depth, self._to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def _search_move(self,
+                     move: Tuple[int, int],
+                     color: Pawn.Color,
+                     depth: int,
+                     ply: int,
+                     alpha: float,
+                     beta: float) -> float:
+        """
+        Wykonuje ruch, ocenia pozycję z punktu widzenia przeciwnika i cofa ruch.
+        """
+        column, amount = move
+        board_move = Move(self.board, color, column, amount)
+        self.board.move_pawn(board_move)
+        try:
+            return self._negamax(color.opposite(), depth - 1, ply + 1, -beta, -alpha)
+        finally:
+            self.board.unmake_move(board_move)
+
+    def _ordered_moves(self,
+                       color: Pawn.Color,
+                       ply: int,
+                       first: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Generuje dozwolone ruchy w kolejności: ruch z tablicy transpozycji (lub najlepszy ruch
+        poprzedniej iteracji), ruchy powodujące odcięcia na tej samej głębokości (ruchy "killer"),
+        a następnie pozostałe ruchy w kolejności `Board.iter_legal_moves`. Lista wszystkich ruchów
+        nie jest tworzona.
+        """
+        tried = []
+        for move in (first, *self._killers[ply]) if ply < len(self._killers) else (first,):
+            if move is not None and move not in tried and self._is_legal(color, move):
+                tried.append(move)
+                yield move
+        for move in self.board.iter_legal_moves(color):
+            if move not in tried:
+                yield move
+
+    def _is_legal(self, color: Pawn.Color, move: Tuple[int, int]) -> bool:
+        column, amount = move
+        return column < self.board.n and 1 <= amount <= self.board.free_fields(color, column)
+
+    def _remember_killer(self, move: Tuple[int, int], ply: int) -> None:
+        killers = self._killers[ply] if ply < len(self._killers) else None
+        if killers is not None and move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+    @staticmethod
+    def _to_table(score: float, ply: int) -> float:
+        """
+        Zamienia ocenę wygranej liczoną od korzenia na liczoną od bieżącego węzła.
+        """
+        if score >= _WIN_THRESHOLD:
+            return score + ply
+        if score <= -_WIN_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_table(score: float, ply: int) -> float:
+        """
+        Odwrotność `_to_table`.
+        """
+        if score >= _WIN_THRESHOLD:
+            return score - ply
+        if score <= -_WIN_THRESHOLD:
+            return score + ply
+        return score
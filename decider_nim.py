@@ -0,0 +1,33 @@
+"""
+Program decyzyjny grający optymalnie. Każda kolumna planszy jest stosem gry Nim o wielkości
+`gap - 1`, więc pozycja jest wygrana dla gracza wykonującego ruch wtedy i tylko wtedy, gdy suma
+Nim (`Board.nim_sum`) jest niezerowa.
+"""
+from typing import Optional, Tuple
+
+from definitions.decider_base import DeciderBase
+
+
+class DeciderNim(DeciderBase):
+    def find_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Wybiera ruch bez wyliczania wszystkich dozwolonych ruchów. Suma Nim jest utrzymywana przez
+        planszę, więc sprawdzenie, czy pozycja jest wygrana, zajmuje czas stały. W pozycji wygranej
+        wystarczy wziąć kolumnę, której stos ma ustawiony najstarszy bit sumy, i zmniejszyć go do
+        `stos ^ suma`. W pozycji przegranej wykonywany jest ruch o jedno pole w dowolnej otwartej
+        kolumnie, który najmniej zmienia pozycję. Obie kolumny wskazuje indeks stosów planszy
+        (`Board.column_with_heap_bit`, `Board.any_open_column`), więc ruch zajmuje zamortyzowany
+        czas stały.
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
+        """
+        nim_sum = self.board.nim_sum
+        if nim_sum:
+            column = self.board.column_with_heap_bit(nim_sum.bit_length() - 1)
+            heap = self.board.gap(column) - 1
+            return column, heap - (heap ^ nim_sum)
+        column = self.board.any_open_column()
+        if column is None:
+            return None
+        return column, 1
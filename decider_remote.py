@@ -0,0 +1,79 @@
+"""
+Program decyzyjny, który wybiera ruchy, pytając serwer programu decyzyjnego
+(`definitions.decider_server`). Pozwala używać w zwykłej rozgrywce programu działającego w osobnym,
+długo działającym procesie.
+
+Pętle rozgrywki tworzą programy jedynie z planszy i koloru, więc adres serwera można podać też
+w klasie pochodnej (`address`) albo w zmiennej środowiskowej `DECIDER_ADDRESS` (`host:port` lub
+ścieżka gniazda Unix), którą dziedziczą także procesy puli turnieju, np.::
+
+    python tournament.py decider_remote:RemoteDecider decider_nim:DeciderNim \\
+        --decider-address /run/user/1000/decider.sock
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+from definitions.board import Board, Pawn
+from definitions.cli import parse_address
+from definitions.decider_base import DeciderBase
+from definitions.decider_server import Address, DeciderClient
+
+ADDRESS_ENV = 'DECIDER_ADDRESS'
+"""Zmienna środowiskowa z adresem serwera używanym, gdy nie podano go inaczej."""
+
+_clients: Dict[Tuple[int, Address], DeciderClient] = {}
+"""Klienci serwerów według (pid, adres) - proces potomny nie używa połączeń rodzica."""
+
+
+def _client(address: Address) -> DeciderClient:
+    key = os.getpid(), address
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = DeciderClient(address)
+    return client
+
+
+class RemoteDecider(DeciderBase):
+    address: Optional[Address] = None
+    """Adres serwera; klasy pochodne mogą go ustawić."""
+
+    def __init__(self, board: Board, color: Pawn.Color, address: Optional[Address] = None) -> None:
+        """
+        :param board: Plansza, na której toczy się rozgrywka
+        :type board: Board
+        :param color: Kolor pionów programu
+        :type color: Pawn.Color
+        :param address: Adres serwera; domyślnie `address` klasy, a gdy go nie ustawiono - adres ze
+            zmiennej środowiskowej `ADDRESS_ENV`
+        :type address: Optional[Address]
+
+        :raise ValueError: Gdy adresu serwera nie podano w żaden sposób
+        """
+        super().__init__(board, color)
+        if address is None:
+            address = self.address
+        if address is None and os.environ.get(ADDRESS_ENV):
+            address = parse_address(os.environ[ADDRESS_ENV])
+        if address is None:
+            raise ValueError(f'Nie podano adresu serwera programu decyzyjnego (argument address, '
+                             f'atrybut klasy address lub zmienna środowiskowa {ADDRESS_ENV}).')
+        self.address = address
+
+    @property
+    def client(self) -> DeciderClient:
+        """
+        :return: Klient serwera, tworzony osobno w każdym procesie przy pierwszym użyciu
+        :type: DeciderClient
+        """
+        return _client(self.address)
+
+    def find_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Pyta serwer o ruch.
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
+
+        :raise DeciderClient.RemoteError: Gdy program po stronie serwera zgłosił błąd
+        """
+        return self.client.choose(self.board, self.color)
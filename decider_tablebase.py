@@ -0,0 +1,53 @@
+"""
+Program decyzyjny korzystający z tablicy końcówek (`definitions.tablebase`). Jeśli pozycja mieści
+się w tablicy, ruch jest odczytywany z niej w czasie O(n); w przeciwnym razie program przeszukuje
+drzewo gry tak jak `DeciderNegamax`.
+"""
+import os
+from typing import Optional, Tuple
+
+from decider_negamax import DeciderNegamax
+from definitions.board import Board, Pawn
+from definitions.tablebase import DEFAULT_PATH, Tablebase
+
+
+class DeciderTablebase(DeciderNegamax):
+    tablebase_path = DEFAULT_PATH
+    """Domyślna ścieżka do pliku tablicy (w katalogu projektu); klasy pochodne mogą ją nadpisać."""
+
+    def __init__(self,
+                 board: Board,
+                 color: Pawn.Color,
+                 tablebase: Optional[Tablebase | str] = None,
+                 **search_options) -> None:
+        """
+        :param board: Plansza, na której toczy się rozgrywka
+        :type board: Board
+        :param color: Kolor pionów programu
+        :type color: Pawn.Color
+        :param tablebase: Tablica końcówek lub ścieżka do niej; domyślnie `tablebase_path`. Jeśli
+            pliku nie ma, program jedynie przeszukuje drzewo gry
+        :type tablebase: Optional[Tablebase | str]
+        :param search_options: Argumenty `DeciderNegamax` (`time_budget`, `max_depth`, `table`)
+        """
+        super().__init__(board, color, **search_options)
+        if tablebase is None:
+            tablebase = self.tablebase_path
+        if isinstance(tablebase, str):
+            tablebase = Tablebase.shared(tablebase) if os.path.exists(tablebase) else None
+        self.tablebase = tablebase
+        self.tablebase_hits = 0
+
+    def find_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Odczytuje ruch z tablicy końcówek, a gdy pozycji w niej nie ma - przeszukuje drzewo gry.
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
+        """
+        if self.tablebase is not None:
+            found = self.tablebase.probe_board(self.board)
+            if found is not None:
+                self.tablebase_hits += 1
+                return found[1]
+        return super().find_move()
@@ -0,0 +1,207 @@
+"""
+Moduł "async_game" zawiera pętlę rozgrywki opartą na asyncio, która pozwala prowadzić wiele partii
+naraz w jednej pętli zdarzeń.
+
+Metoda `move` programu decyzyjnego wykonywana jest w osobnym wątku (lub w podanym `executor`) na
+kopii planszy (`game.PendingMove`, wspólne z `game.play_game`), więc wolny program nie wstrzymuje
+pozostałych partii, a ruch, który nie zdąży przed terminem, nie zmienia planszy partii. Gdy program
+nie zmieści się w terminie (`deadline`), zamiast jego ruchu wykonywany jest losowy dozwolony ruch
+(`FALLBACK_RANDOM`) albo program przegrywa (`FALLBACK_FORFEIT`). Dopóki spóźnione wywołanie `move`
+się nie zakończy, kolejne ruchy tego programu również wybierane są według tej zasady.
+
+Przykład::
+
+    results = run_games([(DeciderNim, DeciderExample, 8, 8)] * 100, deadline=0.5)
+"""
+import asyncio
+import statistics
+from concurrent.futures import Executor
+from random import Random
+from time import perf_counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+from definitions.board import Board, Move, Pawn
+from definitions.decider_base import DeciderBase
+from definitions.game import NO_MOVES, TIMEOUT, PendingMove
+
+FALLBACK_RANDOM = 'random'
+FALLBACK_FORFEIT = 'forfeit'
+
+Match = Tuple[Type[DeciderBase], Type[DeciderBase], int, int]
+"""Opis partii: (klasa programu białego, klasa programu czarnego, n, m)."""
+
+
+def latency_stats(times: List[float]) -> Dict[str, float]:
+    """
+    :param times: Czasy ruchów w sekundach
+    :type times: List[float]
+
+    :return: Liczba ruchów oraz średni, środkowy, 95. percentyl i najdłuższy czas ruchu
+    :type: Dict[str, float]
+    """
+    if not times:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    ordered = sorted(times)
+    return {
+        'count': len(ordered),
+        'mean': statistics.fmean(ordered),
+        'p50': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        'max': ordered[-1],
+    }
+
+
+class AsyncGameResult(NamedTuple):
+    """
+    Wynik partii rozegranej przez `play_game_async`.
+
+    * `winner`, `reason`, `plies`, `white_times`, `black_times` - jak w `game.GameResult`,
+    * `white_fallbacks`, `black_fallbacks` - liczba ruchów wykonanych za gracza po przekroczeniu
+      terminu.
+    """
+    winner: Pawn.Color
+    reason: str
+    plies: int
+    white_times: List[float]
+    black_times: List[float]
+    white_fallbacks: int
+    black_fallbacks: int
+
+    def latency(self) -> Dict[str, Dict[str, float]]:
+        """
+        :return: Statystyki czasu ruchów obu graczy (`latency_stats`)
+        :type: Dict[str, Dict[str, float]]
+        """
+        return {'white': latency_stats(self.white_times), 'black': latency_stats(self.black_times)}
+
+
+def _consume_result(future: asyncio.Future) -> None:
+    """
+    Odbiera wynik spóźnionego wywołania, aby jego wyjątek nie był zgłaszany jako nieobsłużony.
+    """
+    if not future.cancelled():
+        future.exception()
+
+
+async def play_game_async(white: Type[DeciderBase],
+                          black: Type[DeciderBase],
+                          n: int,
+                          m: int,
+                          deadline: Optional[float] = None,
+                          fallback: str = FALLBACK_RANDOM,
+                          executor: Optional[Executor] = None,
+                          compact: bool = True,
+                          seed: Optional[int] = None) -> AsyncGameResult:
+    """
+    Rozgrywa partię między dwoma programami decyzyjnymi na nowej planszy n x m.
+
+    :param white: Klasa programu grającego białymi
+    :type white: Type[DeciderBase]
+    :param black: Klasa programu grającego czarnymi
+    :type black: Type[DeciderBase]
+    :param n: Liczba kolumn planszy
+    :type n: int
+    :param m: Liczba wierszy planszy
+    :type m: int
+    :param deadline: Termin na jeden ruch w sekundach, liczony łącznie z oczekiwaniem na wolny wątek
+    :type deadline: Optional[float]
+    :param fallback: Postępowanie po przekroczeniu terminu: `FALLBACK_RANDOM` lub `FALLBACK_FORFEIT`
+    :type fallback: str
+    :param executor: Pula wykonująca metody `move`; domyślnie osobny wątek dla każdego ruchu
+    :type executor: Optional[Executor]
+    :param compact: Rozgrywka na planszy kompaktowej
+    :type compact: bool
+    :param seed: Ziarno generatora losowych ruchów zastępczych
+    :type seed: Optional[int]
+
+    :return: Wynik partii
+    :type: AsyncGameResult
+
+    :raise ValueError: Gdy `fallback` nie jest jedną z dozwolonych wartości
+    """
+    if fallback not in (FALLBACK_RANDOM, FALLBACK_FORFEIT):
+        raise ValueError(f"Nieznane postępowanie po przekroczeniu terminu: '{fallback}'.")
+    board = Board(n, m, compact=compact)
+    deciders = {
+        Pawn.Color.WHITE: white(board.clone(), Pawn.Color.WHITE),
+        Pawn.Color.BLACK: black(board.clone(), Pawn.Color.BLACK),
+    }
+    late: Dict[Pawn.Color, Optional[asyncio.Future]] = {Pawn.Color.WHITE: None, Pawn.Color.BLACK: None}
+    times = {Pawn.Color.WHITE: [], Pawn.Color.BLACK: []}
+    fallbacks = {Pawn.Color.WHITE: 0, Pawn.Color.BLACK: 0}
+    rng = Random(seed)
+    color = Pawn.Color.WHITE
+
+    def result(winner: Pawn.Color, reason: str) -> AsyncGameResult:
+        return AsyncGameResult(winner, reason, len(board.moves),
+                               times[Pawn.Color.WHITE], times[Pawn.Color.BLACK],
+                               fallbacks[Pawn.Color.WHITE], fallbacks[Pawn.Color.BLACK])
+
+    try:
+        while board.count_legal_moves(color) > 0:
+            pending = None
+            if late[color] is None or late[color].done():
+                late[color] = None
+                start = perf_counter()
+                pending = PendingMove(deciders[color], board, color, executor)
+                future = asyncio.wrap_future(pending.future)
+                done, _ = await asyncio.wait({future}, timeout=deadline)
+                if not done:
+                    future.add_done_callback(_consume_result)
+                    late[color] = future
+                    pending = None
+                else:
+                    _consume_result(future)
+                    reason = pending.failure()
+                    if reason is not None:
+                        return result(color.opposite(), reason)
+                times[color].append(perf_counter() - start)
+
+            if pending is not None:
+                pending.commit()
+            else:
+                if fallback == FALLBACK_FORFEIT:
+                    return result(color.opposite(), TIMEOUT)
+                fallbacks[color] += 1
+                column, amount = board.random_legal_move(color, rng)
+                board.move_pawn(Move(board, color, column, amount))
+            color = color.opposite()
+
+        return result(color.opposite(), NO_MOVES)
+    finally:
+        for decider in deciders.values():
+            decider.close()
+
+
+async def play_games_async(matches: Iterable[Match],
+                           concurrency: int = 100,
+                           **options) -> List[AsyncGameResult]:
+    """
+    Rozgrywa wiele partii naraz w bieżącej pętli zdarzeń.
+
+    :param matches: Opisy partii
+    :type matches: Iterable[Match]
+    :param concurrency: Maksymalna liczba jednocześnie trwających partii
+    :type concurrency: int
+    :param options: Argumenty `play_game_async` (`deadline`, `fallback`, `executor`, ...)
+
+    :return: Wyniki partii w kolejności `matches`
+    :type: List[AsyncGameResult]
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def play(match: Match) -> AsyncGameResult:
+        async with semaphore:
+            return await play_game_async(*match, **options)
+
+    return list(await asyncio.gather(*(play(match) for match in matches)))
+
+
+def run_games(matches: Iterable[Match], concurrency: int = 100, **options) -> List[AsyncGameResult]:
+    """
+    Uruchamia `play_games_async` w nowej pętli zdarzeń.
+
+    :return: Wyniki partii w kolejności `matches`
+    :type: List[AsyncGameResult]
+    """
+    return asyncio.run(play_games_async(matches, concurrency, **options))
@@ -0,0 +1,258 @@
+"""
+Moduł "batch" zawiera symulator wielu partii naraz. Stan K plansz o wymiarach n x m przechowywany
+jest w tablicach NumPy o kształcie (K, n) - wierszach pionów białych i czarnych - a generowanie,
+losowanie i wykonywanie ruchów odbywa się jednocześnie dla wszystkich plansz.
+
+Zasady są takie same jak w `Board`: pion przesuwa się do przodu o co najmniej jedno pole i nie może
+przeskoczyć piona przeciwnika, a gracz, który nie ma żadnego dozwolonego ruchu, przegrywa.
+Moduł wymaga biblioteki NumPy.
+"""
+from typing import Callable, Iterable, Optional, Tuple
+
+import numpy as np
+
+from definitions.board import Board, Pawn
+
+WHITE = 0
+BLACK = 1
+NO_WINNER = -1
+
+Policy = Callable[['BatchBoard'], Tuple[np.ndarray, np.ndarray]]
+"""Strategia dla wielu plansz: zwraca kolumny i liczby pól ruchów dla każdej planszy."""
+
+
+class BatchBoard:
+    """
+    Zbiór K plansz rozgrywanych jednocześnie.
+
+    * `white`, `black` - tablice (K, n) z wierszami pionów (-1 oznacza brak piona),
+    * `to_move` - tablica (K,) z kolorem gracza wykonującego ruch (`WHITE` lub `BLACK`),
+    * `winner` - tablica (K,) ze zwycięzcą zakończonych partii lub `NO_WINNER`,
+    * `plies` - tablica (K,) z liczbą wykonanych ruchów.
+    """
+
+    def __init__(self, k: int, n: int, m: int, seed: Optional[int] = None) -> None:
+        """
+        Tworzy K plansz o wymiarach n x m z pionami na pozycjach początkowych. Pierwszy ruch
+        wykonuje gracz biały.
+
+        :param k: Liczba plansz
+        :type k: int
+        :param n: Liczba kolumn
+        :type n: int
+        :param m: Liczba wierszy
+        :type m: int
+        :param seed: Ziarno generatora liczb losowych
+        :type seed: Optional[int]
+        """
+        if k <= 0 or n <= 0 or m <= 0:
+            raise ValueError(f"Nie można utworzyć {k} plansz o wymiarach {n} x {m}. "
+                             "Wszystkie wymiary muszą być dodatnie.")
+        self.n = n
+        self.m = m
+        self.white = np.zeros((k, n), dtype=np.int32)
+        self.black = np.full((k, n), m - 1, dtype=np.int32)
+        self.to_move = np.full(k, WHITE, dtype=np.int8)
+        self.winner = np.full(k, NO_WINNER, dtype=np.int8)
+        self.plies = np.zeros(k, dtype=np.int64)
+        self.rng = np.random.default_rng(seed)
+        self._update_finished()
+
+    @classmethod
+    def from_boards(cls,
+                    boards: Iterable[Board],
+                    to_move: Pawn.Color = Pawn.Color.WHITE,
+                    seed: Optional[int] = None) -> 'BatchBoard':
+        """
+        Tworzy zbiór plansz z pozycji istniejących plansz. Wszystkie plansze muszą mieć te same
+        wymiary.
+
+        :param boards: Plansze źródłowe
+        :type boards: Iterable[Board]
+        :param to_move: Kolor gracza wykonującego ruch na wszystkich planszach
+        :type to_move: Pawn.Color
+        :param seed: Ziarno generatora liczb losowych
+        :type seed: Optional[int]
+
+        :return: Zbiór plansz
+        :type: BatchBoard
+        """
+        boards = list(boards)
+        if not boards or any((board.n, board.m) != (boards[0].n, boards[0].m) for board in boards):
+            raise ValueError("Plansze muszą mieć te same wymiary.")
+        batch = cls(len(boards), boards[0].n, boards[0].m, seed)
+        for i, board in enumerate(boards):
+            batch.white[i] = board._white
+            batch.black[i] = board._black
+        batch.to_move[:] = WHITE if to_move == Pawn.Color.WHITE else BLACK
+        batch._update_finished()
+        return batch
+
+    def to_board(self, index: int) -> Board:
+        """
+        :return: Plansza kompaktowa w pozycji planszy o numerze `index`
+        :type: Board
+        """
+        return Board.from_buffer(np.concatenate((self.white[index], self.black[index])), self.m)
+
+    @property
+    def k(self) -> int:
+        """
+        :return: Liczba plansz
+        """
+        return len(self.to_move)
+
+    @property
+    def finished(self) -> np.ndarray:
+        """
+        :return: Maska (K,) zakończonych partii
+        """
+        return self.winner != NO_WINNER
+
+    def free_fields(self) -> np.ndarray:
+        """
+        Liczba wolnych pól przed pionem gracza wykonującego ruch w każdej kolumnie każdej planszy,
+        czyli liczba jego dozwolonych ruchów - odpowiednik `Board.free_fields`.
+
+        :return: Tablica (K, n)
+        :type: np.ndarray
+        """
+        white, black = self.white, self.black
+        white_free = np.where(white < 0, 0, np.where(black > white, black, self.m) - white - 1)
+        black_free = np.where(black < 0, 0,
+                              black - np.where((white >= 0) & (white < black), white, -1) - 1)
+        return np.where(self.to_move[:, None] == BLACK, black_free, white_free)
+
+    def legal_move_counts(self) -> np.ndarray:
+        """
+        :return: Tablica (K,) z liczbą dozwolonych ruchów gracza wykonującego ruch
+        :type: np.ndarray
+        """
+        return self.free_fields().sum(axis=1)
+
+    def sample_moves(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Losuje na każdej planszy jeden dozwolony ruch z rozkładem jednostajnym, tak jak
+        `Board.random_legal_move`. Dla plansz bez dozwolonych ruchów zwraca kolumnę i liczbę pól -1.
+
+        :return: Tablice (K,) kolumn i liczb pól
+        :type: Tuple[np.ndarray, np.ndarray]
+        """
+        free = self.free_fields()
+        cumulative = free.cumsum(axis=1)
+        total = cumulative[:, -1]
+        index = np.floor(self.rng.random(self.k) * total).astype(np.int64)
+        columns = (cumulative > index[:, None]).argmax(axis=1)
+        rows = np.arange(self.k)
+        amounts = index - (cumulative[rows, columns] - free[rows, columns]) + 1
+        empty = total == 0
+        columns[empty] = -1
+        amounts[empty] = -1
+        return columns, amounts
+
+    def apply_moves(self, columns: np.ndarray, amounts: np.ndarray) -> None:
+        """
+        Wykonuje po jednym ruchu na każdej niezakończonej planszy i zmienia gracza wykonującego ruch.
+        Plansze zakończone są pomijane.
+
+        :param columns: Tablica (K,) kolumn ruchów
+        :type columns: np.ndarray
+        :param amounts: Tablica (K,) liczb pól ruchów
+        :type amounts: np.ndarray
+
+        :raise ValueError: Gdy któryś z ruchów jest niedozwolony
+        """
+        active = np.flatnonzero(~self.finished)
+        columns = np.asarray(columns)[active]
+        amounts = np.asarray(amounts)[active]
+        if ((columns < 0) | (columns >= self.n)).any():
+            raise ValueError("Ruch wskazuje kolumnę spoza planszy.")
+        free = self.free_fields()[active, columns]
+        if ((amounts < 1) | (amounts > free)).any():
+            raise ValueError("Co najmniej jeden z ruchów jest niedozwolony.")
+
+        black_to_move = self.to_move[active] == BLACK
+        self.white[active[~black_to_move], columns[~black_to_move]] += amounts[~black_to_move]
+        self.black[active[black_to_move], columns[black_to_move]] -= amounts[black_to_move]
+        self.to_move[active] ^= 1
+        self.plies[active] += 1
+        self._update_finished()
+
+    def step(self, policy: Optional[Policy] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wykonuje jeden półruch na wszystkich niezakończonych planszach.
+
+        :param policy: Strategia wybierająca ruchy; domyślnie `random_policy`
+        :type policy: Optional[Policy]
+
+        :return: Wykonane ruchy: tablice (K,) kolumn i liczb pól (-1 dla plansz zakończonych)
+        :type: Tuple[np.ndarray, np.ndarray]
+        """
+        columns, amounts = (policy or random_policy)(self)
+        columns = np.where(self.finished, -1, columns)
+        amounts = np.where(self.finished, -1, amounts)
+        self.apply_moves(columns, amounts)
+        return columns, amounts
+
+    def play(self,
+             white_policy: Optional[Policy] = None,
+             black_policy: Optional[Policy] = None,
+             max_plies: Optional[int] = None) -> np.ndarray:
+        """
+        Rozgrywa wszystkie partie do końca (lub do `max_plies` półruchów).
+
+        :param white_policy: Strategia gracza białego; domyślnie `random_policy`
+        :type white_policy: Optional[Policy]
+        :param black_policy: Strategia gracza czarnego; domyślnie `random_policy`
+        :type black_policy: Optional[Policy]
+        :param max_plies: Maksymalna liczba półruchów
+        :type max_plies: Optional[int]
+
+        :return: Tablica (K,) zwycięzców
+        :type: np.ndarray
+        """
+        white_policy = white_policy or random_policy
+        black_policy = black_policy or random_policy
+        plies = 0
+        while not self.finished.all() and (max_plies is None or plies < max_plies):
+            columns, amounts = white_policy(self)
+            if black_policy is not white_policy:
+                black_columns, black_amounts = black_policy(self)
+                black_to_move = self.to_move == BLACK
+                columns = np.where(black_to_move, black_columns, columns)
+                amounts = np.where(black_to_move, black_amounts, amounts)
+            self.apply_moves(columns, amounts)
+            plies += 1
+        return self.winner
+
+    def _update_finished(self) -> None:
+        """
+        Oznacza jako zakończone partie, w których gracz wykonujący ruch nie ma dozwolonych ruchów.
+        """
+        stuck = (self.winner == NO_WINNER) & (self.legal_move_counts() == 0)
+        self.winner[stuck] = self.to_move[stuck] ^ 1
+
+
+def random_policy(batch: BatchBoard) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Strategia losowa - odpowiednik `DeciderExample`.
+    """
+    return batch.sample_moves()
+
+
+def nim_policy(batch: BatchBoard) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Strategia optymalna - odpowiednik `DeciderNim`. W pozycjach wygranych wybiera pierwszą kolumnę,
+    której stos zmniejszony do `stos ^ suma Nim` daje sumę zerową; w przegranych przesuwa piona
+    o jedno pole w pierwszej kolumnie, w której jest to możliwe.
+    """
+    white, black = batch.white, batch.black
+    heaps = np.where((white >= 0) & (white < black), black - white - 1, 0)
+    nim_sum = np.bitwise_xor.reduce(heaps, axis=1)
+    winning = (heaps ^ nim_sum[:, None]) < heaps
+    has_winning = winning.any(axis=1)
+    columns = np.where(has_winning, winning.argmax(axis=1), (heaps > 0).argmax(axis=1))
+    rows = np.arange(batch.k)
+    chosen = heaps[rows, columns]
+    amounts = np.where(has_winning, chosen - (chosen ^ nim_sum), 1)
+    return columns, amounts
@@ -5,15 +5,80 @@ Moduł "board" zawiera definicje wszystkich elementów planszy:
 * Field - pole planszy
 * Board - zbiór wszystkich pól planszy
 """
+from array import array
+from contextlib import contextmanager
 from enum import Enum
-from typing import Optional, List
+from random import Random
+from typing import Iterable, Iterator, Optional, List, Tuple
+import random
+
+_MASK64 = (1 << 64) - 1
+
+
+def zobrist_key(color: 'Pawn.Color', column: int, row: int) -> int:
+    """
+    Zwraca 64-bitowy klucz Zobrista dla piona w danym kolorze stojącego na polu [column, row].
+
+    Klucze nie są przechowywane w tablicy (dla planszy 1000 x 1000 byłyby to 2 miliony liczb),
+    lecz wyliczane funkcją mieszającą splitmix64 - są więc deterministyczne i identyczne dla
+    wszystkich plansz i procesów.
+
+    :param color: Kolor piona
+    :type color: Pawn.Color
+    :param column: Numer kolumny
+    :type column: int
+    :param row: Numer wiersza
+    :type row: int
+
+    :return: Klucz Zobrista
+    :type: int
+    """
+    return _mix64(((column << 32) | (row << 1) | (color is Pawn.Color.BLACK)) + 0x9E3779B97F4A7C15)
+
+
+def column_key(white_row: int, black_row: int) -> int:
+    """
+    Zwraca 64-bitowy klucz zawartości kolumny - pary wierszy piona białego i czarnego (-1 oznacza
+    brak piona). Klucz nie zależy od numeru kolumny, więc suma kluczy wszystkich kolumn nie zmienia
+    się przy przestawianiu kolumn planszy.
+
+    :param white_row: Wiersz piona białego
+    :type white_row: int
+    :param black_row: Wiersz piona czarnego
+    :type black_row: int
+
+    :return: Klucz kolumny
+    :type: int
+    """
+    return _mix64((((white_row + 1) << 32) | (black_row + 1)) + 0xD1B54A32D192ED03)
+
+
+_BLACK_TO_MOVE_KEY = 0x8A5CD789635D2DFF
+
+_BYTE_FORMATS = frozenset({'B', 'b', 'c'})
+_INT32_FORMATS = frozenset({'i', 'I', 'l', 'L'})
+"""Formaty `memoryview` przyjmowane przez `Board.from_buffer`: bajty i liczby całkowite 4-bajtowe."""
+
+
+def _mix64(x: int) -> int:
+    """
+    Funkcja mieszająca splitmix64.
+    """
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
 
 
 class Pawn:
     """
     Pawn - pion. Trzyma informacje o swoim kolorze i dopasowuje do tego swoje wyświetlanie.
+
+    Pion jest niezmienny, więc plansza nie musi tworzyć osobnego obiektu dla każdego piona -
+    wystarczą dwa współdzielone egzemplarze zwracane przez `Pawn.shared`.
     """
 
+    __slots__ = ('color',)
+
     class Color(Enum):
         """
         Enumerator definiujący możliwe kolory piona
@@ -21,6 +86,12 @@ class Pawn:
         WHITE = "X"
         BLACK = "O"
 
+        def opposite(self) -> 'Pawn.Color':
+            """
+            :return: Kolor przeciwnika
+            """
+            return Pawn.Color.BLACK if self is Pawn.Color.WHITE else Pawn.Color.WHITE
+
     def __init__(self, color: Color | str) -> None:
         """
         Tworzy nowego piona  wybranym kolorze
@@ -30,7 +101,13 @@ class Pawn:
         """
         if isinstance(color, str):
             color = Pawn.Color(color)
-        self.color = color
+        object.__setattr__(self, 'color', color)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Pion jest niezmienny. Zamiast zmieniać kolor piona, utwórz nowego.")
+
+    def __reduce__(self):
+        return Pawn, (self.color,)
 
     def __str__(self):
         """
@@ -38,6 +115,22 @@ class Pawn:
         """
         return self.color.value
 
+    @staticmethod
+    def shared(color: Color) -> 'Pawn':
+        """
+        Zwraca współdzielony egzemplarz piona w danym kolorze.
+
+        :param color: Kolor piona
+        :type color: Color
+
+        :return: Pion w danym kolorze
+        :type: Pawn
+        """
+        return _SHARED_PAWNS[color]
+
+
+_SHARED_PAWNS = {color: Pawn(color) for color in Pawn.Color}
+
 
 class Field:
     """
@@ -51,6 +144,8 @@ class Field:
     class DoesNotExist(Exception):
         pass
 
+    __slots__ = ('x', 'y', 'pawn')
+
     def __init__(self, x: int, y: int, pawn: Optional[Pawn] = None) -> None:
         """
         Tworzy nowe pole o współrzędnych x i y. Opcjonalnie może zawierać także piona na polu.
@@ -88,12 +183,237 @@ class Field:
                                             'Nie można dodać nowego piona do tego pola.')
         self.pawn = pawn
 
+
+class _FieldView(Field):
+    """
+    Widok pola planszy. Nie przechowuje piona samodzielnie - odczytuje go i zapisuje bezpośrednio
+    w indeksie wierszy planszy, dzięki czemu plansza ma jedno źródło prawdy o położeniu pionów,
+    a na planszy kompaktowej pole może być tworzone dopiero na żądanie.
+    """
+
+    __slots__ = ('board',)
+
+    def __init__(self, board: 'Board', x: int, y: int) -> None:
+        """
+        Tworzy widok pola o współrzędnych x i y na planszy `board`.
+
+        :param board: Plansza, do której należy pole
+        :type board: Board
+        :param x: Współrzędna x na planszy
+        :type x: int
+        :param y: Współrzędna y na planszy
+        :type y: int
+        """
+        self.board = board
+        self.x = x
+        self.y = y
+
+    def __reduce__(self):
+        # Odtworzenie slotu `pawn` przez setter zapisywałoby do planszy, która przy kopiowaniu
+        # i deserializacji nie ma jeszcze wierszy pionów - pion i tak odczytywany jest z planszy.
+        return _FieldView, (self.board, self.x, self.y)
+
+    @property
+    def pawn(self) -> Optional[Pawn]:
+        """
+        :return: Pion stojący na polu lub None, jeśli pole jest puste
+        """
+        return self.board._pawn_at(self.x, self.y)
+
+    @pawn.setter
+    def pawn(self, pawn: Optional[Pawn]) -> None:
+        self.board._set_pawn_at(self.x, self.y, pawn)
+
+
+class _LazyColumn:
+    """
+    Kolumna planszy kompaktowej, tworząca widoki pól dopiero przy odwołaniu do nich.
+    """
+
+    __slots__ = ('board', 'column')
+
+    def __init__(self, board: 'Board', column: int) -> None:
+        self.board = board
+        self.column = column
+
+    def __len__(self) -> int:
+        return self.board.m
+
+    def __getitem__(self, row: int) -> Field:
+        return _FieldView(self.board, self.column, range(self.board.m)[row])
+
+    def __iter__(self):
+        for row in range(self.board.m):
+            yield _FieldView(self.board, self.column, row)
+
+
+class _LazyFields:
+    """
+    Zastępuje listę `Board.fields` na planszy kompaktowej. Zachowuje indeksowanie
+    `fields[x][y]`, ale nie przechowuje żadnych obiektów pól.
+    """
+
+    __slots__ = ('board',)
+
+    def __init__(self, board: 'Board') -> None:
+        self.board = board
+
+    def __len__(self) -> int:
+        return self.board.n
+
+    def __getitem__(self, column: int) -> _LazyColumn:
+        return _LazyColumn(self.board, range(self.board.n)[column])
+
+    def __iter__(self):
+        for column in range(self.board.n):
+            yield _LazyColumn(self.board, column)
+
+
+class _ColumnSet:
+    """
+    Zbiór numerów kolumn z dodawaniem, usuwaniem i wyborem dowolnego elementu w czasie stałym.
+    Usuwany element zastępowany jest ostatnim elementem listy, więc lista nie ma dziur.
+
+    `snapshot` udostępnia listę elementów bez kopiowania; lista jest kopiowana (copy-on-write)
+    dopiero wtedy, gdy zbiór zmieni się w czasie, gdy migawka może być jeszcze używana.
+    """
+
+    __slots__ = ('items', 'positions', 'shared')
+
+    def __init__(self) -> None:
+        self.items: List[int] = []
+        self.positions = {}
+        self.shared = False
+
+    @classmethod
+    def of(cls, columns: List[int]) -> '_ColumnSet':
+        columns_set = cls()
+        columns_set.items = columns
+        columns_set.positions = dict(zip(columns, range(len(columns))))
+        return columns_set
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def snapshot(self) -> List[int]:
+        """
+        :return: Lista elementów zbioru, która nie zmieni się przy późniejszych zmianach zbioru
+        :type: List[int]
+        """
+        self.shared = True
+        return self.items
+
+    def _unshare(self) -> None:
+        if self.shared:
+            self.items = list(self.items)
+            self.shared = False
+
+    def add(self, column: int) -> None:
+        if column not in self.positions:
+            self._unshare()
+            self.positions[column] = len(self.items)
+            self.items.append(column)
+
+    def discard(self, column: int) -> None:
+        position = self.positions.pop(column, None)
+        if position is None:
+            return
+        self._unshare()
+        last = self.items.pop()
+        if last != column:
+            self.items[position] = last
+            self.positions[last] = position
+
+    def any(self) -> Optional[int]:
+        return self.items[-1] if self.items else None
+
+    def copy(self) -> '_ColumnSet':
+        other = _ColumnSet()
+        other.items = list(self.items)
+        other.positions = dict(self.positions)
+        return other
+
+
+class _HeapIndex:
+    """
+    Indeks stosów planszy: dla każdego bitu zbiór kolumn, których stos (`gap - 1`) ma ten bit
+    ustawiony, zbiór kolumn z niezerowym stosem oraz dla każdego koloru zbiór kolumn, w których ten
+    kolor ma dozwolony ruch. Pozwala wybrać ruch gry Nim i wyliczać ruchy bez przeglądania
+    wszystkich kolumn.
+    """
+
+    __slots__ = ('bits', 'nonempty', 'movable')
+
+    def __init__(self, board: 'Board') -> None:
+        last_row = board.m - 1
+        bits = [[] for _ in range(max(board.m, 1).bit_length())]
+        nonempty, white_movable, black_movable = [], [], []
+        for column, (white, black) in enumerate(zip(board._white, board._black)):
+            if 0 <= white < black:
+                heap = black - white - 1
+                if heap:
+                    nonempty.append(column)
+                    white_movable.append(column)
+                    black_movable.append(column)
+                    bit = 0
+                    while heap:
+                        if heap & 1:
+                            bits[bit].append(column)
+                        heap >>= 1
+                        bit += 1
+            else:
+                if 0 <= white < last_row:
+                    white_movable.append(column)
+                if black > 0:
+                    black_movable.append(column)
+        self.bits = [_ColumnSet.of(columns) for columns in bits]
+        self.nonempty = _ColumnSet.of(nonempty)
+        self.movable = {Pawn.Color.WHITE: _ColumnSet.of(white_movable),
+                        Pawn.Color.BLACK: _ColumnSet.of(black_movable)}
+
+    def update(self, column: int, old_heap: int, heap: int) -> None:
+        changed = old_heap ^ heap
+        bit = 0
+        while changed:
+            if changed & 1:
+                if heap >> bit & 1:
+                    self.bits[bit].add(column)
+                else:
+                    self.bits[bit].discard(column)
+            changed >>= 1
+            bit += 1
+        if heap:
+            self.nonempty.add(column)
+        else:
+            self.nonempty.discard(column)
+
+    def update_free(self, column: int, color: 'Pawn.Color', free: int) -> None:
+        if free:
+            self.movable[color].add(column)
+        else:
+            self.movable[color].discard(column)
+
+    def copy(self) -> '_HeapIndex':
+        other = _HeapIndex.__new__(_HeapIndex)
+        other.bits = [columns.copy() for columns in self.bits]
+        other.nonempty = self.nonempty.copy()
+        other.movable = {color: columns.copy() for color, columns in self.movable.items()}
+        return other
+
+
 class Move:
     """
     Klasa opisująca pojedynczy ruch. Zawiera informacje skąd dokąd rusza się dany pion oraz
     jaki ma kolor.
+
+    Ruch może istnieć bez planszy (`board` równe None) - taki zapis tworzą `Move.record` i
+    `Move.detached`. Wystarcza on do cofnięcia ruchu i do przechowywania historii gry, ale nie
+    można go walidować. Historia planszy (`Board.moves`) przechowuje właśnie takie zapisy. Ruchy
+    są równe, gdy mają ten sam kolor, kolumnę oraz pola początkowe i docelowe.
     """
 
+    __slots__ = ('board', 'color', 'column', 'from_field', 'to_field')
+
     class InvalidMove(Exception):
         """
         Wyjątek rzucany, gdy zostanie wykryty nieprawidłowy ruch.
@@ -143,6 +463,61 @@ class Move:
         return (f'Ruch {self.color.name}: kolumna [{self.column}] '
                 f'pola [{self.from_field} -> {self.to_field}]')
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Move):
+            return NotImplemented
+        return (self.color == other.color and self.column == other.column
+                and self.from_field == other.from_field and self.to_field == other.to_field)
+
+    def __hash__(self) -> int:
+        return hash((self.color, self.column, self.from_field, self.to_field))
+
+    @classmethod
+    def record(cls,
+               color: Pawn.Color,
+               column: int,
+               from_field: int,
+               to_field: int,
+               board: Optional['Board'] = None) -> 'Move':
+        """
+        Tworzy ruch z gotowych pól początkowego i docelowego, bez szukania piona na planszy.
+
+        :param color: Kolor piona
+        :type color: Pawn.Color
+        :param column: Kolumna, na której wykonywany jest ruch
+        :type column: int
+        :param from_field: Pole początkowe ruchu
+        :type from_field: int
+        :param to_field: Pole docelowe ruchu
+        :type to_field: int
+        :param board: Plansza, do której należy ruch; domyślnie ruch nie jest z nią powiązany
+        :type board: Optional[Board]
+
+        :return: Obiekt ruchu
+        :type: Move
+        """
+        move = cls.__new__(cls)
+        move.board = board
+        move.color = color
+        move.column = column
+        move.from_field = from_field
+        move.to_field = to_field
+        return move
+
+    def detached(self) -> 'Move':
+        """
+        :return: Kopia ruchu, która nie przechowuje referencji do planszy
+        :type: Move
+        """
+        return Move.record(self.color, self.column, self.from_field, self.to_field)
+
+    @property
+    def amount(self) -> int:
+        """
+        :return: Liczba pól, o którą przesuwa się pion
+        """
+        return abs(self.to_field - self.from_field)
+
     def _find_from_field(self) -> int:
         """
         Szuka miejsca w danej kolumnie, na której znajduje się pion danego koloru.
@@ -154,17 +529,9 @@ class Move:
         :raise AttributeError: Błąd jest rzucany, gdy podany zostanie nieprawidłowy kolor lub gdy
             plansza nie jest poprawnie zainicjalizowana
         """
-        move_column = self.board.fields[self.column]
-        if self.color == Pawn.Color.WHITE:
-            for i in range(self.board.m):
-                pawn = move_column[i].pawn
-                if pawn is not None and pawn.color == Pawn.Color.WHITE:
-                    return i
-        elif self.color == Pawn.Color.BLACK:
-            for i in range(self.board.m-1, 0, -1):
-                pawn = move_column[i].pawn
-                if pawn is not None and pawn.color == Pawn.Color.BLACK:
-                    return i
+        row = self.board.pawn_row(self.color, self.column)
+        if row is not None:
+            return row
 
         raise AttributeError('Plansza nie została poprawnie zainicjalizowana. Nie znaleziono piona'
                              f'w kolorze {self.color.name} na kolumnie {self.column}')
@@ -189,26 +556,40 @@ class Move:
         """
         Sprawdza, czy ten ruch jest poprawny. Jeśli ruch nie jest poprawny rzuca wyjątek.
 
+        Sprawdzenie trwa stały czas: w kolumnie stoją co najwyżej dwa piony, więc trasa ruchu jest
+        wolna wtedy i tylko wtedy, gdy pion przeciwnika nie stoi między polem początkowym
+        a docelowym.
+
         :return: None
 
         :raise InvalidMove: Błąd rzucany, gdy ruch nie jest poprawny
         """
-        shift = 1 if self.color == Pawn.Color.WHITE else -1
-        try:
-            self.board.get(self.column, self.from_field)
-            self.board.get(self.column, self.to_field)
-        except Field.DoesNotExist as e:
-            raise self.InvalidMove(f"'{self}' wychodzi poza granice planszy.") from e
+        if self.board is None:
+            raise self.InvalidMove(f"'{self}' nie jest powiązany z planszą i nie może zostać "
+                                   "sprawdzony.")
+        board = self.board
+        if not (0 <= self.column < board.n
+                and 0 <= self.from_field < board.m
+                and 0 <= self.to_field < board.m):
+            raise self.InvalidMove(f"'{self}' wychodzi poza granice planszy.")
+
+        if self.color == Pawn.Color.WHITE:
+            shift = 1
+            own, other = board._white[self.column], board._black[self.column]
+        else:
+            shift = -1
+            own, other = board._black[self.column], board._white[self.column]
 
-        if self.board.get(self.column, self.from_field).pawn.color != self.color:
+        if own != self.from_field:
             raise self.InvalidMove(f"'{self}' nie jest możliwy. Na polu początkowym "
                                    f"{self.from_field} nie ma piona w kolorze {self.color}")
 
-        for i in range(min(self.from_field + shift, self.to_field),
-                       max(self.from_field + shift, self.to_field) + shift,
-                       shift):
-            if self.board.get(self.column, i).pawn is not None:
-                raise self.InvalidMove(f"'{self}' nie jest możliwy. Na trasie ruchu znajduje się inny pion.")
+        if (self.to_field - self.from_field) * shift <= 0:
+            raise self.InvalidMove(f"'{self}' nie jest możliwy. Pion musi przesunąć się o co najmniej "
+                                   "jedno pole do przodu.")
+
+        if other >= 0 and (other - self.from_field) * shift > 0 and (self.to_field - other) * shift >= 0:
+            raise self.InvalidMove(f"'{self}' nie jest możliwy. Na trasie ruchu znajduje się inny pion.")
 
 
 class Board:
@@ -222,12 +603,27 @@ class Board:
     * `y` - oznacza wiersz
 
     obie wartości zaczynają się od 0 i kończą odpowiednio na n-1 i m-1.
+
+    Ponieważ w każdej kolumnie stoi co najwyżej jeden pion biały i jeden czarny, położenie pionów
+    przechowywane jest w indeksie: dwóch tablicach liczb całkowitych z numerem wiersza piona
+    białego i czarnego w każdej kolumnie (-1 oznacza brak piona). Pola (`Field`) są jedynie
+    widokami na ten indeks, więc odszukanie piona w kolumnie zajmuje czas stały.
+
+    Plansza kompaktowa (`compact=True`) nie tworzy z góry obiektów `Field` dla każdego pola -
+    widoki pól powstają dopiero na żądanie.
     """
 
+    class NoMoveToUndo(Exception):
+        """
+        Wyjątek rzucany, gdy nie ma ruchu, który można cofnąć.
+        """
+        pass
+
     def __init__(self,
                  n: int,
                  m: int,
-                 with_pawns: bool = True) -> None:
+                 with_pawns: bool = True,
+                 compact: bool = False) -> None:
         """
         Tworzy nową planszę o wymiarach n x m. Argument `with_pawns` pozwala na automatyczne
         wypełnienie planszy pionami na początkowym i końcowym wierszu.
@@ -238,17 +634,36 @@ class Board:
         :type m: int
         :param with_pawns: Automatyczne wypełnianie planszy pionami
         :type with_pawns: bool
+        :param compact: Tworzenie widoków pól dopiero na żądanie zamiast z góry dla całej planszy
+        :type compact: bool
         """
         if n <= 0 or m <= 0:
             raise ValueError(f"Nie można utworzyć planszy o wymiarach {n} x {m}. Liczby kolumn i wierszy muszą być dodatnie.")
         self.n = n
         self.m = m
-        self.fields = []
+        self.compact = compact
         self.moves = []
-
-        for i in range(self.n):
-            column = [Field(i, j) for j in range(self.m)]
-            self.fields.append(column)
+        self._listeners = []
+
+        self._white = array('i', [-1]) * n
+        self._black = array('i', [-1]) * n
+        self._hash = 0
+        self._nim_sum = 0
+        self._column_sum = None
+        self._mirrored_sum = None
+        self._white_mobility = 0
+        self._black_mobility = 0
+        self._open_columns = 0
+        self._heap_index = None
+        self._shared = False
+
+        if compact:
+            self.fields = _LazyFields(self)
+        else:
+            self.fields = []
+            for i in range(self.n):
+                column = [_FieldView(self, i, j) for j in range(self.m)]
+                self.fields.append(column)
 
         if with_pawns:
             self.place_default_pawns()
@@ -282,14 +697,8 @@ class Board:
             if j < 10:
                 row += " "
             row += " "
-            for i in range(self.n):
-                field = self.fields[i][j]
-                if field.pawn is None:
-                    row += '.'
-                elif field.pawn.color == Pawn.Color.BLACK:
-                    row += 'B'
-                else:
-                    row += 'W'
+            row += "".join('W' if self._white[i] == j else 'B' if self._black[i] == j else '.'
+                           for i in range(self.n))
             print(row)
 
     def get(self, column: str | int, row: int) -> Field:
@@ -314,8 +723,328 @@ class Board:
         )):
             raise Field.DoesNotExist(f'Pole [{column}, {row}] nie istnieje.')
 
+        return self._get(column, row)
+
+    def _get(self, column: int, row: int) -> Field:
+        """
+        Zwraca pole planszy o współrzędnych całkowitych bez sprawdzania ich poprawności. Przeznaczona
+        do wewnętrznego użytku w miejscach, w których współrzędne zostały już sprawdzone.
+
+        :param column: Numer kolumny
+        :type column: int
+        :param row: Numer wiersza
+        :type row: int
+
+        :return: Pole planszy
+        :type: Field
+        """
+        if self.compact:
+            return _FieldView(self, column, row)
         return self.fields[column][row]
 
+    def pawn_row(self, color: Pawn.Color, column: int) -> Optional[int]:
+        """
+        Zwraca wiersz, na którym stoi pion danego koloru w danej kolumnie. Działa w czasie stałym.
+
+        :param color: Kolor piona
+        :type color: Pawn.Color
+        :param column: Numer kolumny
+        :type column: int
+
+        :return: Numer wiersza piona lub None, jeśli w kolumnie nie ma piona tego koloru
+        :type: Optional[int]
+        """
+        row = (self._white if color == Pawn.Color.WHITE else self._black)[column]
+        return row if row >= 0 else None
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        64-bitowy hasz Zobrista aktualnego ułożenia pionów (XOR kluczy `zobrist_key` wszystkich
+        pionów). Jest aktualizowany przyrostowo przy każdym ruchu i jego cofnięciu, a po
+        `place_default_pawns` wyliczany ponownie przy pierwszym odczycie. Hasz nie uwzględnia
+        strony, która wykonuje ruch.
+
+        :return: Hasz pozycji
+        :type: int
+        """
+        if self._hash is None:
+            value = 0
+            for color, rows in ((Pawn.Color.WHITE, self._white), (Pawn.Color.BLACK, self._black)):
+                for column, row in enumerate(rows):
+                    if row >= 0:
+                        value ^= zobrist_key(color, column, row)
+            self._hash = value
+        return self._hash
+
+    def canonical_key(self, to_move: Pawn.Color = Pawn.Color.WHITE) -> int:
+        """
+        64-bitowy klucz pozycji wspólny dla wszystkich pozycji symetrycznych, które mają tę samą
+        wartość w grze:
+
+        * pozycji różniących się kolejnością kolumn - klucz jest sumą (modulo 2^64) kluczy
+          `column_key` wszystkich kolumn, więc nie zależy od ich kolejności,
+        * pozycji z zamienionymi kolorami pionów i odwróconymi wierszami (pion biały z wiersza w
+          staje się czarnym w wierszu m-1-w) przy zamienionej stronie wykonującej ruch - klucz jest
+          mniejszą z sum dla pozycji i jej odbicia.
+
+        Obie sumy wyliczane są przy pierwszym odczycie, a potem aktualizowane przyrostowo przy
+        każdym ruchu i jego cofnięciu. Tablice transpozycji indeksowane tym kluczem zapisują jedną
+        pozycję zamiast wszystkich jej permutacji, ale zapisany w nich ruch dotyczy konkretnego
+        układu kolumn i może być jedynie wskazówką.
+
+        :param to_move: Kolor gracza wykonującego ruch
+        :type to_move: Pawn.Color
+
+        :return: Kanoniczny klucz pozycji
+        :type: int
+        """
+        if self._column_sum is None:
+            column_sum = mirrored_sum = 0
+            for white_row, black_row in zip(self._white, self._black):
+                column_sum += column_key(white_row, black_row)
+                mirrored_sum += column_key(self._mirrored_row(black_row), self._mirrored_row(white_row))
+            self._column_sum = column_sum & _MASK64
+            self._mirrored_sum = mirrored_sum & _MASK64
+        side = _BLACK_TO_MOVE_KEY if to_move == Pawn.Color.BLACK else 0
+        return min(self._column_sum ^ side, self._mirrored_sum ^ (_BLACK_TO_MOVE_KEY ^ side))
+
+    def _mirrored_row(self, row: int) -> int:
+        return self.m - 1 - row if row >= 0 else -1
+
+    def gap(self, column: int) -> int:
+        """
+        Zwraca odległość między pionem białym a czarnym w kolumnie. Piony mogą zbliżać się do
+        siebie, więc w kolumnie pozostało `gap - 1` wolnych pól i tyle samo możliwych ruchów dla
+        każdego z graczy.
+
+        :param column: Numer kolumny
+        :type column: int
+
+        :return: Odległość między pionami lub 1, jeśli w kolumnie brakuje piona
+        :type: int
+        """
+        return self._heap(column) + 1
+
+    @property
+    def nim_sum(self) -> int:
+        """
+        XOR wartości `gap - 1` wszystkich kolumn. Każda kolumna jest stosem gry Nim, więc gracz
+        wykonujący ruch ma strategię wygrywającą wtedy i tylko wtedy, gdy suma jest niezerowa.
+        Wartość aktualizowana jest przyrostowo przy każdym ruchu i jego cofnięciu.
+
+        :return: Suma Nim pozycji
+        :type: int
+        """
+        return self._nim_sum
+
+    def free_fields(self, color: Pawn.Color, column: int) -> int:
+        """
+        Zwraca liczbę wolnych pól przed pionem danego koloru w kolumnie, czyli liczbę jego
+        dozwolonych ruchów (pion może przesunąć się o 1 do tej liczby pól).
+
+        :param color: Kolor piona
+        :type color: Pawn.Color
+        :param column: Numer kolumny
+        :type column: int
+
+        :return: Liczba dozwolonych ruchów piona (0, gdy w kolumnie nie ma piona tego koloru)
+        :type: int
+        """
+        white = self._white[column]
+        black = self._black[column]
+        if color == Pawn.Color.WHITE:
+            if white < 0:
+                return 0
+            return (black if black > white else self.m) - white - 1
+        if black < 0:
+            return 0
+        return black - (white if 0 <= white < black else -1) - 1
+
+    def iter_legal_moves(self, color: Pawn.Color) -> Iterator[Tuple[int, int]]:
+        """
+        Generator wszystkich dozwolonych ruchów danego koloru. Ruchy są wyliczane bezpośrednio
+        z położenia pionów, bez tworzenia obiektów `Move` i bez ich walidacji. Przeglądane są tylko
+        kolumny, w których kolor ma ruch (indeks stosów, jak w `column_with_heap_bit`), w kolejności
+        tego indeksu - bez sortowania, więc odczyt kolejnego ruchu nie zależy od `n`. Zbiór kolumn
+        jest ustalany (bez kopiowania) przy pierwszym odczycie z generatora.
+
+        :param color: Kolor gracza wykonującego ruch
+        :type color: Pawn.Color
+
+        :return: Kolejne ruchy jako pary (kolumna, liczba pól)
+        :type: Iterator[Tuple[int, int]]
+        """
+        for column in self._heap_columns().movable[color].snapshot():
+            for amount in range(1, self.free_fields(color, column) + 1):
+                yield column, amount
+
+    def count_legal_moves(self, color: Pawn.Color) -> int:
+        """
+        Zwraca liczbę dozwolonych ruchów danego koloru w czasie stałym (`mobility`).
+
+        :param color: Kolor gracza wykonującego ruch
+        :type color: Pawn.Color
+
+        :return: Liczba dozwolonych ruchów
+        :type: int
+        """
+        return self.mobility(color)
+
+    def mobility(self, color: Pawn.Color) -> int:
+        """
+        Liczba dozwolonych ruchów danego koloru - suma `free_fields` wszystkich kolumn. Wartość
+        aktualizowana jest przyrostowo przy każdej zmianie położenia piona, więc odczyt zajmuje
+        czas stały.
+
+        :param color: Kolor gracza
+        :type color: Pawn.Color
+
+        :return: Liczba dozwolonych ruchów
+        :type: int
+        """
+        return self._white_mobility if color == Pawn.Color.WHITE else self._black_mobility
+
+    def column_with_heap_bit(self, bit: int) -> Optional[int]:
+        """
+        Zwraca dowolną kolumnę, której stos (`gap - 1`) ma ustawiony bit `bit`. Indeks stosów
+        budowany jest w czasie O(n) przy pierwszym wywołaniu, a potem aktualizowany przyrostowo
+        przy każdym ruchu i jego cofnięciu, więc kolejne wywołania zajmują czas stały.
+
+        :param bit: Numer bitu (0 - najmłodszy)
+        :type bit: int
+
+        :return: Numer kolumny lub None, gdy żaden stos nie ma tego bitu
+        :type: Optional[int]
+        """
+        index = self._heap_columns()
+        return index.bits[bit].any() if bit < len(index.bits) else None
+
+    def any_open_column(self) -> Optional[int]:
+        """
+        Zwraca w czasie stałym (po zbudowaniu indeksu stosów, jak w `column_with_heap_bit`) dowolną
+        kolumnę, w której między pionami są jeszcze wolne pola.
+
+        :return: Numer kolumny lub None, gdy wszystkie kolumny są zamknięte
+        :type: Optional[int]
+        """
+        return self._heap_columns().nonempty.any()
+
+    def _heap_columns(self) -> _HeapIndex:
+        if self._heap_index is None:
+            self._heap_index = _HeapIndex(self)
+        return self._heap_index
+
+    @property
+    def open_columns(self) -> int:
+        """
+        :return: Liczba kolumn, w których między pionami są jeszcze wolne pola
+        :type: int
+        """
+        return self._open_columns
+
+    @property
+    def to_move(self) -> Pawn.Color:
+        """
+        Gracz wykonujący ruch: przeciwnik gracza, który wykonał ostatni ruch, a na początku partii
+        gracz biały.
+
+        :return: Kolor gracza wykonującego ruch
+        :type: Pawn.Color
+        """
+        return self.moves[-1].color.opposite() if self.moves else Pawn.Color.WHITE
+
+    def is_game_over(self) -> bool:
+        """
+        Sprawdza w czasie stałym, czy partia się zakończyła, czyli czy gracz wykonujący ruch
+        (`to_move`) nie ma żadnego dozwolonego ruchu.
+
+        :return: True, jeśli partia się zakończyła
+        :type: bool
+        """
+        return self.mobility(self.to_move) == 0
+
+    def winner(self) -> Optional[Pawn.Color]:
+        """
+        Zwraca zwycięzcę zakończonej partii - gracza, który wykonał ostatni ruch (przegrywa gracz,
+        który nie ma ruchu).
+
+        :return: Kolor zwycięzcy lub None, jeśli partia trwa
+        :type: Optional[Pawn.Color]
+        """
+        to_move = self.to_move
+        return to_move.opposite() if self.mobility(to_move) == 0 else None
+
+    def random_legal_move(self,
+                          color: Pawn.Color,
+                          rng: Optional[Random] = None) -> Optional[Tuple[int, int]]:
+        """
+        Losuje jeden z dozwolonych ruchów danego koloru z rozkładem jednostajnym w czasie O(n)
+        i stałej pamięci - bez budowania listy ruchów.
+
+        :param color: Kolor gracza wykonującego ruch
+        :type color: Pawn.Color
+        :param rng: Generator liczb losowych; domyślnie moduł `random`
+        :type rng: Optional[Random]
+
+        :return: Wylosowany ruch jako para (kolumna, liczba pól) lub None, gdy ruchów nie ma
+        :type: Optional[Tuple[int, int]]
+        """
+        total = self.count_legal_moves(color)
+        if total == 0:
+            return None
+        index = (rng or random).randrange(total)
+        for column in range(self.n):
+            free = self.free_fields(color, column)
+            if index < free:
+                return column, index + 1
+            index -= free
+        raise AssertionError("Liczba ruchów zmieniła się w trakcie losowania.")
+
+    def _heap(self, column: int) -> int:
+        """
+        :return: Liczba wolnych pól między pionami w kolumnie (0, gdy brakuje któregoś z pionów)
+        """
+        white = self._white[column]
+        black = self._black[column]
+        return black - white - 1 if 0 <= white < black else 0
+
+    def _pawn_at(self, column: int, row: int) -> Optional[Pawn]:
+        """
+        Zwraca piona stojącego na polu planszy. Nie sprawdza poprawności współrzędnych.
+
+        :return: Pion na polu [column, row] lub None
+        :type: Optional[Pawn]
+        """
+        if self._white[column] == row:
+            return _SHARED_PAWNS[Pawn.Color.WHITE]
+        if self._black[column] == row:
+            return _SHARED_PAWNS[Pawn.Color.BLACK]
+        return None
+
+    def _set_pawn_at(self, column: int, row: int, pawn: Optional[Pawn]) -> None:
+        """
+        Ustawia lub usuwa piona na polu planszy, aktualizując indeks pionów. Nie sprawdza
+        poprawności współrzędnych.
+
+        :param pawn: Pion do ustawienia lub None, jeśli pole ma zostać wyczyszczone
+        :type pawn: Optional[Pawn]
+
+        :raise Field.FieldAlreadyOccupied: Gdy w kolumnie stoi już pion tego samego koloru
+        """
+        if pawn is None:
+            for color in Pawn.Color:
+                if self.pawn_row(color, column) == row:
+                    self._shift_pawn(color, column, -1)
+            return
+
+        current = self.pawn_row(pawn.color, column)
+        if current is not None and current != row:
+            raise Field.FieldAlreadyOccupied(f'W kolumnie {column} znajduje się już pion w kolorze '
+                                             f'{pawn.color.name}. W każdej kolumnie może stać '
+                                             'tylko jeden pion każdego koloru.')
+        self._shift_pawn(pawn.color, column, row)
+
     def place_default_pawns(self, clear_board: bool = True) -> None:
         """
         Ustawia piony na domyślnych pozycjach. Odpowiednio:
@@ -330,11 +1059,22 @@ class Board:
         if clear_board:
             self.clear_all_pawns()
 
+        if self.m > 1 and max(self._white) < 0 and max(self._black) < 0:
+            self._white = array('i', [0]) * self.n
+            self._black = array('i', [self.m - 1]) * self.n
+            self._hash = None
+            self._nim_sum = (self.m - 2) if self.n % 2 else 0
+            self._column_sum = self._mirrored_sum = None
+            self._white_mobility = self._black_mobility = self.n * (self.m - 2)
+            self._open_columns = self.n if self.m > 2 else 0
+            self._heap_index = None
+            return
+
         for i in range(self.n):
-            self.fields[i][0].add_pawn(Pawn(Pawn.Color.WHITE))
+            self._get(i, 0).add_pawn(Pawn.shared(Pawn.Color.WHITE))
 
         for i in range(self.n):
-            self.fields[i][self.m - 1].add_pawn(Pawn(Pawn.Color.BLACK))
+            self._get(i, self.m - 1).add_pawn(Pawn.shared(Pawn.Color.BLACK))
 
     def clear_all_pawns(self) -> None:
         """
@@ -342,9 +1082,14 @@ class Board:
 
         :return: None
         """
-        for column in self.fields:
-            for field in column:
-                field.clear_pawn()
+        self._white = array('i', [-1]) * self.n
+        self._black = array('i', [-1]) * self.n
+        self._hash = 0
+        self._nim_sum = 0
+        self._column_sum = self._mirrored_sum = None
+        self._white_mobility = self._black_mobility = 0
+        self._open_columns = 0
+        self._heap_index = None
 
     def get_move(self, color: Pawn.Color, column: int | str, amount: int) -> Move:
         """
@@ -389,10 +1134,447 @@ class Board:
         """
         move.validate()
 
-        pawn = self.get(move.column, move.from_field).pawn
-        if pawn is None:
+        if self.pawn_row(move.color, move.column) != move.from_field:
             raise Move.InvalidMove(f'Na polu [{move.column}, {move.from_field}] nie ma piona.')
-        self.get(move.column, move.from_field).clear_pawn()
-        self.get(move.column, move.to_field).add_pawn(pawn)
-        self.moves.append(move)
+        if self._listeners:
+            for listener in self._listeners:
+                listener.on_move(self, move)
+        self._shift_pawn(move.color, move.column, move.to_field)
+        self.moves.append(move if move.board is None else move.detached())
 
+    def apply_moves(self, moves: Iterable[Tuple[Pawn.Color, int | str, int]]) -> None:
+        """
+        Sprawdza i wykonuje serię ruchów podanych jako trójki (kolor, kolumna, liczba pól). Jeśli
+        któryś z ruchów jest niedozwolony, wszystkie ruchy wykonane w tym wywołaniu są cofane, więc
+        plansza i `self.moves` pozostają w stanie sprzed wywołania.
+
+        :param moves: Ruchy do wykonania
+        :type moves: Iterable[Tuple[Pawn.Color, int | str, int]]
+
+        :return: None
+
+        :raise Move.InvalidMove: Gdy któryś z ruchów jest niedozwolony
+        """
+        applied = 0
+        try:
+            for color, column, amount in moves:
+                self.move_pawn(Move(self, color, self.column_number(column), amount))
+                applied += 1
+        except Exception:
+            for _ in range(applied):
+                self.undo()
+            raise
+
+    def unmake_move(self, move: Move) -> None:
+        """
+        Cofa ruch, który został wykonany jako ostatni, przywracając piona z pola `move.to_field` na
+        `move.from_field`. Nie kopiuje planszy, dzięki czemu pozwala przeszukiwać drzewo gry
+        w miejscu.
+
+        :param move: Ruch do cofnięcia - musi być równy ostatniemu ruchowi z `self.moves`
+        :type move: Move
+
+        :return: None
+
+        :raise Board.NoMoveToUndo: Gdy podany ruch nie jest ostatnim wykonanym ruchem
+        """
+        if not self.moves or self.moves[-1] != move:
+            raise self.NoMoveToUndo(f"'{move}' nie jest ostatnim wykonanym ruchem.")
+        move = self.moves.pop()
+        self._shift_pawn(move.color, move.column, move.from_field)
+        if self._listeners:
+            for listener in self._listeners:
+                listener.on_undo(self, move)
+
+    def undo(self) -> Move:
+        """
+        Cofa ostatni wykonany ruch.
+
+        :return: Cofnięty ruch (zapis bez referencji do planszy)
+        :type: Move
+
+        :raise Board.NoMoveToUndo: Gdy na planszy nie wykonano jeszcze żadnego ruchu
+        """
+        if not self.moves:
+            raise self.NoMoveToUndo('Na planszy nie wykonano jeszcze żadnego ruchu.')
+        move = self.moves[-1]
+        self.unmake_move(move)
+        return move
+
+    @contextmanager
+    def try_move(self, move: Move):
+        """
+        Menedżer kontekstu wykonujący ruch na czas bloku `with` i cofający go po jego zakończeniu
+        (także gdy w bloku zostanie rzucony wyjątek)::
+
+            with board.try_move(move):
+                score = evaluate(board)
+
+        :param move: Ruch do sprawdzenia
+        :type move: Move
+
+        :raise Move.InvalidMove: Gdy ruch nie jest dozwolony
+        """
+        self.move_pawn(move)
+        try:
+            yield move
+        finally:
+            self.unmake_move(move)
+
+    @classmethod
+    def from_buffer(cls, buffer, m: int, compact: bool = True) -> 'Board':
+        """
+        Tworzy planszę z ciągłego bufora liczb int32 (w kolejności bajtów maszyny): n wierszy pionów
+        białych, a po nich n wierszy pionów czarnych (-1 oznacza brak piona). Przyjmuje dowolny
+        obiekt z protokołem bufora - `array('i')`, `bytes`, tablicę NumPy `int32`, `memoryview`.
+        Wiersze kopiowane są do planszy w całości (bez obiektów `Field` i `Pawn`), a stan wyliczany
+        przyrostowo (suma Nim, liczby ruchów) jest odtwarzany jednym przejściem po kolumnach.
+
+        :param buffer: Bufor z 2n liczbami int32 lub 8n bajtami
+        :type buffer: Buffer
+        :param m: Liczba wierszy
+        :type m: int
+        :param compact: Tworzenie planszy kompaktowej
+        :type compact: bool
+
+        :return: Plansza w zapisanej pozycji
+        :type: Board
+
+        :raise ValueError: Gdy bufor nie jest ciągły, ma niepoprawny rozmiar lub typ albo opisuje
+            niemożliwą pozycję
+        """
+        view = memoryview(buffer)
+        item_format = view.format.lstrip('@=')
+        if item_format not in _BYTE_FORMATS and (item_format not in _INT32_FORMATS or view.itemsize != 4):
+            raise ValueError(f"Bufor musi zawierać bajty lub liczby całkowite 4-bajtowe, "
+                             f"a zawiera '{view.format}'.")
+        if not view.c_contiguous:
+            raise ValueError('Bufor musi być ciągły.')
+        view = view.cast('B')
+        if len(view) % 8:
+            raise ValueError(f'Rozmiar bufora ({len(view)} B) nie odpowiada 2n liczbom int32.')
+        n = len(view) // 8
+        board = cls(n, m, with_pawns=False, compact=compact)
+        board._white = array('i')
+        board._white.frombytes(view[:4 * n])
+        board._black = array('i')
+        board._black.frombytes(view[4 * n:])
+        board._recompute_state()
+        return board
+
+    def to_buffer(self) -> array:
+        """
+        Zwraca wiersze pionów w formacie `from_buffer`: n wierszy pionów białych, a po nich
+        n wierszy pionów czarnych, jako jedną ciągłą tablicę `array('i')`.
+
+        :return: Wiersze pionów
+        :type: array
+        """
+        rows = array('i')
+        rows.frombytes(memoryview(self._white).cast('B'))
+        rows.frombytes(memoryview(self._black).cast('B'))
+        return rows
+
+    @classmethod
+    def from_text(cls, text: str, compact: bool = True) -> 'Board':
+        """
+        Tworzy planszę z zapisu tekstowego utworzonego przez `to_text`, np. `'3x5 0/4 2/4 ./3'`.
+
+        :param text: Zapis tekstowy
+        :type text: str
+        :param compact: Tworzenie planszy kompaktowej
+        :type compact: bool
+
+        :return: Plansza w zapisanej pozycji
+        :type: Board
+
+        :raise ValueError: Gdy zapis jest niepoprawny
+        """
+        size, *columns = text.split()
+        n, _, m = size.partition('x')
+        if not columns or int(n) != len(columns):
+            raise ValueError(f"Niepoprawny zapis planszy: '{text}'.")
+        rows = array('i')
+        pairs = [column.split('/') for column in columns]
+        if any(len(pair) != 2 for pair in pairs):
+            raise ValueError(f"Niepoprawny zapis planszy: '{text}'.")
+        for index in (0, 1):
+            rows.extend(-1 if pair[index] == '.' else int(pair[index]) for pair in pairs)
+        return cls.from_buffer(rows, int(m), compact)
+
+    def to_text(self) -> str:
+        """
+        Zwraca zwarty zapis tekstowy pozycji: wymiary `n`x`m`, a po nich wiersze piona białego
+        i czarnego w każdej kolumnie (`.` oznacza brak piona), np. `'3x5 0/4 2/4 ./3'`.
+
+        :return: Zapis tekstowy
+        :type: str
+        """
+        def row(value: int) -> str:
+            return '.' if value < 0 else str(value)
+        return f'{self.n}x{self.m} ' + ' '.join(f'{row(white)}/{row(black)}'
+                                                 for white, black in zip(self._white, self._black))
+
+    def _recompute_state(self) -> None:
+        """
+        Sprawdza tablice pionów i wylicza od nowa stan utrzymywany przyrostowo przez `_shift_pawn`.
+        """
+        m = self.m
+        if min(self._white) < -1 or min(self._black) < -1 or max(self._white) >= m or max(self._black) >= m:
+            raise ValueError(f'Wiersze pionów muszą należeć do przedziału od -1 do {m - 1}.')
+        nim_sum = white_mobility = black_mobility = open_columns = 0
+        for white, black in zip(self._white, self._black):
+            if white >= 0 and white == black:
+                raise ValueError(f'Piony obu kolorów stoją na tym samym polu w wierszu {white}.')
+            if 0 <= white < black:
+                heap = black - white - 1
+                nim_sum ^= heap
+                open_columns += heap > 0
+                white_mobility += heap
+                black_mobility += heap
+            else:
+                if white >= 0:
+                    white_mobility += m - white - 1
+                if black >= 0:
+                    black_mobility += black
+        self._nim_sum = nim_sum
+        self._white_mobility = white_mobility
+        self._black_mobility = black_mobility
+        self._open_columns = open_columns
+        self._heap_index = None
+        self._hash = None
+        self._column_sum = self._mirrored_sum = None
+
+    def clone(self) -> 'Board':
+        """
+        Tworzy kopię planszy w czasie O(1). Kopia jest planszą kompaktową, która współdzieli
+        z oryginałem tablice pionów i listę ruchów, dopóki któraś z plansz nie zostanie zmieniona -
+        wtedy zmieniana plansza kopiuje je w czasie O(n) (kopiowanie przy zapisie). Obiekty ruchów
+        są współdzielone, bo nie zmieniają się po utworzeniu. Kopia nie przejmuje obiektów
+        zarejestrowanych przez `add_listener`.
+
+        :return: Kopia planszy
+        :type: Board
+        """
+        clone = Board.__new__(Board)
+        clone.n = self.n
+        clone.m = self.m
+        clone.compact = True
+        clone.moves = self.moves
+        clone._listeners = []
+        clone._white = self._white
+        clone._black = self._black
+        clone._hash = self._hash
+        clone._nim_sum = self._nim_sum
+        clone._column_sum = self._column_sum
+        clone._mirrored_sum = self._mirrored_sum
+        clone._white_mobility = self._white_mobility
+        clone._black_mobility = self._black_mobility
+        clone._open_columns = self._open_columns
+        clone._heap_index = self._heap_index
+        clone.fields = _LazyFields(clone)
+        clone._shared = self._shared = True
+        return clone
+
+    def snapshot(self) -> 'BoardView':
+        """
+        Zwraca niezmienny obraz bieżącej pozycji w czasie O(1) - widok tylko do odczytu na kopię
+        utworzoną przez `clone`. Późniejsze ruchy na planszy nie zmieniają obrazu.
+
+        :return: Obraz pozycji
+        :type: BoardView
+        """
+        return BoardView(self.clone())
+
+    def view(self) -> 'BoardView':
+        """
+        Zwraca widok tylko do odczytu na tę planszę, bez kopiowania. Widok pokazuje zawsze bieżącą
+        pozycję.
+
+        :return: Widok planszy
+        :type: BoardView
+        """
+        return BoardView(self)
+
+    def _unshare(self) -> None:
+        """
+        Kopiuje tablice pionów i listę ruchów współdzielone z kopią planszy przed ich zmianą.
+        """
+        self._white = array('i', self._white)
+        self._black = array('i', self._black)
+        self.moves = list(self.moves)
+        if self._heap_index is not None:
+            self._heap_index = self._heap_index.copy()
+        self._shared = False
+
+    def add_listener(self, listener) -> None:
+        """
+        Rejestruje obiekt powiadamiany o ruchach wykonywanych na planszy. Obiekt musi mieć metody
+        `on_move(board, move)` - wywoływaną po sprawdzeniu ruchu, a przed jego wykonaniem (rzucenie
+        w niej wyjątku wstrzymuje ruch) - oraz `on_undo(board, move)` - wywoływaną po cofnięciu ruchu.
+
+        :param listener: Obiekt powiadamiany o ruchach
+        :return: None
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        """
+        Wyrejestrowuje obiekt dodany przez `add_listener`.
+
+        :param listener: Obiekt powiadamiany o ruchach
+        :return: None
+
+        :raise ValueError: Gdy obiekt nie był zarejestrowany
+        """
+        self._listeners.remove(listener)
+
+    def _shift_pawn(self, color: Pawn.Color, column: int, row: int) -> None:
+        """
+        Przestawia piona danego koloru w kolumnie na podany wiersz (-1 usuwa piona z kolumny).
+        Jedyne miejsce, w którym zmienia się położenie piona w trakcie gry - aktualizuje indeks
+        pionów, hasz pozycji, sumę Nim, sumy kluczy kolumn, liczbę otwartych kolumn i liczby
+        dozwolonych ruchów obu kolorów, ale nie sprawdza poprawności ruchu.
+        """
+        if self._shared:
+            self._unshare()
+        rows = self._white if color == Pawn.Color.WHITE else self._black
+        if self._hash is not None:
+            if rows[column] >= 0:
+                self._hash ^= zobrist_key(color, column, rows[column])
+            if row >= 0:
+                self._hash ^= zobrist_key(color, column, row)
+        old_heap = self._heap(column)
+        old_white_free = self.free_fields(Pawn.Color.WHITE, column)
+        old_black_free = self.free_fields(Pawn.Color.BLACK, column)
+        if self._column_sum is not None:
+            self._update_column_sums(column, -1)
+        rows[column] = row
+        if self._column_sum is not None:
+            self._update_column_sums(column, 1)
+        heap = self._heap(column)
+        white_free = self.free_fields(Pawn.Color.WHITE, column)
+        black_free = self.free_fields(Pawn.Color.BLACK, column)
+        if self._heap_index is not None:
+            if heap != old_heap:
+                self._heap_index.update(column, old_heap, heap)
+            self._heap_index.update_free(column, Pawn.Color.WHITE, white_free)
+            self._heap_index.update_free(column, Pawn.Color.BLACK, black_free)
+        self._nim_sum ^= old_heap ^ heap
+        self._open_columns += (heap > 0) - (old_heap > 0)
+        self._white_mobility += white_free - old_white_free
+        self._black_mobility += black_free - old_black_free
+
+    def _update_column_sums(self, column: int, sign: int) -> None:
+        """
+        Dodaje (sign=1) lub odejmuje (sign=-1) klucze kolumny od sum używanych przez `canonical_key`.
+        """
+        white_row, black_row = self._white[column], self._black[column]
+        self._column_sum = (self._column_sum + sign * column_key(white_row, black_row)) & _MASK64
+        self._mirrored_sum = (self._mirrored_sum + sign * column_key(
+            self._mirrored_row(black_row), self._mirrored_row(white_row))) & _MASK64
+
+
+
+class BoardView:
+    """
+    Widok planszy tylko do odczytu, który można przekazać programowi decyzyjnemu bez kopiowania
+    planszy. Udostępnia wymiary planszy, wykonane ruchy i wszystkie metody odczytu pozycji, ale
+    rzuca wyjątek `BoardView.ReadOnly` przy próbie wykonania lub cofnięcia ruchu. `get` zwraca
+    kopię pola niezwiązaną z planszą, a wiersze pionów (`_white`, `_black`) udostępniane są jako
+    widoki `memoryview` tylko do odczytu.
+
+    Widok chroni przed przypadkową zmianą planszy, ale nie jest zabezpieczeniem przed kodem, który
+    celowo sięga do obiektu planszy.
+    """
+
+    class ReadOnly(Exception):
+        """
+        Wyjątek rzucany przy próbie zmiany planszy przez widok tylko do odczytu.
+        """
+        pass
+
+    __slots__ = ('_board',)
+
+    _READ_ATTRIBUTES = frozenset({
+        'column_number', 'print', 'pawn_row', 'canonical_key', 'gap', 'free_fields',
+        'iter_legal_moves', 'count_legal_moves', 'random_legal_move', 'is_move_legal', 'clone',
+        'snapshot', 'mobility', 'is_game_over', 'winner', 'to_buffer', 'to_text', 'get_move',
+        'column_with_heap_bit', 'any_open_column',
+    })
+    _MUTATORS = frozenset({
+        'move_pawn', 'apply_moves', 'unmake_move', 'undo', 'try_move', 'place_default_pawns',
+        'clear_all_pawns', 'add_listener', 'remove_listener',
+    })
+
+    def __init__(self, board: Board) -> None:
+        """
+        :param board: Plansza, na którą jest to widok
+        :type board: Board
+        """
+        object.__setattr__(self, '_board', board)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise self.ReadOnly(f"Nie można zmienić atrybutu '{name}' widoku planszy.")
+
+    def __getattr__(self, name: str):
+        if name in BoardView._READ_ATTRIBUTES:
+            return getattr(self._board, name)
+        if name in BoardView._MUTATORS:
+            raise BoardView.ReadOnly(f"Widok planszy nie pozwala na wywołanie '{name}'.")
+        raise AttributeError(f"'BoardView' nie ma atrybutu '{name}'.")
+
+    @property
+    def n(self) -> int:
+        return self._board.n
+
+    @property
+    def m(self) -> int:
+        return self._board.m
+
+    @property
+    def moves(self) -> Tuple[Move, ...]:
+        """
+        :return: Wykonane ruchy
+        :type: Tuple[Move, ...]
+        """
+        return tuple(self._board.moves)
+
+    @property
+    def zobrist_hash(self) -> int:
+        return self._board.zobrist_hash
+
+    @property
+    def nim_sum(self) -> int:
+        return self._board.nim_sum
+
+    @property
+    def open_columns(self) -> int:
+        return self._board.open_columns
+
+    @property
+    def to_move(self) -> Pawn.Color:
+        return self._board.to_move
+
+    @property
+    def _white(self) -> memoryview:
+        return memoryview(self._board._white).toreadonly()
+
+    @property
+    def _black(self) -> memoryview:
+        return memoryview(self._board._black).toreadonly()
+
+    def get(self, column: str | int, row: int) -> Field:
+        """
+        Zwraca kopię pola planszy niezwiązaną z planszą - zmiana jej piona nie zmienia planszy.
+
+        :param column: Numer lub litera kolumny
+        :type column: str | int
+        :param row: Numer wiersza
+        :type row: int
+
+        :return: Kopia pola
+        :type: Field
+        """
+        field = self._board.get(column, row)
+        return Field(field.x, field.y, field.pawn)
@@ -0,0 +1,74 @@
+"""
+Moduł "cli" zawiera funkcje pomocnicze wspólne dla skryptów uruchamianych z wiersza poleceń:
+zapis i odczyt nazw programów decyzyjnych w postaci `moduł:Klasa`, rozmiarów plansz w postaci `NxM`
+oraz adresów serwera programu decyzyjnego.
+"""
+import importlib
+from typing import Tuple, Type
+
+from definitions.decider_base import DeciderBase
+
+
+def decider_name(decider: Type[DeciderBase]) -> str:
+    """
+    :return: Nazwa programu w postaci `moduł:Klasa`, z której można go ponownie zaimportować
+    :type: str
+    """
+    return f'{decider.__module__}:{decider.__qualname__}'
+
+
+def load_decider(name: str) -> Type[DeciderBase]:
+    """
+    Importuje klasę programu decyzyjnego zapisaną w postaci `moduł:Klasa`.
+
+    :param name: Nazwa programu
+    :type name: str
+
+    :return: Klasa programu
+    :type: Type[DeciderBase]
+
+    :raise ValueError: Gdy nazwa nie wskazuje klasy dziedziczącej po `DeciderBase`
+    """
+    module_name, _, class_name = name.partition(':')
+    decider = getattr(importlib.import_module(module_name), class_name, None)
+    if not (isinstance(decider, type) and issubclass(decider, DeciderBase)):
+        raise ValueError(f"'{name}' nie jest programem decyzyjnym dziedziczącym po DeciderBase.")
+    return decider
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    """
+    Odczytuje rozmiar planszy zapisany w postaci `NxM`, np. `8x16`.
+
+    :param size: Rozmiar planszy
+    :type size: str
+
+    :return: Liczba kolumn i wierszy planszy
+    :type: Tuple[int, int]
+
+    :raise ValueError: Gdy rozmiar nie ma postaci `NxM`
+    """
+    n, separator, m = size.lower().partition('x')
+    try:
+        if separator:
+            return int(n), int(m)
+    except ValueError:
+        pass
+    raise ValueError(f"Niepoprawny rozmiar planszy '{size}'; oczekiwano postaci NxM, np. 8x8.")
+
+
+def parse_address(address: str) -> str | Tuple[str, int]:
+    """
+    Odczytuje adres serwera programu decyzyjnego (`decider_server.Address`): `host:port` gniazda TCP
+    albo ścieżkę gniazda Unix.
+
+    :param address: Adres serwera
+    :type address: str
+
+    :return: Para (host, port) albo ścieżka gniazda
+    :type: str | Tuple[str, int]
+    """
+    host, separator, port = address.rpartition(':')
+    if separator and host and port.isdigit():
+        return host, int(port)
+    return address
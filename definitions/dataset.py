@@ -0,0 +1,350 @@
+"""
+Moduł "dataset" zawiera generator zbioru uczącego z partii rozgrywanych przez dwa programy
+decyzyjne (self-play). Każdy ruch partii daje jeden wiersz zbioru:
+
+* `game` (int64) - numer partii,
+* `white`, `black` (int32, n liczb) - wiersze pionów przed ruchem, jak w `Board.to_buffer`,
+* `column`, `amount` (int32) - wybrany ruch,
+* `to_move` (int8) - gracz wykonujący ruch (`batch.WHITE` lub `batch.BLACK`),
+* `outcome` (int8) - wynik partii z punktu widzenia gracza wykonującego ruch: 1 lub -1.
+
+Zbiór jest katalogiem z plikiem `manifest.json` i porcjami `chunk-NNNNNN.bin`. Porcja zawiera same
+kolumny o stałej szerokości zapisane jedna po drugiej w kolejności `COLUMNS` (od najszerszego
+typu, więc każda kolumna jest wyrównana), dzięki czemu `open_chunk` odwzorowuje ją w pamięci bez
+wczytywania. Porcja zawiera całe partie i ma co najmniej `chunk_rows` wierszy (poza ostatnią).
+
+Partie rozgrywane są w puli procesów paczkami po `games_per_task`, a wyniki odbierane są
+w kolejności numerów partii przy ograniczonej liczbie zadań w toku, więc zużycie pamięci nie
+zależy od liczby partii. Manifest jest zastępowany atomowo po zapisaniu każdej porcji, dlatego
+przerwane generowanie można wznowić: porcje spoza manifestu są usuwane, a rozgrywka zaczyna się
+od pierwszej partii, której nie ma w żadnej zapisanej porcji.
+
+Przykład::
+
+    python -m definitions.dataset decider_example:DeciderExample decider_nim:DeciderNim \\
+        --size 8x8 --games 100000 --output selfplay
+"""
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from definitions.batch import BLACK, WHITE
+from definitions.board import Board, Move, Pawn
+from definitions.cli import decider_name, load_decider, parse_size
+from definitions.decider_base import DeciderBase
+from definitions.game import NO_MOVES, play_game
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+
+COLUMNS: Tuple[Tuple[str, str, bool], ...] = (
+    ('game', '<i8', False),
+    ('white', '<i4', True),
+    ('black', '<i4', True),
+    ('column', '<i4', False),
+    ('amount', '<i4', False),
+    ('to_move', 'i1', False),
+    ('outcome', 'i1', False),
+)
+"""Kolumny porcji: (nazwa, typ NumPy, czy kolumna ma n liczb w wierszu)."""
+
+
+class DatasetMismatch(Exception):
+    """
+    Wyjątek rzucany, gdy wznawiany zbiór był generowany z innymi ustawieniami.
+    """
+    pass
+
+
+def chunk_path(directory: str, chunk: int) -> str:
+    """
+    :return: Ścieżka do pliku porcji o podanym numerze
+    :type: str
+    """
+    return os.path.join(directory, f'chunk-{chunk:06d}.bin')
+
+
+def load_manifest(directory: str) -> Optional[Dict]:
+    """
+    :param directory: Katalog zbioru
+    :type directory: str
+
+    :return: Manifest zbioru lub None, gdy zbiór nie ma jeszcze żadnej zapisanej porcji
+    :type: Optional[Dict]
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return None
+
+
+def _save_manifest(directory: str, manifest: Dict) -> None:
+    """
+    Zapisuje manifest do pliku tymczasowego i atomowo zastępuje nim poprzedni manifest.
+    """
+    path = os.path.join(directory, MANIFEST)
+    with open(path + '.tmp', 'w', encoding='utf-8') as output:
+        json.dump(manifest, output, indent=1)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(path + '.tmp', path)
+
+
+class _MoveRecorder:
+    """
+    Zapisuje przyjęte ruchy partii (`game.play_game`, `observers`). Pozycje przed ruchami nie są
+    kopiowane w trakcie partii - `positions` odtwarza je z pozycji początkowej dopiero po jej
+    zakończeniu, więc ruchy sprawdzane przez programy w trakcie przeszukiwania nic nie kosztują.
+    """
+
+    def __init__(self) -> None:
+        self.moves: List[Move] = []
+
+    def on_commit(self, board: Board, move: Move) -> None:
+        self.moves.append(move)
+
+    def positions(self, n: int, m: int) -> np.ndarray:
+        """
+        :return: Wiersze pionów przed każdym ruchem jako tablica (ruchy, 2, n) liczb int32
+        :type: np.ndarray
+        """
+        rows = np.empty((len(self.moves), 2, n), dtype=np.int32)
+        current = np.frombuffer(Board(n, m, compact=True).to_buffer(), dtype=np.int32).reshape(2, n).copy()
+        for ply, move in enumerate(self.moves):
+            rows[ply] = current
+            current[0 if move.color == Pawn.Color.WHITE else 1, move.column] = move.to_field
+        return rows
+
+
+def play_games(white: Type[DeciderBase],
+               black: Type[DeciderBase],
+               n: int,
+               m: int,
+               first_game: int,
+               count: int) -> Dict[str, np.ndarray]:
+    """
+    Rozgrywa `count` partii (`game.play_game`) i zwraca ich wiersze. Funkcja jest wykonywana
+    w procesach puli.
+
+    :param white: Klasa programu grającego białymi
+    :type white: Type[DeciderBase]
+    :param black: Klasa programu grającego czarnymi
+    :type black: Type[DeciderBase]
+    :param n: Liczba kolumn planszy
+    :type n: int
+    :param m: Liczba wierszy planszy
+    :type m: int
+    :param first_game: Numer pierwszej partii
+    :type first_game: int
+    :param count: Liczba partii
+    :type count: int
+
+    :return: Kolumny wierszy wszystkich partii (nazwy jak w `COLUMNS`)
+    :type: Dict[str, np.ndarray]
+
+    :raise Move.InvalidMove: Gdy partia nie zakończy się brakiem ruchów (program wykona niedozwolony
+        ruch lub rzuci wyjątek)
+    """
+    parts = []
+    for game in range(first_game, first_game + count):
+        recorder = _MoveRecorder()
+        result = play_game(white, black, n, m, observers=[recorder])
+        if result.reason != NO_MOVES:
+            raise Move.InvalidMove(f'Partia {game} zakończyła się z powodu {result.reason}.')
+        moves = recorder.moves
+        rows = recorder.positions(n, m)
+        to_move = np.array([WHITE if move.color == Pawn.Color.WHITE else BLACK for move in moves],
+                           dtype=np.int8)
+        winner = WHITE if result.winner == Pawn.Color.WHITE else BLACK
+        parts.append({
+            'game': np.full(len(moves), game, dtype=np.int64),
+            'white': rows[:, 0],
+            'black': rows[:, 1],
+            'column': np.array([move.column for move in moves], dtype=np.int32),
+            'amount': np.array([move.amount for move in moves], dtype=np.int32),
+            'to_move': to_move,
+            'outcome': np.where(to_move == winner, 1, -1).astype(np.int8),
+        })
+    if not parts:
+        return {name: np.empty((0, n) if per_column else 0, dtype) for name, dtype, per_column in COLUMNS}
+    return {name: np.concatenate([part[name] for part in parts]) for name, _, _ in COLUMNS}
+
+
+def _write_chunk(path: str, parts: List[Dict[str, np.ndarray]]) -> int:
+    """
+    Zapisuje kolumny paczek partii jako jedną porcję i zwraca liczbę jej wierszy.
+    """
+    rows = 0
+    with open(path, 'wb') as output:
+        for name, dtype, _ in COLUMNS:
+            column = np.concatenate([part[name] for part in parts]).astype(dtype, copy=False)
+            output.write(np.ascontiguousarray(column).tobytes())
+            rows = len(column)
+        output.flush()
+        os.fsync(output.fileno())
+    return rows
+
+
+def open_chunk(directory: str, chunk: int) -> Dict[str, np.ndarray]:
+    """
+    Odwzorowuje porcję zbioru w pamięci tylko do odczytu.
+
+    :param directory: Katalog zbioru
+    :type directory: str
+    :param chunk: Numer porcji
+    :type chunk: int
+
+    :return: Kolumny porcji jako tablice `np.memmap`
+    :type: Dict[str, np.ndarray]
+
+    :raise IndexError: Gdy porcji nie ma w manifeście
+    """
+    manifest = load_manifest(directory)
+    if manifest is None or not 0 <= chunk < len(manifest['chunks']):
+        raise IndexError(f'Zbiór w katalogu {directory} nie ma porcji {chunk}.')
+    rows = manifest['chunks'][chunk]['rows']
+    n = manifest['n']
+    columns = {}
+    offset = 0
+    for name, dtype, per_column in COLUMNS:
+        shape = (rows, n) if per_column else (rows,)
+        columns[name] = np.memmap(chunk_path(directory, chunk), dtype=dtype, mode='r',
+                                  offset=offset, shape=shape) if rows else np.empty(shape, dtype)
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+    return columns
+
+
+def iter_chunks(directory: str) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    :return: Kolejne porcje zbioru odwzorowane w pamięci (`open_chunk`)
+    :type: Iterator[Dict[str, np.ndarray]]
+    """
+    manifest = load_manifest(directory)
+    for chunk in range(len(manifest['chunks']) if manifest else 0):
+        yield open_chunk(directory, chunk)
+
+
+def generate_dataset(white: Type[DeciderBase],
+                     black: Type[DeciderBase],
+                     n: int,
+                     m: int,
+                     games: int,
+                     output: str,
+                     chunk_rows: int = 1 << 20,
+                     workers: Optional[int] = None,
+                     games_per_task: int = 64) -> Dict:
+    """
+    Rozgrywa partie o numerach od 0 do `games` - 1 i zapisuje ich wiersze do zbioru w katalogu
+    `output`, pomijając partie zapisane w nim wcześniej.
+
+    :param white: Klasa programu grającego białymi (zdefiniowana na poziomie modułu)
+    :type white: Type[DeciderBase]
+    :param black: Klasa programu grającego czarnymi (zdefiniowana na poziomie modułu)
+    :type black: Type[DeciderBase]
+    :param n: Liczba kolumn planszy
+    :type n: int
+    :param m: Liczba wierszy planszy
+    :type m: int
+    :param games: Łączna liczba partii zbioru
+    :type games: int
+    :param output: Katalog zbioru
+    :type output: str
+    :param chunk_rows: Minimalna liczba wierszy porcji
+    :type chunk_rows: int
+    :param workers: Liczba procesów; domyślnie liczba rdzeni. 0 oznacza grę w bieżącym procesie
+    :type workers: Optional[int]
+    :param games_per_task: Liczba partii w jednym zadaniu puli
+    :type games_per_task: int
+
+    :return: Manifest zbioru
+    :type: Dict
+
+    :raise DatasetMismatch: Gdy katalog zawiera zbiór wygenerowany z innymi programami lub planszą
+    """
+    os.makedirs(output, exist_ok=True)
+    settings = {'version': FORMAT_VERSION, 'white': decider_name(white),
+                'black': decider_name(black), 'n': n, 'm': m,
+                'columns': [[name, dtype, per_column] for name, dtype, per_column in COLUMNS]}
+    manifest = load_manifest(output)
+    if manifest is None:
+        manifest = {**settings, 'games': 0, 'rows': 0, 'chunks': []}
+    elif any(manifest[key] != value for key, value in settings.items()):
+        raise DatasetMismatch(f'Zbiór w katalogu {output} został wygenerowany z innymi ustawieniami.')
+    for name in os.listdir(output):
+        if name.startswith('chunk-') and name not in {chunk['file'] for chunk in manifest['chunks']}:
+            os.remove(os.path.join(output, name))
+
+    tasks = ((first, min(games_per_task, games - first))
+             for first in range(manifest['games'], games, games_per_task))
+    parts: List[Dict[str, np.ndarray]] = []
+    buffered = 0
+    next_game = manifest['games']
+
+    def flush() -> None:
+        nonlocal parts, buffered
+        chunk = len(manifest['chunks'])
+        path = chunk_path(output, chunk)
+        rows = _write_chunk(path, parts)
+        manifest['chunks'].append({'file': os.path.basename(path), 'rows': rows,
+                                   'first_game': manifest['games'], 'games': next_game - manifest['games']})
+        manifest['games'] = next_game
+        manifest['rows'] += rows
+        _save_manifest(output, manifest)
+        parts, buffered = [], 0
+
+    def collect(part: Dict[str, np.ndarray], count: int) -> None:
+        nonlocal buffered, next_game
+        parts.append(part)
+        buffered += len(part['game'])
+        next_game += count
+        if buffered >= chunk_rows:
+            flush()
+
+    if workers == 0:
+        for first, count in tasks:
+            collect(play_games(white, black, n, m, first, count), count)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            limit = 4 * (workers or os.cpu_count() or 1)
+            for first, count in tasks:
+                pending.append((executor.submit(play_games, white, black, n, m, first, count), count))
+                if len(pending) >= limit:
+                    future, task_count = pending.popleft()
+                    collect(future.result(), task_count)
+            while pending:
+                future, task_count = pending.popleft()
+                collect(future.result(), task_count)
+    if parts:
+        flush()
+    return manifest
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Generowanie zbioru uczącego z partii self-play.')
+    parser.add_argument('white', help='program grający białymi w postaci moduł:Klasa')
+    parser.add_argument('black', help='program grający czarnymi w postaci moduł:Klasa')
+    parser.add_argument('--size', default='8x8', help='rozmiar planszy, np. 8x8')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--output', default='selfplay')
+    parser.add_argument('--chunk-rows', type=int, default=1 << 20)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--games-per-task', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    n, m = parse_size(args.size)
+    manifest = generate_dataset(load_decider(args.white), load_decider(args.black), n, m,
+                                args.games, args.output, args.chunk_rows, args.workers,
+                                args.games_per_task)
+    print(f"Zbiór '{args.output}': {manifest['games']} partii, {manifest['rows']} wierszy, "
+          f"{len(manifest['chunks'])} porcji.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
-from definitions.board import Board, Pawn
+from typing import Optional, Tuple
+
+from definitions.board import Board, Move, Pawn
 from abc import ABC, abstractmethod
 
 class DeciderBase(ABC):
@@ -11,12 +13,36 @@ class DeciderBase(ABC):
         self.color = color
 
     @abstractmethod
+    def find_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Wybiera ruch na aktualnym stanie `self.board`. Metoda powinna samodzielnie zdecydować jaki
+        ruch należy wykonać. Może przy tym korzystać ze wszystkich danych board, ale nie może
+        wprowadzać żadnych zmian - do sprawdzania ruchów można użyć kopii `self.board.clone()`,
+        która kosztuje O(1).
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
+        """
+        raise NotImplementedError("Wykonano metodę abstrakcyjną.")
+
     def move(self) -> None:
         """
-        Wykonuje ruch na aktualnym stanie `move_pawn` na `self.board`. Metoda powinna samodzielnie
-        zdecydować jaki ruch należy wykonać. Może przy tym korzystać ze wszystkich danych board, ale
-        nie może wprowadzać żadnych zmian. Metoda nie zwraca wyniku.
+        Wykonuje na `self.board` ruch wybrany przez `find_move`. Metoda nie zwraca wyniku.
+
+        :return: None
+
+        :raise Move.InvalidMove: Gdy na planszy nie ma już żadnego dozwolonego ruchu
+        """
+        found = self.find_move()
+        if found is None:
+            raise Move.InvalidMove("Na planszy nie ma już żadnego dozwolonego ruchu.")
+        column, amount = found
+        self.board.move_pawn(Move(self.board, self.color, column, amount))
+
+    def close(self) -> None:
+        """
+        Zwalnia zasoby programu (np. pulę procesów) po zakończeniu partii. Pętle rozgrywki wywołują
+        ją zawsze, także po porażce programu. Domyślnie nic nie robi.
 
         :return: None
         """
-        raise NotImplemented("Wykonano metodę abstrakcyjną.")
\ No newline at end of file
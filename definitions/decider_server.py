@@ -0,0 +1,390 @@
+"""
+Moduł "decider_server" pozwala uruchomić program decyzyjny w osobnym, długo działającym procesie
+i odpytywać go z wielu procesów gry przez gniazdo Unix lub TCP na localhost.
+
+Komunikaty są ramkami poprzedzonymi 4-bajtową długością (little-endian):
+
+* zapytanie - numer zapytania (uint32), kolor gracza (uint8: 0 biały, 1 czarny), n i m (uint32),
+  a po nich wiersze pionów w formacie `Board.to_buffer` (int32, kolejność bajtów maszyny -
+  gniazdo jest lokalne),
+* odpowiedź - numer zapytania (uint32), status (uint8), kolumna i liczba pól (int32) oraz, dla
+  statusu `STATUS_ERROR`, opis błędu w UTF-8.
+
+Zapytania obsługiwane są przez pulę procesów. Każdy proces tworzy programy decyzyjne raz - przy
+starcie - i używa ich do wszystkich kolejnych zapytań, więc przygotowanie programu (wczytanie
+tablic, wypełnienie pamięci podręcznych) odbywa się jednorazowo. Klient może wysłać wiele zapytań
+jednym połączeniem bez czekania na odpowiedzi, a serwer odpowiada na nie w kolejności ich
+zakończenia.
+
+Uruchomienie serwera::
+
+    python -m definitions.decider_server decider_negamax:DeciderNegamax --unix /tmp/decider.sock
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import queue
+import socket
+import struct
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from definitions.board import Board, Pawn
+from definitions.cli import load_decider
+from definitions.decider_base import DeciderBase
+
+Address = str | Tuple[str, int]
+"""Ścieżka gniazda Unix albo para (host, port) gniazda TCP."""
+
+STATUS_OK = 0
+STATUS_NO_MOVE = 1
+STATUS_ERROR = 2
+
+_LENGTH = struct.Struct('<I')
+_REQUEST = struct.Struct('<IBII')
+_RESPONSE = struct.Struct('<IBii')
+_COLORS = (Pawn.Color.WHITE, Pawn.Color.BLACK)
+
+
+def encode_request(request_id: int, board: Board, color: Pawn.Color) -> bytes:
+    """
+    :return: Ramka zapytania o ruch gracza `color` na planszy `board`
+    :type: bytes
+    """
+    payload = _REQUEST.pack(request_id, _COLORS.index(color), board.n, board.m) + board.to_buffer().tobytes()
+    return _LENGTH.pack(len(payload)) + payload
+
+
+class _DeciderWorker:
+    """
+    Programy decyzyjne obu kolorów utworzone raz i używane do kolejnych zapytań.
+    """
+
+    def __init__(self, decider: Type[DeciderBase]) -> None:
+        board = Board(1, 2, compact=True)
+        self.deciders: Dict[Pawn.Color, DeciderBase] = {color: decider(board, color) for color in _COLORS}
+
+    def choose(self, payload: bytes) -> Tuple[int, int, int, str]:
+        _, color_index, n, m = _REQUEST.unpack_from(payload)
+        color = _COLORS[color_index]
+        try:
+            board = Board.from_buffer(memoryview(payload)[_REQUEST.size:_REQUEST.size + 8 * n], m)
+            if board.count_legal_moves(color) == 0:
+                return STATUS_NO_MOVE, -1, -1, ''
+            decider = self.deciders[color]
+            decider.board = board
+            decider.move()
+            if len(board.moves) != 1 or board.moves[0].color != color:
+                return STATUS_ERROR, -1, -1, 'Program nie wykonał dokładnie jednego ruchu.'
+            return STATUS_OK, board.moves[0].column, board.moves[0].amount, ''
+        except Exception as error:
+            return STATUS_ERROR, -1, -1, f'{type(error).__name__}: {error}'
+
+
+_worker: Optional[_DeciderWorker] = None
+
+
+def _init_worker(decider: Type[DeciderBase]) -> None:
+    global _worker
+    _worker = _DeciderWorker(decider)
+
+
+def _choose_in_worker(payload: bytes) -> Tuple[int, int, int, str]:
+    return _worker.choose(payload)
+
+
+class DeciderServer:
+    """
+    Serwer udostępniający program decyzyjny przez gniazdo.
+    """
+
+    def __init__(self,
+                 decider: Type[DeciderBase],
+                 address: Address,
+                 workers: Optional[int] = None) -> None:
+        """
+        :param decider: Klasa programu decyzyjnego (zdefiniowana na poziomie modułu)
+        :type decider: Type[DeciderBase]
+        :param address: Ścieżka gniazda Unix albo para (host, port); port 0 wybiera wolny port
+        :type address: Address
+        :param workers: Liczba procesów obsługujących zapytania; domyślnie liczba rdzeni.
+            0 oznacza obsługę w procesie serwera, w jednym wątku
+        :type workers: Optional[int]
+        """
+        self.decider = decider
+        self.address = address
+        self.workers = workers
+        self.requests = 0
+        self._executor: Optional[Executor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._local: Optional[_DeciderWorker] = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self) -> Address:
+        """
+        Uruchamia pulę procesów i zaczyna przyjmować połączenia.
+
+        :return: Adres, na którym serwer nasłuchuje (z faktycznym numerem portu)
+        :type: Address
+        """
+        if self.workers == 0:
+            self._local = _DeciderWorker(self.decider)
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.decider,))
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            self._server = await asyncio.start_unix_server(self._handle, self.address)
+        else:
+            self._server = await asyncio.start_server(self._handle, *self.address)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    async def close(self) -> None:
+        """
+        Zamyka gniazdo i pulę procesów.
+
+        :return: None
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in self._handlers.values():
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    async def serve_forever(self) -> None:
+        """
+        Uruchamia serwer i obsługuje połączenia do czasu przerwania.
+
+        :return: None
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    @contextmanager
+    def running(self):
+        """
+        Menedżer kontekstu uruchamiający serwer w osobnym wątku na czas bloku `with`::
+
+            with DeciderServer(DeciderNegamax, ('127.0.0.1', 0)).running() as address:
+                client = DeciderClient(address)
+
+        :return: Adres, na którym serwer nasłuchuje
+        """
+        ready = threading.Event()
+        loop = asyncio.new_event_loop()
+        stop = asyncio.Event()
+        failure = []
+
+        async def run() -> None:
+            try:
+                await self.start()
+            except Exception as error:
+                failure.append(error)
+                return
+            finally:
+                ready.set()
+            await stop.wait()
+            await self.close()
+
+        thread = threading.Thread(target=loop.run_until_complete, args=(run(),), daemon=True)
+        thread.start()
+        ready.wait()
+        if failure:
+            thread.join()
+            loop.close()
+            raise failure[0]
+        try:
+            yield self.address
+        finally:
+            loop.call_soon_threadsafe(stop.set)
+            thread.join()
+            loop.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        handler = asyncio.current_task()
+        self._handlers[handler] = writer
+        pending = set()
+        try:
+            while True:
+                try:
+                    length, = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                    payload = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                task = asyncio.ensure_future(self._respond(payload, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            del self._handlers[handler]
+            writer.close()
+
+    async def _respond(self, payload: bytes, writer: asyncio.StreamWriter) -> None:
+        request_id, = struct.unpack_from('<I', payload)
+        loop = asyncio.get_running_loop()
+        if self._local is not None:
+            status, column, amount, message = await loop.run_in_executor(
+                self._executor, self._local.choose, payload)
+        else:
+            status, column, amount, message = await loop.run_in_executor(
+                self._executor, _choose_in_worker, payload)
+        self.requests += 1
+        response = _RESPONSE.pack(request_id, status, column, amount) + message.encode('utf-8')
+        writer.write(_LENGTH.pack(len(response)) + response)
+        await writer.drain()
+
+
+class _Connection:
+    def __init__(self, address: Address) -> None:
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.connect(address)
+        if family == socket.AF_INET:
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def read_exactly(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('Serwer zamknął połączenie.')
+            data += chunk
+        return bytes(data)
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+class DeciderClient:
+    """
+    Klient serwera programu decyzyjnego z pulą połączeń. Można go używać z wielu wątków - każdy
+    wątek pobiera z puli osobne połączenie.
+    """
+
+    class RemoteError(Exception):
+        """
+        Wyjątek rzucany, gdy program decyzyjny po stronie serwera zgłosił błąd.
+        """
+        pass
+
+    def __init__(self, address: Address, pool_size: int = 4) -> None:
+        """
+        :param address: Adres serwera
+        :type address: Address
+        :param pool_size: Maksymalna liczba połączeń przechowywanych w puli
+        :type pool_size: int
+        """
+        self.address = address
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connection(self):
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = _Connection(self.address)
+        try:
+            yield connection
+        except BaseException:
+            connection.close()
+            raise
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def choose(self, board: Board, color: Pawn.Color) -> Optional[Tuple[int, int]]:
+        """
+        Pyta serwer o ruch gracza `color` w pozycji planszy.
+
+        :return: Ruch jako para (kolumna, liczba pól) lub None, gdy nie ma dozwolonych ruchów
+        :type: Optional[Tuple[int, int]]
+
+        :raise DeciderClient.RemoteError: Gdy program po stronie serwera zgłosił błąd
+        """
+        return self.choose_many([(board, color)])[0]
+
+    def choose_many(self, requests: Iterable[Tuple[Board, Pawn.Color]]) -> List[Optional[Tuple[int, int]]]:
+        """
+        Wysyła wszystkie zapytania jednym połączeniem bez czekania na odpowiedzi, a następnie
+        odbiera odpowiedzi, które serwer może przysyłać w dowolnej kolejności.
+
+        :param requests: Pary (plansza, kolor gracza)
+        :type requests: Iterable[Tuple[Board, Pawn.Color]]
+
+        :return: Ruchy w kolejności zapytań
+        :type: List[Optional[Tuple[int, int]]]
+
+        :raise DeciderClient.RemoteError: Gdy program po stronie serwera zgłosił błąd
+        """
+        with self._lock:
+            frames = {next(self._ids): request for request in requests}
+        positions = {request_id: i for i, request_id in enumerate(frames)}
+        results: List[Optional[Tuple[int, int]]] = [None] * len(frames)
+        errors = []
+        with self._connection() as connection:
+            connection.socket.sendall(b''.join(encode_request(request_id, board, color)
+                                               for request_id, (board, color) in frames.items()))
+            for _ in range(len(frames)):
+                length, = _LENGTH.unpack(connection.read_exactly(_LENGTH.size))
+                response = connection.read_exactly(length)
+                request_id, status, column, amount = _RESPONSE.unpack_from(response)
+                if status == STATUS_OK:
+                    results[positions[request_id]] = (column, amount)
+                elif status == STATUS_ERROR:
+                    errors.append(response[_RESPONSE.size:].decode('utf-8'))
+        if errors:
+            raise self.RemoteError(errors[0])
+        return results
+
+    def close(self) -> None:
+        """
+        Zamyka wszystkie połączenia z puli.
+
+        :return: None
+        """
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Serwer programu decyzyjnego.')
+    parser.add_argument('decider', help='program w postaci moduł:Klasa')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--unix', help='ścieżka gniazda Unix')
+    target.add_argument('--port', type=int, help='port TCP na localhost')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    address = args.unix if args.unix is not None else ('127.0.0.1', args.port)
+    server = DeciderServer(load_decider(args.decider), address, args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+"""
+Moduł "evaluation_cache" zawiera pamięć podręczną ocen pozycji dla heurystycznych programów
+decyzyjnych, które wielokrotnie oceniają te same pozycje - w kolejnych ruchach i kolejnych partiach
+rozgrywanych w jednym procesie.
+
+* `EvaluationCache` - pamięć LRU o ograniczonym rozmiarze z licznikami trafień, chybień i usunięć,
+* `SharedEvaluationTable` - opcjonalny drugi poziom: tablica ocen w pamięci współdzielonej
+  (`multiprocessing.shared_memory`), z której korzystają wszystkie procesy puli,
+* `cached_evaluation` - dekorator metody oceniającej programu decyzyjnego.
+
+Przykład::
+
+    class DeciderCached(DeciderNegamax):
+        @cached_evaluation(max_bytes=64 * 2**20)
+        def evaluate(self, color: Pawn.Color) -> float:
+            ...
+
+    DeciderCached.evaluate.cache.stats().hit_rate
+"""
+import inspect
+import struct
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, NamedTuple, Optional
+
+from definitions.board import Board, Pawn
+from definitions.shared_board import SharedMemoryBlock
+
+_SALT = 0x9E3779B97F4A7C15
+"""Stała dołączana do sumy kontrolnej wpisu, aby pusty wpis (same zera) nie pasował do klucza 0."""
+
+_KEY_MASK = (1 << 64) - 1
+
+_DOUBLE = struct.Struct('<d')
+_QWORD = struct.Struct('<Q')
+
+
+class CacheStats(NamedTuple):
+    """
+    Liczniki pamięci podręcznej.
+
+    * `hits` - trafienia (łącznie z `shared_hits`),
+    * `misses` - chybienia,
+    * `evictions` - wpisy usunięte z powodu braku miejsca,
+    * `shared_hits` - trafienia w tablicy współdzielonej po chybieniu w pamięci lokalnej,
+    * `size`, `capacity` - liczba wpisów i maksymalna liczba wpisów pamięci lokalnej.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    shared_hits: int
+    size: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        :return: Odsetek trafień wśród wszystkich odczytów lub 0, gdy nie było odczytów
+        :type: float
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SharedEvaluationTable(SharedMemoryBlock):
+    """
+    Tablica ocen o stałym rozmiarze w pamięci współdzielonej. Blok zaczyna się od liczby wpisów,
+    po której leżą sumy kontrolne i oceny wszystkich wpisów. Każdy wpis to 16 bajtów: suma
+    kontrolna (klucz XOR bity oceny) i ocena. Wpis pod numerem `klucz & maska` jest zawsze
+    zastępowany nowym, a odczyt sprawdza sumę kontrolną, więc wpis nadpisany w połowie przez inny
+    proces jest traktowany jak chybienie. Tablica nie wymaga blokad.
+
+    Każdy proces może odczytywać i zapisywać wpisy; tylko właściciel może usunąć blok (`unlink`).
+    """
+
+    ENTRY_SIZE = 16
+    """Liczba bajtów zajmowanych przez jeden wpis."""
+
+    def __init__(self, max_bytes: int = 16 * 2**20, name: Optional[str] = None) -> None:
+        """
+        Tworzy pustą tablicę mieszczącą się w zadanym budżecie pamięci.
+
+        :param max_bytes: Maksymalna liczba bajtów zajmowana przez wpisy tablicy
+        :type max_bytes: int
+        :param name: Nazwa bloku pamięci; domyślnie nadawana przez system
+        :type name: Optional[str]
+
+        :raise ValueError: Gdy budżet nie mieści nawet jednego wpisu
+        """
+        entries = max_bytes // self.ENTRY_SIZE
+        if entries < 1:
+            raise ValueError(f"Budżet {max_bytes} B jest za mały dla tablicy ocen. "
+                             f"Potrzeba co najmniej {self.ENTRY_SIZE} B.")
+        capacity = 1 << (entries.bit_length() - 1)
+        self._create_memory(8 + self.ENTRY_SIZE * capacity, name)
+        self._memory.buf[:8] = _QWORD.pack(capacity)
+        self._map_memory()
+
+    def _init_attached(self) -> None:
+        self._map_memory()
+
+    def _map_memory(self) -> None:
+        """
+        Tworzy widoki sum kontrolnych i ocen; liczba wpisów zapisana jest w pierwszych 8 bajtach bloku.
+        """
+        buffer = self._memory.buf
+        self.capacity = capacity = _QWORD.unpack_from(buffer)[0]
+        self._mask = capacity - 1
+        self._checks = buffer[8:8 + 8 * capacity].cast('Q')
+        self._values = buffer[8 + 8 * capacity:8 + 16 * capacity].cast('Q')
+
+    def get(self, key: int) -> Optional[float]:
+        """
+        :param key: 64-bitowy klucz pozycji
+        :type key: int
+
+        :return: Zapisana ocena lub None, gdy pozycji nie ma w tablicy
+        :type: Optional[float]
+        """
+        slot = key & self._mask
+        bits = self._values[slot]
+        if self._checks[slot] ^ bits ^ _SALT != key:
+            return None
+        return _DOUBLE.unpack(_QWORD.pack(bits))[0]
+
+    def put(self, key: int, value: float) -> None:
+        """
+        :param key: 64-bitowy klucz pozycji
+        :type key: int
+        :param value: Ocena pozycji
+        :type value: float
+
+        :return: None
+        """
+        slot = key & self._mask
+        bits = _QWORD.unpack(_DOUBLE.pack(value))[0]
+        self._values[slot] = bits
+        self._checks[slot] = key ^ bits ^ _SALT
+
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie wpisy z tablicy we wszystkich procesach.
+
+        :return: None
+        """
+        with self._checks.cast('B') as raw:
+            raw[:] = bytes(len(raw))
+
+    def _release_views(self) -> None:
+        self._checks.release()
+        self._values.release()
+
+
+class EvaluationCache:
+    """
+    Pamięć podręczna ocen pozycji z usuwaniem najdawniej używanych wpisów (LRU). Wpisy trzymane są
+    w `OrderedDict` uporządkowanym od najdawniej do ostatnio użytego, więc odczyt, zapis i usunięcie
+    wpisu zajmują czas stały.
+
+    Rozmiar pamięci ograniczony jest liczbą wpisów wyliczoną z budżetu `max_bytes` i szacunkowego
+    rozmiaru wpisu (`ENTRY_SIZE`). Z tablicą współdzieloną (`shared`) chybienie w pamięci lokalnej
+    sprawdza jeszcze tablicę, a każda zapisana ocena trafia do obu.
+    """
+
+    ENTRY_SIZE = 160
+    """Szacunkowa liczba bajtów zajmowanych przez jeden wpis: klucz, ocena i węzeł `OrderedDict`."""
+
+    def __init__(self,
+                 max_bytes: int = 16 * 2**20,
+                 shared: Optional[SharedEvaluationTable] = None) -> None:
+        """
+        :param max_bytes: Maksymalna liczba bajtów zajmowana przez wpisy pamięci lokalnej
+        :type max_bytes: int
+        :param shared: Tablica ocen współdzielona między procesami
+        :type shared: Optional[SharedEvaluationTable]
+
+        :raise ValueError: Gdy budżet nie mieści nawet jednego wpisu
+        """
+        self.capacity = max_bytes // self.ENTRY_SIZE
+        if self.capacity < 1:
+            raise ValueError(f"Budżet {max_bytes} B jest za mały dla pamięci ocen. "
+                             f"Potrzeba co najmniej {self.ENTRY_SIZE} B.")
+        self.shared = shared
+        self._entries: 'OrderedDict[int, float]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def get(self, key: int) -> Optional[float]:
+        """
+        Odczytuje ocenę pozycji i oznacza wpis jako ostatnio użyty.
+
+        :param key: 64-bitowy klucz pozycji
+        :type key: int
+
+        :return: Zapisana ocena lub None, gdy pozycji nie ma w pamięci
+        :type: Optional[float]
+        """
+        entries = self._entries
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.hits += 1
+                self.shared_hits += 1
+                self._insert(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: int, value: float) -> None:
+        """
+        Zapisuje ocenę pozycji, usuwając najdawniej użyty wpis, gdy pamięć jest pełna.
+
+        :param key: 64-bitowy klucz pozycji
+        :type key: int
+        :param value: Ocena pozycji
+        :type value: float
+
+        :return: None
+        """
+        self._insert(key, value)
+        if self.shared is not None:
+            self.shared.put(key, value)
+
+    def _insert(self, key: int, value: float) -> None:
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = value
+
+    def stats(self) -> CacheStats:
+        """
+        :return: Liczniki pamięci
+        :type: CacheStats
+        """
+        return CacheStats(self.hits, self.misses, self.evictions, self.shared_hits,
+                          len(self._entries), self.capacity)
+
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie wpisy pamięci lokalnej i zeruje liczniki. Tablica współdzielona nie jest
+        czyszczona.
+
+        :return: None
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = self.shared_hits = 0
+
+
+def position_key(board: Board, color: Optional[Pawn.Color] = None, *args, **kwargs) -> int:
+    """
+    Domyślny klucz oceny: `Board.canonical_key` dla gracza `color` (lub `board.to_move`), wspólny
+    dla pozycji symetrycznych. Ocena musi wtedy zależeć tylko od pozycji i gracza wykonującego ruch,
+    a nie od kolejności kolumn. Pozostałe argumenty metody (np. głębokość), także nazwane - w
+    kolejności nazw - są dołączane do klucza, więc muszą być haszowalne; przy tablicy współdzielonej
+    ich hasz musi być taki sam we wszystkich procesach (np. liczby).
+
+    :return: 64-bitowy klucz pozycji
+    :type: int
+
+    :raise TypeError: Gdy któryś z pozostałych argumentów nie jest haszowalny
+    """
+    key = board.canonical_key(color if color is not None else board.to_move)
+    if kwargs:
+        key = hash((key, args, tuple(sorted(kwargs.items())))) & _KEY_MASK
+    elif args:
+        key = hash((key, args)) & _KEY_MASK
+    return key
+
+
+def cached_evaluation(method: Optional[Callable] = None,
+                      *,
+                      max_bytes: int = 16 * 2**20,
+                      cache: Optional[EvaluationCache] = None,
+                      key: Callable[..., int] = position_key) -> Callable:
+    """
+    Dekorator metody oceniającej pozycję na planszy `self.board`, np. `evaluate(self, color)`.
+    Oceny zapisywane są w jednej pamięci wspólnej dla wszystkich obiektów klasy w procesie
+    (`metoda.cache`). Można go użyć bez argumentów (`@cached_evaluation`) lub z argumentami.
+
+    :param method: Dekorowana metoda
+    :type method: Optional[Callable]
+    :param max_bytes: Budżet pamięci nowej pamięci podręcznej
+    :type max_bytes: int
+    :param cache: Istniejąca pamięć podręczna, np. z tablicą współdzieloną
+    :type cache: Optional[EvaluationCache]
+    :param key: Funkcja `key(board, *argumenty, **argumenty nazwane)` wyliczająca klucz pozycji.
+        Argumenty przekazane z nazwą, które można podać pozycyjnie, trafiają do niej pozycyjnie, więc
+        `evaluate(color=...)` i `evaluate(...)` mają ten sam klucz
+    :type key: Callable[..., int]
+
+    :return: Metoda korzystająca z pamięci podręcznej
+    :type: Callable
+    """
+    def decorate(function: Callable) -> Callable:
+        evaluations = cache if cache is not None else EvaluationCache(max_bytes)
+        signature = inspect.signature(function)
+
+        @wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if kwargs:
+                bound = signature.bind(self, *args, **kwargs)
+                args, kwargs = bound.args[1:], bound.kwargs
+            position = key(self.board, *args, **kwargs)
+            value = evaluations.get(position)
+            if value is None:
+                value = function(self, *args, **kwargs)
+                evaluations.put(position, value)
+            return value
+
+        wrapper.cache = evaluations
+        return wrapper
+
+    return decorate(method) if method is not None else decorate
@@ -0,0 +1,214 @@
+"""
+Moduł "game" zawiera pętlę rozgrywki między dwoma programami decyzyjnymi.
+
+Partię zaczyna gracz biały, a gracze wykonują ruchy na przemian. Przegrywa gracz, który nie ma
+żadnego dozwolonego ruchu, przekroczy limit czasu na ruch, wykona niedozwolony ruch lub którego
+program rzuci wyjątek.
+
+Gdy podany jest limit czasu na ruch, metoda `move` wykonywana jest w osobnym wątku na kopii planszy
+(`PendingMove`) i partia czeka na nią najwyżej przez ten limit. Ruch, który nie zdąży przed
+terminem, nie zmienia planszy partii, a spóźniony wątek jest porzucany (wątek demona nie wstrzymuje
+zakończenia procesu).
+"""
+import threading
+from concurrent.futures import Executor, Future, wait
+from contextlib import ExitStack
+from time import perf_counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Type
+
+from definitions.board import Board, Move, Pawn
+from definitions.decider_base import DeciderBase
+from definitions.instrumentation import instrumented
+
+
+class GameResult(NamedTuple):
+    """
+    Wynik partii.
+
+    * `winner` - zwycięzca,
+    * `reason` - powód zakończenia partii: `no_moves`, `timeout`, `illegal` lub `error`,
+    * `plies` - liczba wykonanych ruchów,
+    * `white_times`, `black_times` - czasy kolejnych ruchów obu graczy w sekundach,
+    * `profile` - liczba wywołań i czas mierzonych metod (`instrumentation.summary()`), jeśli partia
+      była rozgrywana z `instrument=True`.
+    """
+    winner: Pawn.Color
+    reason: str
+    plies: int
+    white_times: List[float]
+    black_times: List[float]
+    profile: Optional[Dict[str, Dict[str, float]]] = None
+
+
+NO_MOVES = 'no_moves'
+TIMEOUT = 'timeout'
+ILLEGAL = 'illegal'
+ERROR = 'error'
+
+
+class PendingMove:
+    """
+    Ruch programu decyzyjnego wykonywany na kopii planszy partii (`Board.clone`) w osobnym wątku
+    lub w podanej puli. Plansza partii zmienia się dopiero w `commit`, więc ruch, na który partia
+    nie czeka do końca, nie ma na nią wpływu. Z tej klasy korzystają obie pętle rozgrywki:
+    `play_game` i `async_game.play_game_async`.
+
+    `future` kończy się wraz z metodą `move` programu (wątek demona nie wstrzymuje zakończenia
+    procesu, gdy program się zawiesi).
+    """
+
+    def __init__(self, decider: DeciderBase, board: Board, color: Pawn.Color,
+                 executor: Optional[Executor] = None) -> None:
+        """
+        :param decider: Program decyzyjny wykonujący ruch
+        :type decider: DeciderBase
+        :param board: Plansza partii
+        :type board: Board
+        :param color: Kolor gracza wykonującego ruch
+        :type color: Pawn.Color
+        :param executor: Pula wykonująca metodę `move`; domyślnie osobny wątek demona
+        :type executor: Optional[Executor]
+        """
+        self.board = board
+        self.color = color
+        self.clone = board.clone()
+        decider.board = self.clone
+        if executor is not None:
+            self.future = executor.submit(decider.move)
+            return
+        self.future = Future()
+        self.future.set_running_or_notify_cancel()
+
+        def run() -> None:
+            try:
+                decider.move()
+            except BaseException as error:
+                self.future.set_exception(error)
+            else:
+                self.future.set_result(None)
+
+        threading.Thread(target=run, name=f'move-{color.name.lower()}', daemon=True).start()
+
+    def failure(self) -> Optional[str]:
+        """
+        :return: Powód porażki gracza po zakończeniu `future` (`ERROR` lub `ILLEGAL`) albo None,
+            gdy program wykonał na kopii planszy dokładnie jeden własny ruch
+        :type: Optional[str]
+        """
+        if self.future.exception() is not None:
+            return ERROR
+        moves = self.clone.moves
+        if len(moves) != len(self.board.moves) + 1 or moves[-1].color != self.color:
+            return ILLEGAL
+        return None
+
+    def commit(self) -> Move:
+        """
+        Przenosi ruch wykonany na kopii planszy na planszę partii.
+
+        :return: Wykonany ruch
+        :type: Move
+        """
+        found = self.clone.moves[-1]
+        move = Move(self.board, self.color, found.column, found.amount)
+        self.board.move_pawn(move)
+        return move
+
+
+def _move_before_deadline(decider: DeciderBase, board: Board, color: Pawn.Color,
+                          move_time_limit: float) -> Optional[str]:
+    """
+    Wykonuje ruch programu (`PendingMove`) i przenosi go na planszę partii, jeśli program zdąży
+    przed terminem.
+
+    :param decider: Program decyzyjny wykonujący ruch
+    :type decider: DeciderBase
+    :param board: Plansza partii
+    :type board: Board
+    :param color: Kolor gracza wykonującego ruch
+    :type color: Pawn.Color
+    :param move_time_limit: Limit czasu na ruch w sekundach
+    :type move_time_limit: float
+
+    :return: Powód porażki gracza (`TIMEOUT`, `ERROR` lub `ILLEGAL`) albo None, gdy ruch wykonano
+    :type: Optional[str]
+    """
+    pending = PendingMove(decider, board, color)
+    if not wait([pending.future], move_time_limit).done:
+        return TIMEOUT
+    reason = pending.failure()
+    if reason is None:
+        pending.commit()
+    return reason
+
+
+def play_game(white: Type[DeciderBase],
+              black: Type[DeciderBase],
+              n: int,
+              m: int,
+              move_time_limit: Optional[float] = None,
+              compact: bool = True,
+              instrument: bool = False,
+              observers: Sequence = ()) -> GameResult:
+    """
+    Rozgrywa partię między dwoma programami decyzyjnymi na nowej planszy n x m.
+
+    :param white: Klasa programu grającego białymi
+    :type white: Type[DeciderBase]
+    :param black: Klasa programu grającego czarnymi
+    :type black: Type[DeciderBase]
+    :param n: Liczba kolumn planszy
+    :type n: int
+    :param m: Liczba wierszy planszy
+    :type m: int
+    :param move_time_limit: Limit czasu na jeden ruch w sekundach; przekroczenie oznacza porażkę,
+        a ruch wykonywany jest w osobnym wątku, więc zawieszony program nie wstrzymuje partii
+    :type move_time_limit: Optional[float]
+    :param compact: Rozgrywka na planszy kompaktowej
+    :type compact: bool
+    :param instrument: Zbieranie liczby wywołań i czasu mierzonych metod (moduł `instrumentation`)
+    :type instrument: bool
+    :param observers: Obiekty z metodą `on_commit(board, move)`, wywoływaną po każdym przyjętym
+        ruchu partii. Ruchy wykonywane i cofane przez programy w trakcie przeszukiwania nie są
+        zgłaszane, w przeciwieństwie do obiektów `Board.add_listener`
+    :type observers: Sequence
+
+    :return: Wynik partii
+    :type: GameResult
+    """
+    with ExitStack() as stack:
+        stats = stack.enter_context(instrumented()) if instrument else None
+        board = Board(n, m, compact=compact)
+        deciders = {}
+        for color, decider in ((Pawn.Color.WHITE, white), (Pawn.Color.BLACK, black)):
+            deciders[color] = decider(board, color)
+            stack.callback(deciders[color].close)
+        times = {Pawn.Color.WHITE: [], Pawn.Color.BLACK: []}
+        color = Pawn.Color.WHITE
+
+        def result(winner: Pawn.Color, reason: str) -> GameResult:
+            return GameResult(winner, reason, len(board.moves),
+                              times[Pawn.Color.WHITE], times[Pawn.Color.BLACK],
+                              stats() if stats is not None else None)
+
+        while board.count_legal_moves(color) > 0:
+            plies = len(board.moves)
+            start = perf_counter()
+            if move_time_limit is not None:
+                reason = _move_before_deadline(deciders[color], board, color, move_time_limit)
+            else:
+                try:
+                    deciders[color].move()
+                except Exception:
+                    reason = ERROR
+                else:
+                    legal = len(board.moves) == plies + 1 and board.moves[-1].color == color
+                    reason = None if legal else ILLEGAL
+            times[color].append(perf_counter() - start)
+            if reason is not None:
+                return result(color.opposite(), reason)
+            for observer in observers:
+                observer.on_commit(board, board.moves[-1])
+            color = color.opposite()
+
+        return result(color.opposite(), NO_MOVES)
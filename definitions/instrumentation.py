@@ -0,0 +1,163 @@
+"""
+Moduł "instrumentation" pozwala zmierzyć, ile razy wywoływane są najczęściej używane metody
+planszy, ruchu i programów decyzyjnych oraz ile łącznie trwają.
+
+Pomiar jest domyślnie wyłączony i wtedy nic nie kosztuje - `enable` podmienia mierzone metody
+w klasach na opakowania zliczające wywołania, a `disable` przywraca oryginały. Czas liczony jest
+łącznie z wywołaniami zagnieżdżonymi (np. czas `DeciderBase.move` obejmuje `find_move` i `Board.get`).
+"""
+import cProfile
+import functools
+import json
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from definitions.board import Board, Move
+from definitions.decider_base import DeciderBase
+
+INSTRUMENTED_METHODS: List[Tuple[type, str]] = [
+    (Board, 'get'),
+    (Board, 'move_pawn'),
+    (Move, '_find_from_field'),
+    (Move, 'validate'),
+]
+"""Mierzone metody. Dodatkowo mierzone są `DeciderBase.move` oraz metody `move` i `find_move`
+zdefiniowane w klasach pochodnych `DeciderBase`."""
+
+_stats: Dict[str, List[float]] = {}
+_originals: List[Tuple[type, str, Callable]] = []
+
+
+def _decider_classes(base: type = DeciderBase) -> List[type]:
+    classes = []
+    for subclass in base.__subclasses__():
+        classes.append(subclass)
+        classes.extend(_decider_classes(subclass))
+    return classes
+
+
+def _wrap(name: str, function: Callable) -> Callable:
+    stats = _stats.setdefault(name, [0, 0.0])
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats[0] += 1
+            stats[1] += perf_counter() - start
+
+    return wrapper
+
+
+def is_enabled() -> bool:
+    """
+    :return: True, jeśli pomiar jest włączony
+    """
+    return bool(_originals)
+
+
+def enable() -> None:
+    """
+    Włącza pomiar metod z `INSTRUMENTED_METHODS`, `DeciderBase.move` oraz metod `move` i `find_move`
+    wszystkich zdefiniowanych do tej pory klas pochodnych `DeciderBase`. Ponowne wywołanie nic nie zmienia.
+
+    :return: None
+    """
+    if is_enabled():
+        return
+    targets = list(INSTRUMENTED_METHODS)
+    targets.append((DeciderBase, 'move'))
+    targets += [(cls, attribute) for cls in _decider_classes() for attribute in ('move', 'find_move')
+                if attribute in cls.__dict__]
+    for cls, attribute in targets:
+        original = cls.__dict__[attribute]
+        _originals.append((cls, attribute, original))
+        setattr(cls, attribute, _wrap(f'{cls.__qualname__}.{attribute}', original))
+
+
+def disable() -> None:
+    """
+    Wyłącza pomiar, przywracając oryginalne metody. Zebrane dane pozostają dostępne.
+
+    :return: None
+    """
+    while _originals:
+        cls, attribute, original = _originals.pop()
+        setattr(cls, attribute, original)
+
+
+def reset() -> None:
+    """
+    Zeruje zebrane dane.
+
+    :return: None
+    """
+    for stats in _stats.values():
+        stats[0] = 0
+        stats[1] = 0.0
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    """
+    :return: Liczba wywołań i łączny czas w sekundach dla każdej wywołanej metody
+    :type: Dict[str, Dict[str, float]]
+    """
+    return {name: {'calls': int(calls), 'seconds': seconds}
+            for name, (calls, seconds) in sorted(_stats.items()) if calls}
+
+
+def export_summary(path: str) -> None:
+    """
+    Zapisuje `summary()` do pliku JSON.
+
+    :param path: Ścieżka do pliku
+    :type path: str
+
+    :return: None
+    """
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(summary(), output, indent=2)
+
+
+@contextmanager
+def instrumented():
+    """
+    Menedżer kontekstu zbierający dane tylko z bloku `with`::
+
+        with instrumented() as stats:
+            play_game(DeciderExample, DeciderExample, 8, 8)
+        print(stats())
+
+    :return: Funkcja zwracająca `summary()` dla bloku
+    """
+    was_enabled = is_enabled()
+    reset()
+    enable()
+    try:
+        yield summary
+    finally:
+        if not was_enabled:
+            disable()
+
+
+@contextmanager
+def profiled(path: str):
+    """
+    Menedżer kontekstu uruchamiający blok `with` pod kontrolą `cProfile` i zapisujący statystyki
+    do pliku, który można odczytać modułem `pstats`.
+
+    :param path: Ścieżka do pliku ze statystykami
+    :type path: str
+
+    :return: Obiekt `cProfile.Profile`
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
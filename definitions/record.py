@@ -0,0 +1,313 @@
+"""
+Moduł "record" zawiera zwarty binarny zapis partii.
+
+Plik może zawierać dowolnie wiele partii zapisanych jedna po drugiej. Każda partia składa się z:
+
+* nagłówka - 4 bajtów `MAGIC` oraz liczb n i m,
+* ruchów - każdy jako para liczb (kolumna + 1, liczba pól); kolor wynika z numeru ruchu, bo partię
+  zaczyna gracz biały, a gracze ruszają się na przemian,
+* terminatora - bajtu 0.
+
+Wszystkie liczby zapisywane są jako varint (LEB128), więc ruch na planszy o mniej niż 127 kolumnach
+i wierszach zajmuje 2 bajty. Partie zaczynają się od początkowego rozstawienia pionów.
+
+Przykład::
+
+    with open('games.bin', 'ab') as output:
+        writer = GameWriter(output, undo_depth=64)
+        with writer.recording(board):
+            play(board)
+
+    with open('games.bin', 'rb') as source:
+        for record in read_games(source):
+            for board in record.replay():
+                ...
+"""
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+from definitions.board import Board, Move, Pawn
+
+MAGIC = b'BSG1'
+_END = 0
+_CHUNK_SIZE = 1 << 16
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    :param value: Nieujemna liczba całkowita
+    :type value: int
+
+    :return: Liczba zapisana jako varint (LEB128)
+    :type: bytes
+    """
+    if value < 0:
+        raise ValueError(f'Nie można zapisać ujemnej liczby {value}.')
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _color_at(ply: int) -> Pawn.Color:
+    return Pawn.Color.WHITE if ply % 2 == 0 else Pawn.Color.BLACK
+
+
+class InvalidRecord(Exception):
+    """
+    Wyjątek rzucany, gdy strumień nie zawiera poprawnego zapisu partii.
+    """
+    pass
+
+
+class GameRecord(NamedTuple):
+    """
+    Odczytana partia: wymiary planszy i ruchy jako pary (kolumna, liczba pól).
+    """
+    n: int
+    m: int
+    moves: List[Tuple[int, int]]
+
+    def replay(self, compact: bool = True) -> Iterator[Board]:
+        """
+        Odtwarza partię na nowej planszy z początkowym rozstawieniem pionów.
+
+        :param compact: Odtwarzanie na planszy kompaktowej
+        :type compact: bool
+
+        :return: Ta sama plansza po każdym kolejnym ruchu
+        :type: Iterator[Board]
+
+        :raise Move.InvalidMove: Gdy zapisany ruch jest niedozwolony
+        """
+        board = Board(self.n, self.m, compact=compact)
+        for ply, (column, amount) in enumerate(self.moves):
+            board.move_pawn(Move(board, _color_at(ply), column, amount))
+            yield board
+
+    def to_board(self, compact: bool = True) -> Board:
+        """
+        :return: Plansza w pozycji końcowej partii
+        :type: Board
+        """
+        board = None
+        for board in self.replay(compact):
+            pass
+        return board if board is not None else Board(self.n, self.m, compact=compact)
+
+
+class GameWriter:
+    """
+    Zapisuje partie do strumienia binarnego w miarę ich rozgrywania. Podpięty do planszy (`start`
+    lub `recording`) zapisuje ruchy z historii planszy (`Board.moves`), a więc tylko ruchy
+    faktycznie wykonane: ruch próbny cofnięty przez program przeszukujący drzewo gry na planszy
+    ani ruch zatrzymany przez inny obiekt `Board.add_listener` nie trafiają do zapisu.
+
+    Nagłówek partii trafia do strumienia od razu, a ruch - gdy za nim wykonano już `undo_depth`
+    kolejnych ruchów (głębokość, do której program może jeszcze cofać ruchy). W pamięci trzymane są
+    tylko te ostatnie ruchy, a przerwanie procesu w trakcie partii zachowuje w strumieniu wszystkie
+    starsze ruchy.
+    """
+
+    class OutOfTurn(Exception):
+        """
+        Wyjątek rzucany, gdy ruch wykonuje gracz, na którego nie przypada kolej.
+        """
+        pass
+
+    class GameInProgress(Exception):
+        """
+        Wyjątek rzucany przy próbie rozpoczęcia partii przed zakończeniem poprzedniej.
+        """
+        pass
+
+    class AlreadyWritten(Exception):
+        """
+        Wyjątek rzucany po cofnięciu ruchu, który został już zapisany do strumienia (cofnięcie
+        głębsze niż `undo_depth`). Plansza jest już wtedy cofnięta, a zapis partii jej nie odpowiada.
+        """
+        pass
+
+    def __init__(self, stream: BinaryIO, undo_depth: int = 256) -> None:
+        """
+        :param stream: Strumień otwarty do zapisu binarnego
+        :type stream: BinaryIO
+        :param undo_depth: Liczba ostatnich ruchów trzymanych w pamięci, bo mogą jeszcze zostać
+            cofnięte
+        :type undo_depth: int
+        """
+        self.stream = stream
+        self.undo_depth = undo_depth
+        self.games = 0
+        self._board: Optional[Board] = None
+        self._pending: List[bytes] = []
+        self._written = 0
+
+    def start(self, board: Board) -> None:
+        """
+        Rozpoczyna zapis partii rozgrywanej na planszy. Ruchy wykonane na niej wcześniej są
+        zapisywane od razu.
+
+        :param board: Plansza, której partia ma być zapisana
+        :type board: Board
+
+        :return: None
+
+        :raise GameWriter.GameInProgress: Gdy poprzednia partia nie została zakończona
+        :raise GameWriter.OutOfTurn: Gdy wcześniejsze ruchy nie były wykonywane na przemian
+        """
+        if self._board is not None:
+            raise self.GameInProgress('Poprzednia partia nie została zakończona.')
+        for ply, move in enumerate(board.moves):
+            self._check_turn(ply, move)
+        self.stream.write(MAGIC + encode_varint(board.n) + encode_varint(board.m))
+        self._board = board
+        self._sync()
+        board.add_listener(self)
+
+    def finish(self) -> None:
+        """
+        Kończy zapis bieżącej partii i zapisuje jej pozostałe ruchy do strumienia.
+
+        :return: None
+        """
+        if self._board is None:
+            return
+        self._sync()
+        self._board.remove_listener(self)
+        self.stream.write(b''.join(self._pending) + bytes([_END]))
+        self.stream.flush()
+        self._board = None
+        self._pending = []
+        self._written = 0
+        self.games += 1
+
+    @contextmanager
+    def recording(self, board: Board):
+        """
+        Menedżer kontekstu zapisujący partię rozgrywaną w bloku `with`.
+
+        :param board: Plansza, której partia ma być zapisana
+        :type board: Board
+        """
+        self.start(board)
+        try:
+            yield board
+        finally:
+            self.finish()
+
+    def write_game(self, board: Board) -> None:
+        """
+        Zapisuje wszystkie ruchy wykonane już na planszy jako jedną partię.
+
+        :param board: Plansza z rozegraną partią
+        :type board: Board
+
+        :return: None
+        """
+        with self.recording(board):
+            pass
+
+    def _check_turn(self, ply: int, move: Move) -> None:
+        expected = _color_at(ply)
+        if move.color != expected:
+            raise self.OutOfTurn(f"Ruch '{move}' wykonuje gracz {move.color.name}, "
+                                 f"a kolej na gracza {expected.name}.")
+
+    def _sync(self) -> None:
+        """
+        Uzgadnia zapis z historią planszy: dopisuje ruchy wykonane od ostatniego uzgodnienia, usuwa
+        ruchy cofnięte lub zatrzymane i wysyła do strumienia ruchy starsze niż `undo_depth`.
+        """
+        moves = self._board.moves
+        recorded = self._written + len(self._pending)
+        if len(moves) < self._written:
+            raise self.AlreadyWritten(f'Cofnięto ruch {len(moves) + 1}, który został już zapisany '
+                                      f'(głębokość cofania {self.undo_depth}).')
+        if len(moves) < recorded:
+            del self._pending[len(moves) - self._written:]
+        for move in moves[recorded:]:
+            self._pending.append(encode_varint(move.column + 1) + encode_varint(move.amount))
+        overflow = len(self._pending) - self.undo_depth
+        if overflow > 0:
+            self.stream.write(b''.join(self._pending[:overflow]))
+            del self._pending[:overflow]
+            self._written += overflow
+
+    def on_move(self, board: Board, move: Move) -> None:
+        # Ruch nie jest jeszcze wykonany i inny obiekt może go zatrzymać, więc trafia do zapisu
+        # dopiero przy kolejnym uzgodnieniu z historią planszy.
+        self._sync()
+        self._check_turn(len(board.moves), move)
+
+    def on_undo(self, board: Board, move: Move) -> None:
+        self._sync()
+
+
+class _ChunkReader:
+    """
+    Odczytuje varinty ze strumienia porcjami po `_CHUNK_SIZE` bajtów.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.data = b''
+        self.position = 0
+
+    def _refill(self) -> bool:
+        self.data = self.data[self.position:] + self.stream.read(_CHUNK_SIZE)
+        self.position = 0
+        return bool(self.data)
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.data) and not self._refill()
+
+    def read_bytes(self, size: int) -> bytes:
+        while len(self.data) - self.position < size:
+            available = len(self.data) - self.position
+            if not self._refill() or len(self.data) == available:
+                raise InvalidRecord('Zapis partii urwał się w połowie.')
+        value = self.data[self.position:self.position + size]
+        self.position += size
+        return value
+
+    def read_varint(self) -> int:
+        value = 0
+        shift = 0
+        while True:
+            if self.position >= len(self.data) and not self._refill():
+                raise InvalidRecord('Zapis partii urwał się w połowie.')
+            byte = self.data[self.position]
+            self.position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+
+def read_games(stream: BinaryIO) -> Iterator[GameRecord]:
+    """
+    Odczytuje kolejne partie ze strumienia. W pamięci trzymana jest jedynie bieżąca partia.
+
+    :param stream: Strumień otwarty do odczytu binarnego
+    :type stream: BinaryIO
+
+    :return: Kolejne partie
+    :type: Iterator[GameRecord]
+
+    :raise InvalidRecord: Gdy strumień nie zawiera poprawnego zapisu
+    """
+    reader = _ChunkReader(stream)
+    while not reader.at_end():
+        if reader.read_bytes(len(MAGIC)) != MAGIC:
+            raise InvalidRecord('Brak nagłówka zapisu partii.')
+        n = reader.read_varint()
+        m = reader.read_varint()
+        moves = []
+        column = reader.read_varint()
+        while column != _END:
+            moves.append((column - 1, reader.read_varint()))
+            column = reader.read_varint()
+        yield GameRecord(n, m, moves)
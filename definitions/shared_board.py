@@ -0,0 +1,498 @@
+"""
+Moduł "shared_board" zawiera planszę, której stan leży w pamięci współdzielonej
+(`multiprocessing.shared_memory`), dzięki czemu procesy robocze programów decyzyjnych czytają
+bieżącą pozycję bez kopiowania.
+
+Blok pamięci zawiera nagłówek z liczbami uint64 (wersja, wymiary planszy, stan utrzymywany
+przyrostowo przez `Board._shift_pawn` i gracz wykonujący ruch), a po nim n wierszy pionów białych
+i n wierszy pionów czarnych jako liczby int32 - ten sam układ co `Board.to_buffer`.
+
+Planszę zmienia tylko proces, który ją utworzył. Każda zmiana zwiększa wersję dwukrotnie: przed
+zapisem (wersja nieparzysta) i po nim (wersja parzysta), więc proces czytający wykrywa odczyt
+w trakcie zmiany albo odczyt pozycji, która zdążyła się zmienić (`read`, `changed_since`).
+
+Cykl życia bloku - tworzenie, podłączanie w innych procesach, serializacja i zwalnianie - zapewnia
+klasa bazowa `SharedMemoryBlock`, z której korzystają też inne struktury w pamięci współdzielonej
+(np. `evaluation_cache.SharedEvaluationTable`).
+
+Przykład::
+
+    with SharedBoard(8, 8) as board, ProcessPoolExecutor() as pool:
+        future = pool.submit(analyse, board)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 1))
+"""
+import atexit
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Type, TypeVar
+
+from definitions.board import Board, BoardView, Move, Pawn, _HeapIndex, _LazyFields
+
+T = TypeVar('T')
+B = TypeVar('B', bound='SharedMemoryBlock')
+
+_VERSION = 0
+_N = 1
+_M = 2
+_NIM_SUM = 3
+_WHITE_MOBILITY = 4
+_BLACK_MOBILITY = 5
+_OPEN_COLUMNS = 6
+_HASH = 7
+_COLUMN_SUM = 8
+_MIRRORED_SUM = 9
+_FLAGS = 10
+_TO_MOVE = 11
+_PLIES = 12
+_HEADER_SLOTS = 13
+
+_HASH_VALID = 1
+_SUMS_VALID = 2
+
+
+class SharedMemoryBlock:
+    """
+    Klasa bazowa obiektów, których stan leży w bloku pamięci współdzielonej. Obiekt utworzony
+    w procesie (`_create_memory`) jest właścicielem bloku i jako jedyny może go usunąć (`unlink`).
+    Zserializowany obiekt zawiera jedynie nazwę bloku, a proces roboczy podłącza się do niego raz
+    (`attach`); podłączone obiekty są zamykane przy końcu procesu.
+
+    Klasa pochodna tworzy widoki na blok w `_map_memory`, zwalnia je w `_release_views` i uzupełnia
+    stan obiektu podłączonego w `_init_attached`.
+    """
+
+    class NotOwner(Exception):
+        """
+        Wyjątek rzucany przy próbie zmiany lub usunięcia bloku przez proces, który nie jest jego
+        właścicielem.
+        """
+        pass
+
+    _attached: Dict[str, 'SharedMemoryBlock'] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._attached = {}
+        _registries.append(cls._attached)
+
+    def _create_memory(self, size: int, name: Optional[str]) -> None:
+        """
+        Tworzy nowy blok pamięci, którego właścicielem jest ten obiekt.
+        """
+        self._memory = SharedMemory(name=name, create=True, size=size)
+        self._owner = True
+        self._closed = self._unlinked = False
+
+    @classmethod
+    def attach(cls: Type[B], name: str) -> B:
+        """
+        Podłącza się do bloku pamięci utworzonego w innym procesie. W każdym procesie blok jest
+        podłączany tylko raz - kolejne wywołania zwracają ten sam obiekt.
+
+        :param name: Nazwa bloku pamięci (`name`)
+        :type name: str
+
+        :return: Obiekt podłączony do bloku
+        """
+        block = cls._attached.get(name)
+        if block is not None and not block._closed:
+            return block
+        try:
+            memory = SharedMemory(name=name, track=False)
+        except TypeError:
+            memory = SharedMemory(name=name)
+        block = cls.__new__(cls)
+        block._memory = memory
+        block._owner = False
+        block._closed = block._unlinked = False
+        block._init_attached()
+        cls._attached[name] = block
+        return block
+
+    def _init_attached(self) -> None:
+        raise NotImplementedError
+
+    def _release_views(self) -> None:
+        raise NotImplementedError
+
+    def __reduce__(self):
+        return type(self).attach, (self.name,)
+
+    def __enter__(self: B) -> B:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    @property
+    def name(self) -> str:
+        """
+        :return: Nazwa bloku pamięci, pod którą inne procesy podłączają się do obiektu
+        :type: str
+        """
+        return self._memory.name
+
+    @property
+    def is_owner(self) -> bool:
+        """
+        :return: True, jeśli blok został utworzony w tym procesie
+        :type: bool
+        """
+        return self._owner
+
+    def _check_owner(self) -> None:
+        if not self._owner:
+            raise self.NotOwner(f"Blok '{self.name}' jest podłączony tylko do odczytu.")
+
+    def close(self) -> None:
+        """
+        Odłącza obiekt od bloku pamięci w tym procesie. Po zamknięciu obiekt nie może być używany.
+        Zamknięcie właściciela zamyka też obiekt podłączony do tego bloku w tym samym procesie.
+
+        :return: None
+        """
+        if self._closed:
+            return
+        self._release_views()
+        self._memory.close()
+        self._closed = True
+        attached = self._attached.get(self.name)
+        if attached is self:
+            del self._attached[self.name]
+        elif attached is not None and self._owner:
+            attached.close()
+
+    def unlink(self) -> None:
+        """
+        Usuwa blok pamięci z systemu. Procesy podłączone do bloku zachowują do niego dostęp do
+        czasu zamknięcia swoich obiektów.
+
+        :return: None
+
+        :raise SharedMemoryBlock.NotOwner: Gdy obiekt nie jest właścicielem bloku
+        """
+        self._check_owner()
+        if not self._unlinked:
+            self._memory.unlink()
+            self._unlinked = True
+
+
+_registries: List[Dict[str, SharedMemoryBlock]] = []
+
+
+@atexit.register
+def _close_attached() -> None:
+    """
+    Zamyka przy końcu procesu obiekty podłączone przez `attach`, zanim interpreter zacznie zwalniać
+    bloki pamięci, do których wciąż istnieją widoki.
+    """
+    for attached in _registries:
+        for block in list(attached.values()):
+            block.close()
+
+
+class _HeaderSlot:
+    """
+    Atrybut planszy przechowywany w nagłówku bloku pamięci. Wartość None zapisywana jest jako brak
+    flagi `flag` w polu flag nagłówka.
+    """
+
+    def __init__(self, slot: int, flag: int = 0) -> None:
+        self.slot = slot
+        self.flag = flag
+
+    def __get__(self, board: Optional['SharedBoard'], owner=None):
+        if board is None:
+            return self
+        header = board._header
+        if self.flag and not header[_FLAGS] & self.flag:
+            return None
+        return header[self.slot]
+
+    def __set__(self, board: 'SharedBoard', value: Optional[int]) -> None:
+        board._check_owner()
+        header = board._header
+        if self.flag:
+            if value is None:
+                header[_FLAGS] &= ~self.flag
+                return
+            header[_FLAGS] |= self.flag
+        header[self.slot] = value
+
+
+class _SharedRows:
+    """
+    Wiersze pionów jednego koloru w bloku pamięci. Przypisanie tablicy kopiuje jej zawartość do
+    bloku zamiast podmieniać tablicę.
+    """
+
+    def __init__(self, attribute: str) -> None:
+        self.attribute = attribute
+
+    def __get__(self, board: Optional['SharedBoard'], owner=None):
+        if board is None:
+            return self
+        return board.__dict__[self.attribute]
+
+    def __set__(self, board: 'SharedBoard', rows) -> None:
+        board._check_owner()
+        board.__dict__[self.attribute][:] = rows
+
+
+class SharedBoard(SharedMemoryBlock, Board):
+    """
+    Plansza kompaktowa, której piony i stan utrzymywany przyrostowo leżą w bloku pamięci
+    współdzielonej. Plansza utworzona konstruktorem jest właścicielem bloku i jako jedyna może być
+    zmieniana; plansze podłączone przez `attach` są tylko do odczytu (`BoardView.ReadOnly`) i nie
+    znają listy ruchów - gracza wykonującego ruch i liczbę ruchów odczytują z nagłówka.
+
+    Hasz Zobrista i sumy `canonical_key` są u właściciela zawsze wyliczone, więc odczyt w innym
+    procesie nigdy nie zapisuje do bloku.
+    """
+
+    class NotOwner(SharedMemoryBlock.NotOwner, BoardView.ReadOnly):
+        """
+        Wyjątek rzucany przy próbie zmiany planszy przez proces, który nie jest właścicielem bloku.
+        """
+        pass
+
+    _white = _SharedRows('_white_rows')
+    _black = _SharedRows('_black_rows')
+    _hash = _HeaderSlot(_HASH, _HASH_VALID)
+    _nim_sum = _HeaderSlot(_NIM_SUM)
+    _column_sum = _HeaderSlot(_COLUMN_SUM, _SUMS_VALID)
+    _mirrored_sum = _HeaderSlot(_MIRRORED_SUM, _SUMS_VALID)
+    _white_mobility = _HeaderSlot(_WHITE_MOBILITY)
+    _black_mobility = _HeaderSlot(_BLACK_MOBILITY)
+    _open_columns = _HeaderSlot(_OPEN_COLUMNS)
+
+    def __init__(self, n: int, m: int, with_pawns: bool = True, name: Optional[str] = None) -> None:
+        """
+        Tworzy nowy blok pamięci i planszę n x m w nim zapisaną.
+
+        :param n: Liczba kolumn
+        :type n: int
+        :param m: Liczba wierszy
+        :type m: int
+        :param with_pawns: Automatyczne wypełnianie planszy pionami
+        :type with_pawns: bool
+        :param name: Nazwa bloku pamięci; domyślnie nadawana przez system
+        :type name: Optional[str]
+        """
+        self._create_memory(8 * (_HEADER_SLOTS + max(n, 1)), name)
+        self._write_depth = 0
+        self._map_memory(max(n, 1))
+        self._header[_N] = n
+        self._header[_M] = m
+        self._begin_write()
+        try:
+            super().__init__(n, m, with_pawns=with_pawns, compact=True)
+            self._record_turn()
+        except BaseException:
+            self._write_depth = 0
+            self.close()
+            self.unlink()
+            raise
+        self._end_write()
+
+    @classmethod
+    def from_board(cls, board: Board, name: Optional[str] = None) -> 'SharedBoard':
+        """
+        Tworzy planszę w pamięci współdzielonej z kopią pozycji i listy ruchów innej planszy.
+
+        :param board: Kopiowana plansza
+        :type board: Board
+        :param name: Nazwa bloku pamięci; domyślnie nadawana przez system
+        :type name: Optional[str]
+
+        :return: Plansza w pamięci współdzielonej
+        :type: SharedBoard
+        """
+        shared = cls(board.n, board.m, with_pawns=False, name=name)
+        shared._begin_write()
+        try:
+            shared._white = board._white
+            shared._black = board._black
+            shared._recompute_state()
+            shared.moves = list(board.moves)
+            shared._record_turn()
+        finally:
+            shared._end_write()
+        return shared
+
+    @classmethod
+    def from_buffer(cls, buffer, m: int, compact: bool = True) -> 'SharedBoard':
+        """
+        Tworzy planszę w pamięci współdzielonej z bufora w formacie `Board.to_buffer`.
+
+        :return: Plansza w pamięci współdzielonej
+        :type: SharedBoard
+        """
+        return cls.from_board(Board.from_buffer(buffer, m))
+
+    def _init_attached(self) -> None:
+        self._write_depth = 0
+        self._map_memory(None)
+        self.n = self._header[_N]
+        self.m = self._header[_M]
+        self.compact = True
+        self.moves = []
+        self._listeners = []
+        self._shared = False
+        self._heap_index = None
+        self.fields = _LazyFields(self)
+
+    def _map_memory(self, n: Optional[int]) -> None:
+        """
+        Tworzy widoki nagłówka i wierszy pionów na blok pamięci; gdy `n` jest None, liczba kolumn
+        odczytywana jest z nagłówka.
+        """
+        buffer = self._memory.buf
+        header_size = 8 * _HEADER_SLOTS
+        self._header = buffer[:header_size].cast('Q')
+        if n is None:
+            n = self._header[_N]
+        self.__dict__['_white_rows'] = buffer[header_size:header_size + 4 * n].cast('i')
+        self.__dict__['_black_rows'] = buffer[header_size + 4 * n:header_size + 8 * n].cast('i')
+
+    @property
+    def version(self) -> int:
+        """
+        Wersja pozycji zwiększana przed każdą zmianą planszy i po niej. Wersja nieparzysta oznacza,
+        że plansza jest właśnie zmieniana.
+
+        :return: Wersja pozycji
+        :type: int
+        """
+        return self._header[_VERSION]
+
+    def changed_since(self, version: int) -> bool:
+        """
+        :param version: Wersja odczytana przed odczytem pozycji
+        :type version: int
+
+        :return: True, jeśli od odczytu wersji plansza była zmieniana lub właśnie jest zmieniana
+        :type: bool
+        """
+        return self._header[_VERSION] != version or version % 2 == 1
+
+    def read(self, function: Callable[..., T], *args) -> T:
+        """
+        Wywołuje `function(self, *args)` tak długo, aż w trakcie wywołania plansza nie zostanie
+        zmieniona, i zwraca wynik tego spójnego odczytu. Wyjątek rzucony przez funkcję jest
+        przekazywany dalej tylko wtedy, gdy odczyt był spójny.
+
+        :param function: Funkcja odczytująca pozycję, np. `SharedBoard.to_buffer`
+        :type function: Callable[..., T]
+
+        :return: Wynik funkcji
+        :type: T
+        """
+        while True:
+            version = self._header[_VERSION]
+            if version % 2 == 0:
+                try:
+                    result = function(self, *args)
+                except Exception:
+                    if not self.changed_since(version):
+                        raise
+                else:
+                    if not self.changed_since(version):
+                        return result
+            time.sleep(0)
+
+    @property
+    def to_move(self) -> Pawn.Color:
+        """
+        :return: Kolor gracza wykonującego ruch, zapisany w nagłówku bloku
+        :type: Pawn.Color
+        """
+        return Pawn.Color.BLACK if self._header[_TO_MOVE] else Pawn.Color.WHITE
+
+    @property
+    def plies(self) -> int:
+        """
+        :return: Liczba ruchów wykonanych na planszy
+        :type: int
+        """
+        return self._header[_PLIES]
+
+    def clone(self) -> Board:
+        """
+        Tworzy spójną kopię bieżącej pozycji jako zwykłą planszę w pamięci tego procesu. Kopia
+        planszy właściciela przejmuje listę ruchów; kopia planszy podłączonej ma pustą listę ruchów.
+
+        :return: Kopia planszy
+        :type: Board
+        """
+        board = Board.from_buffer(self.read(SharedBoard.to_buffer), self.m)
+        if self._owner:
+            board.moves = list(self.moves)
+        return board
+
+    def _heap_columns(self) -> _HeapIndex:
+        # Plansza podłączona nie widzi ruchów właściciela, więc nie może aktualizować indeksu.
+        return super()._heap_columns() if self._owner else _HeapIndex(self)
+
+    def _begin_write(self) -> None:
+        self._check_owner()
+        self._write_depth += 1
+        if self._write_depth == 1:
+            self._header[_VERSION] += 1
+
+    def _end_write(self) -> None:
+        self._write_depth -= 1
+        if self._write_depth == 0:
+            if self._hash is None:
+                self.zobrist_hash
+            if self._column_sum is None:
+                self.canonical_key()
+            self._header[_VERSION] += 1
+
+    def _record_turn(self) -> None:
+        self._header[_TO_MOVE] = Board.to_move.fget(self) == Pawn.Color.BLACK
+        self._header[_PLIES] = len(self.moves)
+
+    def move_pawn(self, move: Move) -> None:
+        self._begin_write()
+        try:
+            super().move_pawn(move)
+            self._record_turn()
+        finally:
+            self._end_write()
+
+    def unmake_move(self, move: Move) -> None:
+        self._begin_write()
+        try:
+            super().unmake_move(move)
+            self._record_turn()
+        finally:
+            self._end_write()
+
+    def place_default_pawns(self, clear_board: bool = True) -> None:
+        self._begin_write()
+        try:
+            super().place_default_pawns(clear_board)
+        finally:
+            self._end_write()
+
+    def clear_all_pawns(self) -> None:
+        self._begin_write()
+        try:
+            super().clear_all_pawns()
+        finally:
+            self._end_write()
+
+    def _shift_pawn(self, color: Pawn.Color, column: int, row: int) -> None:
+        self._begin_write()
+        try:
+            super()._shift_pawn(color, column, row)
+        finally:
+            self._end_write()
+
+    def _release_views(self) -> None:
+        self._header.release()
+        self.__dict__.pop('_white_rows').release()
+        self.__dict__.pop('_black_rows').release()
@@ -0,0 +1,272 @@
+"""
+Moduł "tablebase" zawiera tablicę końcówek: wyliczone z góry wyniki (wygrana lub przegrana gracza
+wykonującego ruch) i najlepsze ruchy dla wszystkich pozycji, w których co najwyżej `max_columns`
+kolumn ma niezerowy stos (`Board.gap(column) - 1`), a żaden stos nie przekracza `max_heap`.
+
+Wynik pozycji zależy tylko od multizbioru stosów, a nie od tego, w których kolumnach leżą, więc
+pozycja identyfikowana jest posortowanym ciągiem stosów dopełnionym zerami do długości
+`max_columns`. Ciąg niemalejący a_0 <= ... <= a_{K-1} o wartościach z 0..H odpowiada kombinacji
+c_i = a_i + i, której numer w systemie kombinatorycznym, sum(C(c_i, i + 1)), jest doskonałą
+i minimalną funkcją haszującą: pozycje zajmują kolejne numery od 0 do C(H + K, K) - 1.
+
+Plik tablicy to 16-bajtowy nagłówek (`MAGIC`, K, H) i rekordy uint32 (little-endian) w kolejności
+numerów pozycji. Rekord zawiera bit wygranej (`WIN_BIT`), numer stosu w posortowanym ciągu
+(bity 16-30) i nową wielkość tego stosu po najlepszym ruchu (bity 0-15). Tablica jest otwierana
+przez `mmap` tylko do odczytu, więc wiele procesów korzysta z jednej kopii w pamięci podręcznej
+systemu i nie wczytuje pliku przy starcie.
+
+Budowanie tablicy (domyślnie do pliku `DEFAULT_PATH`, z którego czyta ją `DeciderTablebase`)::
+
+    python -m definitions.tablebase --columns 5 --max-heap 15
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import insort
+from math import comb
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from definitions.board import Board
+
+MAGIC = b'BSTB'
+WIN_BIT = 1 << 31
+_HEADER = struct.Struct('<4sIII')
+_RECORD = struct.Struct('<I')
+_MAX_INDEX = (1 << 15) - 1
+_MAX_HEAP = (1 << 16) - 1
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(_PROJECT_DIR, 'tablebase.bin')
+"""Domyślna ścieżka pliku tablicy - w katalogu projektu, niezależnie od katalogu roboczego."""
+
+
+class TablebaseEntry(NamedTuple):
+    """
+    Rekord tablicy końcówek.
+
+    * `win` - czy gracz wykonujący ruch wygrywa,
+    * `index` - numer stosu w posortowanym ciągu stosów, który należy zmniejszyć,
+    * `new_heap` - wielkość tego stosu po ruchu.
+
+    W pozycji przegranej ruch zmniejsza największy stos o 1 (najdłużej odwleka porażkę), a w pozycji
+    bez ruchów `index` i `new_heap` są równe 0.
+    """
+    win: bool
+    index: int
+    new_heap: int
+
+
+def position_count(max_columns: int, max_heap: int) -> int:
+    """
+    :return: Liczba pozycji w tablicy o podanych ograniczeniach
+    :type: int
+    """
+    return comb(max_heap + max_columns, max_columns)
+
+
+def rank(heaps: Sequence[int]) -> int:
+    """
+    Numer pozycji w systemie kombinatorycznym.
+
+    :param heaps: Niemalejący ciąg stosów dopełniony zerami do długości `max_columns`
+    :type heaps: Sequence[int]
+
+    :return: Numer pozycji
+    :type: int
+    """
+    return sum(comb(heap + i, i + 1) for i, heap in enumerate(heaps))
+
+
+def _multisets(max_columns: int, max_heap: int) -> Iterator[List[int]]:
+    """
+    Generuje wszystkie niemalejące ciągi stosów w kolejności ich numerów (`rank`). Zwracana lista
+    jest modyfikowana w miejscu między kolejnymi krokami.
+    """
+    heaps = [0] * max_columns
+    while True:
+        yield heaps
+        for i in range(max_columns):
+            if heaps[i] < (heaps[i + 1] if i + 1 < max_columns else max_heap):
+                heaps[i] += 1
+                heaps[:i] = [0] * i
+                break
+        else:
+            return
+
+
+def build_tablebase(path: str, max_columns: int, max_heap: int) -> int:
+    """
+    Wylicza tablicę końcówek analizą wsteczną i zapisuje ją do pliku. Zmniejszenie dowolnego stosu
+    daje pozycję o mniejszym numerze, więc pozycje rozwiązywane są w kolejności numerów, a każda
+    pozycja potomna jest już rozwiązana.
+
+    :param path: Ścieżka do pliku tablicy
+    :type path: str
+    :param max_columns: Maksymalna liczba niezerowych stosów
+    :type max_columns: int
+    :param max_heap: Maksymalna wielkość stosu
+    :type max_heap: int
+
+    :return: Liczba zapisanych pozycji
+    :type: int
+
+    :raise ValueError: Gdy ograniczenia nie mieszczą się w formacie rekordu
+    """
+    if not (1 <= max_columns <= _MAX_INDEX + 1 and 1 <= max_heap <= _MAX_HEAP):
+        raise ValueError(f'Nie można zbudować tablicy dla {max_columns} stosów o wielkości do {max_heap}.')
+    records = array('I', bytes(4 * position_count(max_columns, max_heap)))
+    binomials = [[comb(c, k) for k in range(max_columns + 1)] for c in range(max_heap + max_columns)]
+
+    for number, heaps in enumerate(_multisets(max_columns, max_heap)):
+        record = None
+        for i in range(max_columns - 1, -1, -1):
+            if heaps[i] == 0:
+                break
+            if i + 1 < max_columns and heaps[i] == heaps[i + 1]:
+                continue
+            rest = heaps[:i] + heaps[i + 1:]
+            for new_heap in range(heaps[i]):
+                child = list(rest)
+                insort(child, new_heap)
+                child_number = sum(binomials[heap + j][j + 1] for j, heap in enumerate(child))
+                if not records[child_number] & WIN_BIT:
+                    record = WIN_BIT | (i << 16) | new_heap
+                    break
+            if record is not None:
+                break
+        if record is None:
+            top = max_columns - 1
+            record = (top << 16) | (heaps[top] - 1) if heaps[top] else 0
+        records[number] = record
+
+    with open(path, 'wb') as output:
+        output.write(_HEADER.pack(MAGIC, max_columns, max_heap, 0))
+        if sys.byteorder == 'big':
+            records.byteswap()
+        records.tofile(output)
+    return len(records)
+
+
+class Tablebase:
+    """
+    Tablica końcówek otwarta z pliku przez `mmap`.
+    """
+
+    class InvalidFile(Exception):
+        """
+        Wyjątek rzucany, gdy plik nie jest tablicą końcówek.
+        """
+        pass
+
+    _shared: Dict[str, 'Tablebase'] = {}
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Ścieżka do pliku tablicy
+        :type path: str
+
+        :raise Tablebase.InvalidFile: Gdy plik nie jest poprawną tablicą końcówek
+        """
+        self.path = path
+        with open(path, 'rb') as source:
+            if os.fstat(source.fileno()).st_size < _HEADER.size:
+                raise self.InvalidFile(f"Plik '{path}' nie jest tablicą końcówek.")
+            self._map = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_columns, self.max_heap, _ = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or len(self._map) != _HEADER.size + _RECORD.size * len(self):
+            self._map.close()
+            raise self.InvalidFile(f"Plik '{path}' nie jest tablicą końcówek.")
+
+    @classmethod
+    def shared(cls, path: str) -> 'Tablebase':
+        """
+        Zwraca tablicę otwartą w bieżącym procesie, otwierając ją przy pierwszym wywołaniu, dzięki
+        czemu wszystkie programy w procesie korzystają z jednego odwzorowania pliku.
+
+        :param path: Ścieżka do pliku tablicy
+        :type path: str
+
+        :return: Tablica końcówek
+        :type: Tablebase
+        """
+        tablebase = cls._shared.get(path)
+        if tablebase is None or tablebase._map.closed:
+            tablebase = cls._shared[path] = cls(path)
+        return tablebase
+
+    def __len__(self) -> int:
+        return position_count(self.max_columns, self.max_heap)
+
+    def __enter__(self) -> 'Tablebase':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Zamyka odwzorowanie pliku.
+
+        :return: None
+        """
+        self._map.close()
+
+    def probe(self, heaps: Iterable[int]) -> Optional[TablebaseEntry]:
+        """
+        Odczytuje rekord pozycji o podanych stosach (w dowolnej kolejności, zera są pomijane).
+
+        :param heaps: Wielkości stosów
+        :type heaps: Iterable[int]
+
+        :return: Rekord pozycji lub None, gdy pozycja nie mieści się w tablicy
+        :type: Optional[TablebaseEntry]
+        """
+        nonzero = sorted(heap for heap in heaps if heap)
+        if len(nonzero) > self.max_columns or (nonzero and nonzero[-1] > self.max_heap):
+            return None
+        padded = [0] * (self.max_columns - len(nonzero)) + nonzero
+        record, = _RECORD.unpack_from(self._map, _HEADER.size + _RECORD.size * rank(padded))
+        return TablebaseEntry(bool(record & WIN_BIT), (record >> 16) & _MAX_INDEX, record & 0xFFFF)
+
+    def probe_board(self, board: Board) -> Optional[Tuple[bool, Optional[Tuple[int, int]]]]:
+        """
+        Odczytuje wynik pozycji na planszy i przekłada zapisany ruch na kolumnę planszy.
+
+        :param board: Plansza
+        :type board: Board
+
+        :return: Para (czy gracz wykonujący ruch wygrywa, ruch jako (kolumna, liczba pól) lub None,
+            gdy nie ma dozwolonych ruchów) albo None, gdy pozycja nie mieści się w tablicy
+        :type: Optional[Tuple[bool, Optional[Tuple[int, int]]]]
+        """
+        columns = []
+        for column in range(board.n):
+            heap = board.gap(column) - 1
+            if heap:
+                if heap > self.max_heap or len(columns) == self.max_columns:
+                    return None
+                columns.append((heap, column))
+        entry = self.probe(heap for heap, _ in columns)
+        if not columns:
+            return entry.win, None
+        columns.sort()
+        heap, column = columns[entry.index - (self.max_columns - len(columns))]
+        return entry.win, (column, heap - entry.new_heap)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Budowanie tablicy końcówek.')
+    parser.add_argument('--columns', type=int, default=5, help='maksymalna liczba niezerowych stosów')
+    parser.add_argument('--max-heap', type=int, default=15, help='maksymalna wielkość stosu')
+    parser.add_argument('--output', default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    count = build_tablebase(args.output, args.columns, args.max_heap)
+    print(f"Zapisano {count} pozycji do '{args.output}'.")
+
+
+if __name__ == '__main__':
+    main()
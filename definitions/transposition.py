@@ -0,0 +1,127 @@
+"""
+Moduł "transposition" zawiera tablicę transpozycji - pamięć podręczną wyników przeszukiwania
+pozycji, indeksowaną 64-bitowym kluczem pozycji - haszem Zobrista planszy (`Board.zobrist_hash`)
+lub kluczem kanonicznym wspólnym dla pozycji symetrycznych (`Board.canonical_key`).
+"""
+from array import array
+from typing import NamedTuple, Optional, Tuple
+
+
+class TranspositionEntry(NamedTuple):
+    """
+    Wpis tablicy transpozycji.
+    """
+    depth: int
+    value: float
+    flag: int
+    move: Optional[Tuple[int, int]]
+
+
+class TranspositionTable:
+    """
+    Tablica transpozycji o stałym rozmiarze pamięci.
+
+    Wpisy przechowywane są w równoległych tablicach `array` (bez obiektów Pythona na wpis), więc
+    zajęta pamięć nie rośnie w trakcie gry. Tablica podzielona jest na kubełki po dwa miejsca:
+
+    * pierwsze miejsce jest zastępowane tylko przez wpis z głębokością nie mniejszą niż zapisana
+      (preferencja głębokości),
+    * drugie miejsce jest zastępowane zawsze.
+
+    Ruch zapisywany jest jako para (kolumna, liczba pól).
+    """
+
+    EXACT = 1
+    LOWER_BOUND = 2
+    UPPER_BOUND = 3
+
+    ENTRY_SIZE = 27
+    """Liczba bajtów zajmowanych przez jeden wpis: klucz, wartość, ruch, głębokość i flaga."""
+
+    def __init__(self, max_bytes: int = 16 * 2**20) -> None:
+        """
+        Tworzy pustą tablicę transpozycji mieszczącą się w zadanym budżecie pamięci.
+
+        :param max_bytes: Maksymalna liczba bajtów zajmowana przez wpisy tablicy
+        :type max_bytes: int
+
+        :raise ValueError: Gdy budżet nie mieści nawet jednego kubełka
+        """
+        buckets = max_bytes // (2 * self.ENTRY_SIZE)
+        if buckets < 1:
+            raise ValueError(f"Budżet {max_bytes} B jest za mały dla tablicy transpozycji. "
+                             f"Potrzeba co najmniej {2 * self.ENTRY_SIZE} B.")
+        self._mask = (1 << (buckets.bit_length() - 1)) - 1
+        self.capacity = 2 * (self._mask + 1)
+
+        self._keys = array('Q', [0]) * self.capacity
+        self._values = array('d', [0.0]) * self.capacity
+        self._moves = array('q', [-1]) * self.capacity
+        self._depths = array('h', [0]) * self.capacity
+        self._flags = array('B', [0]) * self.capacity
+        self._used = 0
+
+    def __len__(self) -> int:
+        """
+        :return: Liczba zajętych miejsc w tablicy
+        """
+        return self._used
+
+    def store(self,
+              key: int,
+              depth: int,
+              value: float,
+              flag: int = EXACT,
+              move: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Zapisuje wynik przeszukiwania pozycji zgodnie z polityką zastępowania tablicy.
+
+        :param key: Hasz pozycji
+        :type key: int
+        :param depth: Głębokość, na jaką przeszukano pozycję
+        :type depth: int
+        :param value: Ocena pozycji
+        :type value: float
+        :param flag: Rodzaj oceny: `EXACT`, `LOWER_BOUND` lub `UPPER_BOUND`
+        :type flag: int
+        :param move: Najlepszy znaleziony ruch jako (kolumna, liczba pól)
+        :type move: Optional[Tuple[int, int]]
+        """
+        slot = (key & self._mask) << 1
+        if self._flags[slot] and self._keys[slot] != key and depth < self._depths[slot]:
+            slot += 1
+        if not self._flags[slot]:
+            self._used += 1
+
+        self._keys[slot] = key
+        self._values[slot] = value
+        self._moves[slot] = -1 if move is None else (move[0] << 32) | move[1]
+        self._depths[slot] = depth
+        self._flags[slot] = flag
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        """
+        Szuka wpisu dla danej pozycji.
+
+        :param key: Hasz pozycji
+        :type key: int
+
+        :return: Zapisany wpis lub None, jeśli pozycji nie ma w tablicy
+        :type: Optional[TranspositionEntry]
+        """
+        slot = (key & self._mask) << 1
+        for i in (slot, slot + 1):
+            if self._flags[i] and self._keys[i] == key:
+                packed = self._moves[i]
+                move = None if packed < 0 else (packed >> 32, packed & 0xFFFFFFFF)
+                return TranspositionEntry(self._depths[i], self._values[i], self._flags[i], move)
+        return None
+
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie wpisy z tablicy.
+
+        :return: None
+        """
+        self._flags = array('B', [0]) * self.capacity
+        self._used = 0
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from decider_nim import DeciderNim
+from definitions.batch import BLACK, NO_WINNER, WHITE, BatchBoard, nim_policy
+from definitions.board import Board, Move, Pawn
+
+
+def _assert_same_position(batch, index, board):
+    assert batch.white[index].tolist() == list(board._white)
+    assert batch.black[index].tolist() == list(board._black)
+
+
+class TestBatchBoard:
+
+    # Free fields and move counts match Board for the side to move
+    def test_free_fields_match_board(self):
+        # Arrange
+        rng = random.Random(5)
+        boards = []
+        for _ in range(6):
+            board = Board(5, 7)
+            for _ in range(4):
+                color = rng.choice(list(Pawn.Color))
+                move = board.random_legal_move(color, rng)
+                board.move_pawn(Move(board, color, *move))
+            boards.append(board)
+
+        for color in Pawn.Color:
+            # Act
+            batch = BatchBoard.from_boards(boards, to_move=color)
+
+            # Assert
+            expected = [[board.free_fields(color, column) for column in range(5)] for board in boards]
+            assert batch.free_fields().tolist() == expected
+            assert batch.legal_move_counts().tolist() == [board.count_legal_moves(color) for board in boards]
+
+    # Random games played in a batch replay move by move on Board with the same result
+    def test_random_games_replay_on_board(self):
+        # Arrange
+        batch = BatchBoard(20, 4, 6, seed=11)
+        boards = [Board(4, 6) for _ in range(20)]
+        colors = [Pawn.Color.WHITE] * 20
+
+        # Act
+        while not batch.finished.all():
+            columns, amounts = batch.step()
+            for i, board in enumerate(boards):
+                if columns[i] >= 0:
+                    board.move_pawn(Move(board, colors[i], int(columns[i]), int(amounts[i])))
+                    colors[i] = colors[i].opposite()
+
+        # Assert
+        for i, board in enumerate(boards):
+            _assert_same_position(batch, i, board)
+            assert board.count_legal_moves(colors[i]) == 0
+            expected_winner = WHITE if colors[i] == Pawn.Color.BLACK else BLACK
+            assert batch.winner[i] == expected_winner
+            assert batch.plies[i] == len(board.moves)
+
+    # Optimal policy matches DeciderNim and always wins a winning position
+    def test_nim_policy_beats_random(self):
+        # Arrange
+        batch = BatchBoard(50, 3, 8, seed=2)
+        batch.apply_moves(np.zeros(50, dtype=np.int64), np.ones(50, dtype=np.int64))
+
+        # Act
+        winners = batch.play(white_policy=None, black_policy=nim_policy)
+
+        # Assert
+        assert (winners == BLACK).all()
+
+        board = Board(3, 8)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 2))
+        single = BatchBoard.from_boards([board], to_move=Pawn.Color.BLACK)
+        columns, amounts = nim_policy(single)
+        for column, amount in ((int(columns[0]), int(amounts[0])),
+                               DeciderNim(board, Pawn.Color.BLACK).find_move()):
+            with board.try_move(Move(board, Pawn.Color.BLACK, column, amount)):
+                assert board.nim_sum == 0
+
+    # Illegal moves are rejected and finished games are detected at creation
+    def test_invalid_moves_and_finished_games(self):
+        batch = BatchBoard(2, 2, 4)
+        with pytest.raises(ValueError):
+            batch.apply_moves(np.array([0, 0]), np.array([1, 3]))
+        assert (batch.winner == NO_WINNER).all()
+        assert BatchBoard(3, 2, 2).finished.all()
+        assert BatchBoard(3, 2, 2).winner.tolist() == [BLACK] * 3
+        assert batch.to_board(1).zobrist_hash == Board(2, 4).zobrist_hash
@@ -1,3 +1,8 @@
+import copy
+import pickle
+import random
+from array import array
+
 import pytest
 
 from definitions.board import *
@@ -145,4 +150,453 @@ class TestBoard:
         move_black = board.get_move(Pawn.Color.BLACK, 1, 4)  # Move 4 spaces from row 3
         assert not board.is_move_legal(move_black)
         with pytest.raises(Move.InvalidMove):
-            board.move_pawn(move_black)
\ No newline at end of file
+            board.move_pawn(move_black)
+
+class TestCompactBoard:
+
+    # Compact board keeps default pawns in row arrays and exposes them through fields
+    def test_create_compact_board_with_default_pawns(self):
+        # Arrange & Act
+        board = Board(5, 6, compact=True)
+
+        # Assert
+        assert list(board._white) == [0] * 5
+        assert list(board._black) == [5] * 5
+        for i in range(board.n):
+            assert board.fields[i][0].pawn.color == Pawn.Color.WHITE
+            assert board.get(i, board.m - 1).pawn.color == Pawn.Color.BLACK
+            assert board.get(i, 2).pawn is None
+
+    # Field views write pawns straight into the compact storage
+    def test_add_and_clear_pawns_through_field_views(self):
+        # Arrange
+        board = Board(3, 5, with_pawns=False, compact=True)
+
+        # Act
+        board.get(1, 1).add_pawn(Pawn(Pawn.Color.WHITE))
+        board.get('b', 3).add_pawn(Pawn(Pawn.Color.BLACK))
+
+        # Assert
+        assert board._white[1] == 1
+        assert board._black[1] == 3
+        with pytest.raises(Field.FieldAlreadyOccupied):
+            board.get(1, 1).add_pawn(Pawn(Pawn.Color.BLACK))
+        with pytest.raises(Field.FieldAlreadyOccupied):
+            board.get(1, 2).add_pawn(Pawn(Pawn.Color.WHITE))
+
+        board.get(1, 1).clear_pawn()
+        assert board._white[1] == -1
+        assert board.get(1, 1).pawn is None
+
+    # Moves on a compact board behave the same as on a regular one
+    def test_compact_board_moves_match_regular_board(self):
+        # Arrange
+        regular = Board(4, 6)
+        compact = Board(4, 6, compact=True)
+
+        # Act
+        for board in (regular, compact):
+            board.move_pawn(board.get_move(Pawn.Color.WHITE, 2, 3))
+            board.move_pawn(board.get_move(Pawn.Color.BLACK, 2, 1))
+
+        # Assert
+        for i in range(4):
+            for j in range(6):
+                regular_pawn = regular.get(i, j).pawn
+                compact_pawn = compact.get(i, j).pawn
+                assert (regular_pawn is None) == (compact_pawn is None)
+                if regular_pawn is not None:
+                    assert regular_pawn.color == compact_pawn.color
+        with pytest.raises(Move.InvalidMove):
+            compact.move_pawn(compact.get_move(Pawn.Color.WHITE, 2, 1))
+
+    # Compact board prints the same layout as a regular one
+    def test_compact_board_print_matches_regular_board(self, capsys):
+        # Arrange
+        regular = Board(3, 4)
+        compact = Board(3, 4, compact=True)
+
+        # Act
+        regular.print()
+        regular_output = capsys.readouterr().out
+        compact.print()
+        compact_output = capsys.readouterr().out
+
+        # Assert
+        assert compact_output == regular_output
+
+
+class TestUndo:
+
+    # Undoing moves restores the board and the move list
+    def test_undo_restores_previous_positions(self):
+        # Arrange
+        board = Board(3, 6)
+        first = board.get_move(Pawn.Color.WHITE, 0, 2)
+        board.move_pawn(first)
+        second = board.get_move(Pawn.Color.BLACK, 0, 2)
+        board.move_pawn(second)
+
+        # Act & Assert
+        assert board.undo() == second
+        assert all(move.board is None for move in board.moves)
+        assert board.pawn_row(Pawn.Color.BLACK, 0) == 5
+        assert board.get(0, 5).pawn.color == Pawn.Color.BLACK
+        assert board.get(0, 2).pawn.color == Pawn.Color.WHITE
+        board.unmake_move(first)
+        assert board.get(0, 0).pawn.color == Pawn.Color.WHITE
+        assert board.get(0, 2).pawn is None
+        assert board.moves == []
+
+    # Undoing on a board without moves, or a move that is not the last one
+    def test_undo_without_moves_raises(self):
+        # Arrange
+        board = Board(2, 4)
+        move = board.get_move(Pawn.Color.WHITE, 1, 1)
+
+        # Act & Assert
+        with pytest.raises(Board.NoMoveToUndo):
+            board.undo()
+        with pytest.raises(Board.NoMoveToUndo):
+            board.unmake_move(move)
+
+    # Trying a move applies it only inside the with block
+    def test_try_move_reverts_after_block(self):
+        # Arrange
+        board = Board(2, 5)
+        move = board.get_move(Pawn.Color.WHITE, 1, 3)
+
+        # Act & Assert
+        with board.try_move(move):
+            assert board.pawn_row(Pawn.Color.WHITE, 1) == 3
+            assert board.moves == [move]
+        assert board.pawn_row(Pawn.Color.WHITE, 1) == 0
+        assert board.moves == []
+
+        with pytest.raises(RuntimeError):
+            with board.try_move(move):
+                raise RuntimeError()
+        assert board.pawn_row(Pawn.Color.WHITE, 1) == 0
+
+
+class TestLegalMoves:
+
+    # Lazy enumeration yields exactly the moves that pass validation
+    def test_iter_legal_moves_matches_validation(self):
+        # Arrange
+        board = Board(4, 6)
+        board.move_pawn(board.get_move(Pawn.Color.WHITE, 0, 3))
+        board.move_pawn(board.get_move(Pawn.Color.BLACK, 2, 4))
+
+        for color in Pawn.Color:
+            # Act
+            moves = list(board.iter_legal_moves(color))
+
+            # Assert
+            expected = [(column, amount)
+                        for column in range(board.n) for amount in range(1, board.m)
+                        if board.is_move_legal(board.get_move(color, column, amount))]
+            assert moves == expected
+            assert board.count_legal_moves(color) == len(expected)
+
+    # Moves made and undone while enumerating do not skip or repeat moves
+    def test_iter_legal_moves_during_search(self):
+        # Arrange
+        board = Board(5, 4, compact=True)
+        expected = sorted(board.iter_legal_moves(Pawn.Color.WHITE))
+
+        # Act
+        seen = []
+        for column, amount in board.iter_legal_moves(Pawn.Color.WHITE):
+            with board.try_move(board.get_move(Pawn.Color.WHITE, column, amount)):
+                for reply in board.iter_legal_moves(Pawn.Color.BLACK):
+                    with board.try_move(board.get_move(Pawn.Color.BLACK, *reply)):
+                        pass
+            seen.append((column, amount))
+
+        # Assert
+        assert sorted(seen) == expected
+
+    # Random legal move covers every legal move and returns None when none are left
+    def test_random_legal_move(self):
+        # Arrange
+        board = Board(2, 4)
+        rng = random.Random(0)
+
+        # Act
+        drawn = {board.random_legal_move(Pawn.Color.BLACK, rng) for _ in range(200)}
+
+        # Assert
+        assert drawn == set(board.iter_legal_moves(Pawn.Color.BLACK))
+        assert board.random_legal_move(Pawn.Color.WHITE, rng) in drawn | {(0, 1), (0, 2), (1, 1), (1, 2)}
+        assert Board(3, 2).random_legal_move(Pawn.Color.WHITE) is None
+
+
+class TestApplyMoves:
+
+    # Applying a batch of moves records all of them
+    def test_apply_moves(self):
+        # Arrange
+        board = Board(3, 6)
+
+        # Act
+        board.apply_moves([
+            (Pawn.Color.WHITE, 0, 2),
+            (Pawn.Color.BLACK, 'b', 3),
+            (Pawn.Color.WHITE, 1, 1),
+        ])
+
+        # Assert
+        assert [board.pawn_row(Pawn.Color.WHITE, i) for i in range(3)] == [2, 1, 0]
+        assert board.pawn_row(Pawn.Color.BLACK, 1) == 2
+        assert [move.column for move in board.moves] == [0, 1, 1]
+
+    # An invalid move rolls back the whole batch
+    def test_apply_moves_rolls_back_on_invalid_move(self):
+        # Arrange
+        board = Board(3, 6)
+        board.move_pawn(board.get_move(Pawn.Color.WHITE, 2, 1))
+        hash_before = board.zobrist_hash
+
+        # Act & Assert
+        with pytest.raises(Move.InvalidMove):
+            board.apply_moves([
+                (Pawn.Color.WHITE, 0, 2),
+                (Pawn.Color.BLACK, 0, 3),
+            ])
+        assert len(board.moves) == 1
+        assert board.pawn_row(Pawn.Color.WHITE, 0) == 0
+        assert board.pawn_row(Pawn.Color.BLACK, 0) == 5
+        assert board.zobrist_hash == hash_before
+
+
+class TestCanonicalKey:
+
+    # Permuted columns and the color-swapped mirror share one key
+    def test_symmetric_positions_share_key(self):
+        # Arrange
+        board = Board(3, 7)
+        board.apply_moves([(Pawn.Color.WHITE, 0, 2), (Pawn.Color.BLACK, 2, 1)])
+        permuted = Board(3, 7)
+        permuted.apply_moves([(Pawn.Color.WHITE, 2, 2), (Pawn.Color.BLACK, 1, 1)])
+        mirrored = Board(3, 7)
+        mirrored.apply_moves([(Pawn.Color.WHITE, 2, 1), (Pawn.Color.BLACK, 0, 2)])
+
+        # Assert
+        key = board.canonical_key(Pawn.Color.WHITE)
+        assert permuted.canonical_key(Pawn.Color.WHITE) == key
+        assert mirrored.canonical_key(Pawn.Color.BLACK) == key
+        assert board.canonical_key(Pawn.Color.BLACK) != key
+        assert board.zobrist_hash != permuted.zobrist_hash
+
+    # Incremental updates match a recomputation after moves and undo
+    def test_incremental(self):
+        # Arrange
+        board = Board(6, 9, compact=True)
+        board.canonical_key()
+        rng = random.Random(5)
+        color = Pawn.Color.WHITE
+
+        # Act & Assert
+        for _ in range(10):
+            column, amount = board.random_legal_move(color, rng)
+            board.move_pawn(Move(board, color, column, amount))
+            color = color.opposite()
+            fresh = Board(6, 9, with_pawns=False)
+            fresh._white, fresh._black = board._white[:], board._black[:]
+            assert board.canonical_key(color) == fresh.canonical_key(color)
+        while board.moves:
+            board.undo()
+        assert board.canonical_key() == Board(6, 9).canonical_key()
+
+
+class TestClone:
+
+    # A clone shares state until one side moves, then both stay independent
+    def test_copy_on_write(self):
+        # Arrange
+        board = Board(4, 6)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 1))
+
+        # Act
+        clone = board.clone()
+        shared = clone._white is board._white and clone.moves is board.moves
+        clone.move_pawn(Move(clone, Pawn.Color.BLACK, 1, 2))
+        board.move_pawn(Move(board, Pawn.Color.BLACK, 3, 1))
+
+        # Assert
+        assert shared
+        assert board.pawn_row(Pawn.Color.BLACK, 1) == 5
+        assert clone.pawn_row(Pawn.Color.BLACK, 1) == 3
+        assert clone.pawn_row(Pawn.Color.BLACK, 3) == 5
+        assert len(board.moves) == len(clone.moves) == 2
+        assert clone.get(0, 1).pawn.color == Pawn.Color.WHITE
+        clone.undo()
+        clone.undo()
+        assert clone.zobrist_hash == Board(4, 6).zobrist_hash
+        assert len(board.moves) == 2
+
+    # A snapshot keeps the position it was taken in
+    def test_snapshot(self):
+        # Arrange
+        board = Board(3, 5)
+
+        # Act
+        snapshot = board.snapshot()
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 2, 3))
+
+        # Assert
+        assert snapshot.gap(2) == 4
+        assert snapshot.moves == ()
+        assert board.gap(2) == 1
+
+
+class TestBoardView:
+
+    # A view follows the live board but cannot change it
+    def test_read_only(self):
+        # Arrange
+        board = Board(3, 5)
+        view = board.view()
+
+        # Act
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 1, 2))
+        field = view.get(1, 2)
+        field.clear_pawn()
+
+        # Assert
+        assert view.pawn_row(Pawn.Color.WHITE, 1) == 2
+        assert view.count_legal_moves(Pawn.Color.WHITE) == 7
+        assert board.get(1, 2).pawn is not None
+        assert Board.is_move_legal(Move(view, Pawn.Color.BLACK, 1, 1))
+        with pytest.raises(BoardView.ReadOnly):
+            view.move_pawn(Move(view, Pawn.Color.BLACK, 1, 1))
+        with pytest.raises(BoardView.ReadOnly):
+            view.n = 4
+        with pytest.raises(AttributeError):
+            view.fields
+
+    # Pawn rows are exposed as read-only memory views and moves can be built through the view
+    def test_rows_and_get_move(self):
+        # Arrange
+        board = Board(3, 5, compact=True)
+        view = board.view()
+
+        # Act
+        move = view.get_move(Pawn.Color.WHITE, 1, 2)
+        board.move_pawn(move)
+
+        # Assert
+        assert list(view._white) == [0, 2, 0]
+        assert list(view._black) == [4, 4, 4]
+        with pytest.raises(TypeError):
+            view._white[0] = 3
+        assert board.pawn_row(Pawn.Color.WHITE, 0) == 0
+
+
+class TestCopy:
+
+    # A default board survives deepcopy and pickling with its fields, rows and history
+    @pytest.mark.parametrize('copier', [copy.deepcopy, lambda board: pickle.loads(pickle.dumps(board))])
+    def test_round_trip(self, copier):
+        # Arrange
+        board = Board(3, 5)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 1, 2))
+
+        # Act
+        copied = copier(board)
+        copied.move_pawn(Move(copied, Pawn.Color.BLACK, 1, 1))
+
+        # Assert
+        assert copied.get(1, 2).pawn.color == Pawn.Color.WHITE
+        assert copied.get(1, 3).pawn.color == Pawn.Color.BLACK
+        assert board.pawn_row(Pawn.Color.BLACK, 1) == 4
+        assert copied.moves[0] == board.moves[0]
+        assert copied.zobrist_hash != board.zobrist_hash
+        copied.undo()
+        assert copied.zobrist_hash == board.zobrist_hash
+
+
+class TestMobility:
+
+    @staticmethod
+    def _recount(board, color):
+        return sum(board.free_fields(color, column) for column in range(board.n))
+
+    # Mobility and open columns follow moves, undo and manual placement
+    def test_incremental(self):
+        # Arrange
+        board = Board(5, 7, compact=True)
+        rng = random.Random(11)
+
+        # Act & Assert
+        assert board.mobility(Pawn.Color.WHITE) == board.mobility(Pawn.Color.BLACK) == 25
+        assert board.open_columns == 5
+        while not board.is_game_over():
+            color = board.to_move
+            column, amount = board.random_legal_move(color, rng)
+            board.move_pawn(Move(board, color, column, amount))
+            for color in Pawn.Color:
+                assert board.mobility(color) == self._recount(board, color)
+            assert board.open_columns == sum(board.gap(column) > 1 for column in range(board.n))
+        assert board.open_columns == 0
+        assert board.winner() == board.moves[-1].color
+        board.undo()
+        assert not board.is_game_over() and board.winner() is None
+        board.get(0, board.pawn_row(Pawn.Color.WHITE, 0)).clear_pawn()
+        assert board.mobility(Pawn.Color.WHITE) == self._recount(board, Pawn.Color.WHITE)
+        assert board.mobility(Pawn.Color.BLACK) == self._recount(board, Pawn.Color.BLACK)
+
+    # A board with no room to move is over before the first move and black wins
+    def test_game_over_at_start(self):
+        # Arrange
+        board = Board(3, 2)
+
+        # Assert
+        assert board.to_move == Pawn.Color.WHITE
+        assert board.is_game_over()
+        assert board.winner() == Pawn.Color.BLACK
+        assert Board(3, 3).winner() is None
+
+
+class TestBuffer:
+
+    # A position survives a round trip through the int32 buffer and through the text form
+    def test_round_trip(self):
+        # Arrange
+        board = Board(4, 6)
+        board.apply_moves([(Pawn.Color.WHITE, 1, 2), (Pawn.Color.BLACK, 3, 4)])
+        board.get(0, 0).clear_pawn()
+
+        # Act
+        from_buffer = Board.from_buffer(board.to_buffer(), board.m)
+        from_bytes = Board.from_buffer(board.to_buffer().tobytes(), board.m, compact=False)
+        from_text = Board.from_text(board.to_text())
+
+        # Assert
+        assert board.to_text() == '4x6 ./5 2/5 0/5 0/1'
+        for loaded in (from_buffer, from_bytes, from_text):
+            assert loaded.to_buffer() == board.to_buffer()
+            assert loaded.zobrist_hash == board.zobrist_hash
+            assert loaded.nim_sum == board.nim_sum
+            for color in Pawn.Color:
+                assert loaded.mobility(color) == board.mobility(color)
+            assert loaded.open_columns == board.open_columns
+        assert from_bytes.get(1, 2).pawn.color == Pawn.Color.WHITE
+
+    # Buffers of the wrong size, item type, layout or with impossible positions are rejected
+    def test_invalid_buffer(self):
+        with pytest.raises(ValueError):
+            Board.from_buffer(b'\x00' * 12, 4)
+        with pytest.raises(ValueError):
+            Board.from_buffer(array('q', [0, 3]), 4)
+        with pytest.raises(ValueError):
+            Board.from_buffer(array('i', [0, 4]), 4)
+        with pytest.raises(ValueError):
+            Board.from_buffer(array('i', [2, 2]), 4)
+        with pytest.raises(ValueError):
+            Board.from_buffer(array('f', [0, 3]), 4)
+        with pytest.raises(ValueError):
+            Board.from_buffer(memoryview(array('i', [0, 9, 3, 9]))[::2], 4)
+        with pytest.raises(ValueError):
+            Board.from_text('3x4 0/3 0/3')
@@ -0,0 +1,105 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from decider_mcts import DeciderMCTS, random_playout, restore_board, snapshot_board
+from definitions.board import Board, Move, Pawn
+from definitions.game import play_game
+
+
+class DeciderMCTSPooled(DeciderMCTS):
+    instances = []
+
+    def __init__(self, board, color):
+        super().__init__(board, color, workers=2, iterations=20)
+        DeciderMCTSPooled.instances.append(self)
+
+
+def default_workers() -> int:
+    return DeciderMCTS(Board(3, 5), Pawn.Color.WHITE).workers
+
+
+class TestDeciderMCTS:
+
+    # Playout ends when every heap is empty; the winner follows the parity of moves
+    def test_random_playout(self):
+        rng = random.Random(1)
+        assert random_playout([0, 0, 0], rng) is False
+        assert random_playout([1], rng) is True
+        assert random_playout([1, 0, 1], rng) is False
+        heaps = [3, 5, 2, 7]
+        random_playout(heaps, rng)
+        assert heaps == [0, 0, 0, 0]
+
+    # Snapshot restores the same position on a compact board
+    def test_snapshot_round_trip(self):
+        # Arrange
+        board = Board(4, 7)
+        board.apply_moves([(Pawn.Color.WHITE, 1, 3), (Pawn.Color.BLACK, 3, 2)])
+
+        # Act
+        restored = restore_board(snapshot_board(board))
+
+        # Assert
+        assert restored.compact
+        assert restored.zobrist_hash == board.zobrist_hash
+        assert restored.nim_sum == board.nim_sum
+
+    # In-process search finds the only winning move
+    def test_finds_winning_move_in_process(self):
+        # Arrange
+        board = Board(2, 6)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 3))
+        decider = DeciderMCTS(board, Pawn.Color.BLACK, workers=0, iterations=2000)
+
+        # Act
+        decider.move()
+
+        # Assert
+        assert board.nim_sum == 0
+        assert decider.playouts == 2000
+
+    # Search in a process pool aggregates playouts from every worker
+    def test_process_pool_search(self):
+        # Arrange
+        board = Board(3, 5)
+        decider = DeciderMCTS(board, Pawn.Color.WHITE, workers=2, iterations=200)
+
+        # Act
+        try:
+            decider.move()
+        finally:
+            decider.close()
+
+        # Assert
+        assert decider.playouts == 400
+        assert len(board.moves) == 1
+
+    # No legal moves left
+    def test_no_moves_left(self):
+        board = Board(2, 2)
+        with pytest.raises(Move.InvalidMove):
+            DeciderMCTS(board, Pawn.Color.WHITE, workers=0, iterations=10).move()
+
+    # The game loop closes the process pool of every decider when the game ends
+    def test_game_closes_pool(self):
+        # Arrange
+        DeciderMCTSPooled.instances = []
+
+        # Act
+        play_game(DeciderMCTSPooled, DeciderMCTSPooled, 3, 5)
+
+        # Assert
+        assert len(DeciderMCTSPooled.instances) == 2
+        assert all(decider._executor is None for decider in DeciderMCTSPooled.instances)
+
+    # Inside a worker process the search runs in that process instead of starting another pool
+    def test_no_nested_pool_in_worker(self):
+        # Act
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            workers = pool.submit(default_workers).result()
+
+        # Assert
+        assert workers == 0
+        assert default_workers() >= 1
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from decider_negamax import DeciderNegamax
+from definitions.board import Board, Move, Pawn
+from definitions.transposition import TranspositionTable
+
+
+class TestDeciderNegamax:
+
+    # Search finds the winning move (the one leaving a zero nim sum) on a small board
+    def test_finds_winning_move(self):
+        # Arrange
+        board = Board(3, 6)
+        board.apply_moves([(Pawn.Color.WHITE, 0, 2), (Pawn.Color.BLACK, 1, 1)])
+        decider = DeciderNegamax(board, Pawn.Color.WHITE, time_budget=10)
+
+        # Act
+        decider.move()
+
+        # Assert
+        assert board.nim_sum == 0
+        assert len(board.moves) == 3
+        assert board.moves[-1].color == Pawn.Color.WHITE
+
+    # Search leaves the board untouched apart from the chosen move
+    def test_search_restores_board(self):
+        # Arrange
+        board = Board(4, 6)
+        decider = DeciderNegamax(board, Pawn.Color.BLACK, time_budget=0.2, max_depth=3)
+        hash_before = board.zobrist_hash
+
+        # Act
+        column, amount = decider.find_move()
+
+        # Assert
+        assert board.zobrist_hash == hash_before
+        assert board.moves == []
+        assert board.is_move_legal(Move(board, Pawn.Color.BLACK, column, amount))
+
+    # A move is returned within the time budget even on a board too big for depth 1
+    def test_respects_time_budget(self):
+        # Arrange
+        board = Board(400, 400, compact=True)
+        decider = DeciderNegamax(board, Pawn.Color.WHITE, time_budget=0.1)
+
+        # Act
+        start = time.perf_counter()
+        decider.move()
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert elapsed < 1.0
+        assert len(board.moves) == 1
+
+    # Wide boards with few open columns do not scan all columns at every node
+    @pytest.mark.parametrize("m", [4, 8])
+    def test_respects_time_budget_on_wide_board(self, m):
+        # Arrange
+        n = 20000
+        board = Board.from_text(f'{n}x{m} ' + ' '.join(['0/1'] * (n - 12) + [f'0/{m - 1}'] * 12))
+        decider = DeciderNegamax(board, Pawn.Color.WHITE, time_budget=0.1)
+
+        # Act
+        start = time.perf_counter()
+        column, amount = decider.find_move()
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert elapsed < 0.25
+        assert column >= n - 12
+        assert decider.depth_reached >= 1
+
+    # On a fully open wide start position every move, including the first, stays within the budget
+    @pytest.mark.parametrize("n, m", [(100000, 10), (20000, 1000)])
+    def test_respects_time_budget_on_open_wide_board(self, n, m):
+        # Arrange
+        board = Board(n, m, compact=True)
+        white = DeciderNegamax(board, Pawn.Color.WHITE, time_budget=0.1)
+        black = DeciderNegamax(board, Pawn.Color.BLACK, time_budget=0.1)
+
+        # Act
+        elapsed = []
+        for decider in (white, black, white):
+            start = time.perf_counter()
+            decider.move()
+            elapsed.append(time.perf_counter() - start)
+
+        # Assert
+        assert max(elapsed) < 0.15
+        assert len(board.moves) == 3
+
+    # Deciders may share one transposition table
+    def test_shared_transposition_table(self):
+        table = TranspositionTable(max_bytes=2**16)
+        board = Board(2, 5)
+        DeciderNegamax(board, Pawn.Color.WHITE, time_budget=1, table=table).move()
+        assert len(table) > 0
+        DeciderNegamax(board, Pawn.Color.BLACK, time_budget=1, table=table).move()
+        assert len(board.moves) == 2
+
+    # No legal moves left
+    def test_no_moves_left(self):
+        board = Board(2, 2)
+        with pytest.raises(Move.InvalidMove):
+            DeciderNegamax(board, Pawn.Color.WHITE).move()
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from decider_example import DeciderExample
+from decider_nim import DeciderNim
+from definitions.board import Board, Move, Pawn
+
+
+def _recomputed_nim_sum(board):
+    value = 0
+    for column in range(board.n):
+        value ^= board.gap(column) - 1
+    return value
+
+
+class TestDeciderNim:
+
+    # Nim sum kept by the board matches a full recomputation after moves and undo
+    def test_board_nim_sum_is_incremental(self):
+        # Arrange
+        board = Board(5, 9)
+        rng = random.Random(3)
+
+        # Act & Assert
+        assert board.nim_sum == _recomputed_nim_sum(board) == 7
+        for _ in range(6):
+            column = rng.randrange(board.n)
+            if board.gap(column) > 1:
+                board.move_pawn(Move(board, Pawn.Color.WHITE, column, 1))
+            assert board.nim_sum == _recomputed_nim_sum(board)
+        while board.moves:
+            board.undo()
+            assert board.nim_sum == _recomputed_nim_sum(board)
+
+    # From a winning position the decider always leaves a zero nim sum
+    def test_move_leaves_zero_nim_sum(self):
+        # Arrange
+        board = Board(3, 8)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 2))
+        decider = DeciderNim(board, Pawn.Color.BLACK)
+
+        # Act
+        decider.move()
+
+        # Assert
+        assert board.nim_sum == 0
+        assert board.moves[-1].color == Pawn.Color.BLACK
+
+    # Decider starting in a winning position beats a random opponent
+    @pytest.mark.parametrize("seed", range(5))
+    def test_beats_random_decider(self, seed):
+        # Arrange
+        random.seed(seed)
+        board = Board(3, 7, compact=True)
+        board.move_pawn(Move(board, Pawn.Color.BLACK, 2, 1))
+        nim = DeciderNim(board, Pawn.Color.WHITE)
+        example = DeciderExample(board, Pawn.Color.BLACK)
+
+        # Act
+        players = [nim, example]
+        while board.nim_sum or any(board.gap(i) > 1 for i in range(board.n)):
+            players[0].move()
+            players.reverse()
+
+        # Assert
+        assert board.moves[-1].color == Pawn.Color.WHITE
+
+    # Decider reports that no moves are left
+    def test_no_moves_left(self):
+        board = Board(2, 2)
+        with pytest.raises(Move.InvalidMove):
+            DeciderNim(board, Pawn.Color.WHITE).move()
+
+    # Heap index stays consistent with the board through moves, undo and clones
+    def test_heap_index_is_incremental(self):
+        # Arrange
+        board = Board(12, 11, compact=True)
+        rng = random.Random(5)
+        board.any_open_column()
+
+        def check(target):
+            heaps = [target.gap(column) - 1 for column in range(target.n)]
+            for bit in range(4):
+                column = target.column_with_heap_bit(bit)
+                assert column is None and not any(heap >> bit & 1 for heap in heaps) or heaps[column] >> bit & 1
+            open_column = target.any_open_column()
+            assert heaps[open_column] > 0 if open_column is not None else not any(heaps)
+
+        # Act & Assert
+        color = Pawn.Color.WHITE
+        while board.mobility(color):
+            column, amount = board.random_legal_move(color, rng)
+            board.move_pawn(Move(board, color, column, amount))
+            check(board)
+            if len(board.moves) == 5:
+                clone = board.clone()
+                clone.undo()
+                check(clone)
+            color = color.opposite()
+        check(board)
+        assert board.any_open_column() is None
+        while board.moves:
+            board.undo()
+            check(board)
+
+    # A long game on a wide board is played by the decider without scanning all columns
+    def test_wide_board(self):
+        # Arrange
+        board = Board(20000, 4, compact=True)
+        players = [DeciderNim(board, Pawn.Color.WHITE), DeciderNim(board, Pawn.Color.BLACK)]
+
+        # Act
+        while board.mobility(players[0].color):
+            players[0].move()
+            players.reverse()
+
+        # Assert
+        assert len(board.moves) == 2 * 20000
+        assert board.moves[-1].color == Pawn.Color.BLACK
@@ -63,4 +63,11 @@ class TestField:
         field = Field(7, 7)
         with pytest.raises(ValueError):
             invalid_pawn = Pawn("INVALID_COLOR")
-            field.add_pawn(invalid_pawn)
\ No newline at end of file
+            field.add_pawn(invalid_pawn)
+
+    # Fields are slotted
+    def test_field_is_slotted(self):
+        field = Field(1, 1)
+        assert not hasattr(field, '__dict__')
+        with pytest.raises(AttributeError):
+            field.owner = None
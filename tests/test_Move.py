@@ -0,0 +1,100 @@
+import pytest
+
+from definitions.board import Board, Move, Pawn
+
+
+class TestMove:
+
+    # Creating a move finds the pawn through the board index
+    def test_move_finds_pawn_rows(self):
+        # Arrange
+        board = Board(3, 6)
+
+        # Act
+        white_move = Move(board, Pawn.Color.WHITE, 1, 2)
+        black_move = Move(board, Pawn.Color.BLACK, 1, 3)
+
+        # Assert
+        assert (white_move.from_field, white_move.to_field) == (0, 2)
+        assert (black_move.from_field, black_move.to_field) == (5, 2)
+
+    # Black pawn standing on row 0 is found (the old scan skipped that row)
+    def test_move_finds_black_pawn_on_first_row(self):
+        # Arrange
+        board = Board(2, 4, with_pawns=False)
+        board.get(0, 0).add_pawn(Pawn(Pawn.Color.BLACK))
+
+        # Act
+        move = Move(board, Pawn.Color.BLACK, 0, 1)
+
+        # Assert
+        assert move.from_field == 0
+        assert move.to_field == -1
+        assert not board.is_move_legal(move)
+
+    # Index follows moves and board resets
+    def test_index_follows_moves_and_resets(self):
+        # Arrange
+        board = Board(2, 5)
+
+        # Act
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 2))
+
+        # Assert
+        assert board.pawn_row(Pawn.Color.WHITE, 0) == 2
+        assert Move(board, Pawn.Color.WHITE, 0, 1).from_field == 2
+        board.clear_all_pawns()
+        assert board.pawn_row(Pawn.Color.WHITE, 0) is None
+        with pytest.raises(AttributeError):
+            Move(board, Pawn.Color.WHITE, 0, 1)
+        board.place_default_pawns()
+        assert board.pawn_row(Pawn.Color.BLACK, 1) == 4
+
+    # Creating a move with a column outside the board
+    def test_move_with_invalid_column(self):
+        board = Board(2, 4)
+        with pytest.raises(Move.InvalidMove):
+            Move(board, Pawn.Color.WHITE, 2, 1)
+
+    # Black pawn cannot jump over the white pawn and no pawn may stay in place
+    def test_validate_checks_path_for_both_colors(self):
+        # Arrange
+        board = Board(1, 6)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 2))
+
+        # Act & Assert
+        assert not board.is_move_legal(Move(board, Pawn.Color.BLACK, 0, 3))
+        assert not board.is_move_legal(Move(board, Pawn.Color.BLACK, 0, 4))
+        assert board.is_move_legal(Move(board, Pawn.Color.BLACK, 0, 2))
+        assert not board.is_move_legal(Move(board, Pawn.Color.WHITE, 0, 0))
+        assert not board.is_move_legal(Move(board, Pawn.Color.BLACK, 0, -1))
+
+    # Detached move records keep only the move data and still allow undo
+    def test_detached_move_record(self):
+        # Arrange
+        board = Board(2, 5)
+        move = Move(board, Pawn.Color.BLACK, 1, 2)
+
+        # Act
+        record = move.detached()
+
+        # Assert
+        assert not hasattr(move, '__dict__')
+        assert record.board is None
+        assert (record.color, record.column, record.from_field, record.to_field) == \
+            (Pawn.Color.BLACK, 1, 4, 2)
+        assert record.amount == 2
+        with pytest.raises(Move.InvalidMove):
+            record.validate()
+
+        board.move_pawn(move)
+        board.moves[-1] = record
+        board.undo()
+        assert board.pawn_row(Pawn.Color.BLACK, 1) == 4
+
+    # Move record bound to a board can be validated and applied
+    def test_record_bound_to_board(self):
+        board = Board(2, 5)
+        move = Move.record(Pawn.Color.WHITE, 0, 0, 3, board)
+        board.move_pawn(move)
+        assert board.pawn_row(Pawn.Color.WHITE, 0) == 3
@@ -51,3 +51,26 @@ class TestPawn:
         assert pawn1.color != pawn2.color
         assert pawn1 is not pawn2
 
+
+
+    # Shared pawns are one immutable instance per color
+    def test_shared_pawns(self):
+        # Arrange & Act
+        white = Pawn.shared(Pawn.Color.WHITE)
+        black = Pawn.shared(Pawn.Color.BLACK)
+
+        # Assert
+        assert white is Pawn.shared(Pawn.Color.WHITE)
+        assert white.color == Pawn.Color.WHITE
+        assert black.color == Pawn.Color.BLACK
+        with pytest.raises(AttributeError):
+            white.color = Pawn.Color.BLACK
+        assert white.color == Pawn.Color.WHITE
+
+    # Pawns are slotted and survive pickling
+    def test_pawn_is_slotted_and_picklable(self):
+        import pickle
+
+        pawn = Pawn(Pawn.Color.BLACK)
+        assert not hasattr(pawn, '__dict__')
+        assert pickle.loads(pickle.dumps(pawn)).color == Pawn.Color.BLACK
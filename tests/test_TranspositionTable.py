@@ -0,0 +1,88 @@
+import pytest
+
+from definitions.board import Board, Pawn, zobrist_key
+from definitions.transposition import TranspositionTable
+
+
+class TestZobristHash:
+
+    # Hash is updated incrementally and matches a fresh board in the same position
+    def test_hash_follows_moves_and_undo(self):
+        # Arrange
+        board = Board(4, 6)
+        start = board.zobrist_hash
+
+        # Act
+        board.move_pawn(board.get_move(Pawn.Color.WHITE, 1, 2))
+        moved = board.zobrist_hash
+        other = Board(4, 6, with_pawns=False)
+        for i in range(4):
+            other.get(i, 2 if i == 1 else 0).add_pawn(Pawn(Pawn.Color.WHITE))
+            other.get(i, 5).add_pawn(Pawn(Pawn.Color.BLACK))
+
+        # Assert
+        assert moved != start
+        assert moved == start ^ zobrist_key(Pawn.Color.WHITE, 1, 0) ^ zobrist_key(Pawn.Color.WHITE, 1, 2)
+        assert other.zobrist_hash == moved
+        board.undo()
+        assert board.zobrist_hash == start
+        board.clear_all_pawns()
+        assert board.zobrist_hash == 0
+        board.place_default_pawns()
+        assert board.zobrist_hash == start
+
+    # Keys differ between colors and squares
+    def test_keys_are_distinct(self):
+        keys = {zobrist_key(color, column, row)
+                for color in Pawn.Color for column in range(20) for row in range(20)}
+        assert len(keys) == 2 * 20 * 20
+        assert all(0 <= key < 2**64 for key in keys)
+
+
+class TestTranspositionTable:
+
+    # Storing and probing an entry
+    def test_store_and_probe(self):
+        # Arrange
+        table = TranspositionTable(max_bytes=4096)
+
+        # Act
+        table.store(123, 4, 0.5, TranspositionTable.LOWER_BOUND, (7, 3))
+
+        # Assert
+        entry = table.probe(123)
+        assert entry.depth == 4
+        assert entry.value == 0.5
+        assert entry.flag == TranspositionTable.LOWER_BOUND
+        assert entry.move == (7, 3)
+        assert table.probe(124) is None
+        assert len(table) == 1
+
+    # Memory budget decides the capacity
+    def test_capacity_fits_budget(self):
+        table = TranspositionTable(max_bytes=10_000)
+        assert table.capacity * TranspositionTable.ENTRY_SIZE <= 10_000
+        with pytest.raises(ValueError):
+            TranspositionTable(max_bytes=10)
+
+    # Deeper entries survive, shallower collisions go to the always-replace slot
+    def test_replacement_policy(self):
+        # Arrange
+        table = TranspositionTable(max_bytes=2 * TranspositionTable.ENTRY_SIZE)
+        deep, shallow, newest = 1, 2, 3
+
+        # Act
+        table.store(deep, 8, 1.0)
+        table.store(shallow, 2, 2.0)
+        table.store(newest, 1, 3.0)
+
+        # Assert
+        assert table.probe(deep).value == 1.0
+        assert table.probe(shallow) is None
+        assert table.probe(newest).value == 3.0
+        table.store(shallow, 9, 4.0)
+        assert table.probe(deep) is None
+        assert table.probe(shallow).move is None
+        table.clear()
+        assert len(table) == 0
+        assert table.probe(shallow) is None
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from decider_example import DeciderExample
+from decider_nim import DeciderNim
+from definitions.async_game import FALLBACK_FORFEIT, FALLBACK_RANDOM, latency_stats, run_games
+from definitions.board import Pawn
+from definitions.decider_base import DeciderBase
+from definitions.game import ERROR, ILLEGAL, NO_MOVES, TIMEOUT
+
+
+class SlowDecider(DeciderExample):
+    def move(self) -> None:
+        time.sleep(0.2)
+        super().move()
+
+
+class PassingDecider(DeciderExample):
+    def move(self) -> None:
+        pass
+
+
+class FailingDecider(DeciderBase):
+    def find_move(self) -> None:
+        raise RuntimeError()
+
+
+class ClosingDecider(DeciderExample):
+    closed = 0
+
+    def close(self) -> None:
+        ClosingDecider.closed += 1
+
+
+class TestAsyncGame:
+
+    # Many games run on one event loop and report per-game latency
+    def test_many_games(self):
+        # Act
+        results = run_games([(DeciderNim, DeciderExample, 3, 6)] * 20, concurrency=8)
+
+        # Assert
+        assert len(results) == 20
+        for result in results:
+            assert (result.winner, result.reason) == (Pawn.Color.WHITE, NO_MOVES)
+            assert result.latency()['white']['count'] == len(result.white_times)
+            assert result.white_fallbacks == result.black_fallbacks == 0
+
+    # A missed deadline is replaced by a random legal move or loses the game
+    def test_deadline_fallback(self):
+        # Act
+        random_result, forfeit_result = run_games(
+            [(DeciderExample, SlowDecider, 3, 4)], deadline=0.02, fallback=FALLBACK_RANDOM, seed=1
+        ) + run_games([(DeciderExample, SlowDecider, 3, 4)], deadline=0.02, fallback=FALLBACK_FORFEIT)
+
+        # Assert
+        assert random_result.reason == NO_MOVES
+        assert random_result.black_fallbacks >= 1
+        assert max(random_result.black_times) < 0.2
+        assert (forfeit_result.winner, forfeit_result.reason) == (Pawn.Color.WHITE, TIMEOUT)
+
+    # Not moving or raising loses the game
+    def test_illegal_and_error(self):
+        # Act
+        illegal, error = run_games([(PassingDecider, DeciderExample, 3, 6),
+                                    (DeciderExample, FailingDecider, 3, 6)])
+
+        # Assert
+        assert (illegal.winner, illegal.reason, illegal.plies) == (Pawn.Color.BLACK, ILLEGAL, 0)
+        assert (error.winner, error.reason, error.plies) == (Pawn.Color.WHITE, ERROR, 1)
+
+    # Unknown fallback policies are rejected
+    def test_unknown_fallback(self):
+        with pytest.raises(ValueError):
+            run_games([(DeciderExample, DeciderExample, 3, 3)], fallback='pass')
+
+    # Latency statistics of an empty list are zero
+    def test_latency_stats(self):
+        assert latency_stats([])['count'] == 0
+        assert latency_stats([0.1, 0.3, 0.2])['p50'] == 0.2
+
+    # Deciders are closed after finished and forfeited games
+    def test_deciders_are_closed(self):
+        # Arrange
+        ClosingDecider.closed = 0
+
+        # Act
+        run_games([(ClosingDecider, ClosingDecider, 3, 6), (ClosingDecider, FailingDecider, 3, 6)])
+
+        # Assert
+        assert ClosingDecider.closed == 3
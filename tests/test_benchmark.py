@@ -0,0 +1,40 @@
+import json
+
+from benchmark import BENCHMARKS, compare, main, run_benchmarks
+
+
+class TestBenchmark:
+
+    # Every benchmark runs on a small board and expensive ones are skipped
+    def test_run_benchmarks(self):
+        # Act
+        results = run_benchmarks([(4, 5), (50, 50)], repeat=1, max_cost=2000)
+
+        # Assert
+        assert len(results) == 2 * len(BENCHMARKS)
+        small = [result for result in results if result['n'] == 4]
+        assert all(result['seconds_min'] >= 0 for result in small)
+        skipped = {result['name'] for result in results if 'skipped' in result}
+        assert skipped == {'random_game', 'construct_board', 'place_default_pawns', 'list_possible_moves'}
+
+    # Slower results than the baseline are reported as regressions
+    def test_compare(self):
+        baseline = [{'name': 'a', 'n': 8, 'm': 8, 'seconds_min': 1.0},
+                    {'name': 'b', 'n': 8, 'm': 8, 'seconds_min': 1.0}]
+        results = [{'name': 'a', 'n': 8, 'm': 8, 'seconds_min': 1.1},
+                   {'name': 'b', 'n': 8, 'm': 8, 'seconds_min': 2.0},
+                   {'name': 'c', 'n': 8, 'm': 8, 'seconds_min': 9.0}]
+        regressions = compare(results, baseline, threshold=1.25)
+        assert [(regression['name'], regression['ratio']) for regression in regressions] == [('b', 2.0)]
+
+    # Command line writes JSON and exits with 1 on regressions
+    def test_main(self, tmp_path):
+        output = tmp_path / 'bench.json'
+        arguments = ['--sizes', '4x4', '--repeat', '1', '--benchmarks', 'construct_compact_board']
+        assert main(arguments + ['--output', str(output)]) == 0
+        report = json.loads(output.read_text())
+        assert report['results'][0]['name'] == 'construct_compact_board'
+
+        report['results'][0]['seconds_min'] = 1e-12
+        output.write_text(json.dumps(report))
+        assert main(arguments + ['--output', str(tmp_path / 'new.json'), '--baseline', str(output)]) == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from decider_nim import DeciderNim
+from definitions.cli import decider_name, load_decider, parse_address, parse_size
+
+
+class TestCli:
+
+    # A decider name imports back the same class
+    def test_decider_name_round_trip(self):
+        # Act
+        name = decider_name(DeciderNim)
+
+        # Assert
+        assert name == 'decider_nim:DeciderNim'
+        assert load_decider(name) is DeciderNim
+
+    # Names of objects that are not deciders are rejected
+    def test_load_decider_rejects(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            load_decider('decider_nim:Missing')
+        with pytest.raises(ValueError):
+            load_decider('definitions.board:Board')
+
+    # Board sizes are read from the NxM form
+    def test_parse_size(self):
+        # Act & Assert
+        assert parse_size('8x16') == (8, 16)
+        assert parse_size('4X5') == (4, 5)
+        for size in ('8', '8x', 'axb'):
+            with pytest.raises(ValueError):
+                parse_size(size)
+
+    # Server addresses are read as host:port or as a Unix socket path
+    def test_parse_address(self):
+        # Act & Assert
+        assert parse_address('127.0.0.1:8765') == ('127.0.0.1', 8765)
+        assert parse_address('/run/decider.sock') == '/run/decider.sock'
+        assert parse_address('decider:sock') == 'decider:sock'
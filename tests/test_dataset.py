@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from decider_example import DeciderExample
+from decider_negamax import DeciderNegamax
+from decider_nim import DeciderNim
+from definitions.batch import WHITE
+from definitions.board import Board, Move, Pawn
+from definitions.dataset import (DatasetMismatch, chunk_path, generate_dataset, iter_chunks,
+                                 load_manifest, open_chunk)
+
+
+class DeciderQuickNegamax(DeciderNegamax):
+    def __init__(self, board, color):
+        super().__init__(board, color, time_budget=0.05, max_depth=3)
+
+
+class TestDataset:
+
+    # Every move becomes a row with the position before the move and the final outcome
+    def test_rows_replay_games(self, tmp_path):
+        # Act
+        manifest = generate_dataset(DeciderExample, DeciderNim, 4, 6, 10, str(tmp_path),
+                                    chunk_rows=20, workers=0, games_per_task=3)
+        chunks = list(iter_chunks(str(tmp_path)))
+
+        # Assert
+        assert manifest['games'] == 10
+        assert manifest['rows'] == sum(len(chunk['game']) for chunk in chunks)
+        assert all(chunk['rows'] >= 20 for chunk in manifest['chunks'][:-1])
+        first = chunks[0]
+        board = Board(4, 6, compact=True)
+        for row in np.flatnonzero(first['game'] == 0):
+            assert list(first['white'][row]) == list(board._white)
+            assert list(first['black'][row]) == list(board._black)
+            color = Pawn.Color.WHITE if first['to_move'][row] == WHITE else Pawn.Color.BLACK
+            board.move_pawn(Move(board, color, int(first['column'][row]), int(first['amount'][row])))
+        assert board.is_game_over()
+        winner = board.winner()
+        last = np.flatnonzero(first['game'] == 0)[-1]
+        assert first['outcome'][last] == 1
+        assert (first['to_move'][last] == WHITE) == (winner == Pawn.Color.WHITE)
+
+    # Moves tried during a search on the live board do not become rows
+    def test_search_moves_are_not_recorded(self, tmp_path):
+        # Act
+        generate_dataset(DeciderQuickNegamax, DeciderExample, 4, 6, 2, str(tmp_path), workers=0)
+        chunk = next(iter_chunks(str(tmp_path)))
+
+        # Assert
+        for game in (0, 1):
+            rows = np.flatnonzero(chunk['game'] == game)
+            board = Board(4, 6, compact=True)
+            for row in rows:
+                assert list(chunk['white'][row]) == list(board._white)
+                assert list(chunk['black'][row]) == list(board._black)
+                color = Pawn.Color.WHITE if chunk['to_move'][row] == WHITE else Pawn.Color.BLACK
+                board.move_pawn(Move(board, color, int(chunk['column'][row]), int(chunk['amount'][row])))
+            assert board.is_game_over()
+
+    # Chunks are memory-mapped, read-only columns
+    def test_open_chunk_is_memory_mapped(self, tmp_path):
+        # Arrange
+        generate_dataset(DeciderExample, DeciderExample, 3, 5, 4, str(tmp_path), workers=0)
+
+        # Act
+        chunk = open_chunk(str(tmp_path), 0)
+
+        # Assert
+        assert isinstance(chunk['white'], np.memmap)
+        assert chunk['white'].shape == (len(chunk['game']), 3)
+        assert not chunk['outcome'].flags.writeable
+        with pytest.raises(IndexError):
+            open_chunk(str(tmp_path), 1)
+
+    # An interrupted run resumes after the last chunk recorded in the manifest
+    def test_resume(self, tmp_path):
+        # Arrange
+        generate_dataset(DeciderExample, DeciderExample, 4, 5, 6, str(tmp_path), chunk_rows=1, workers=0,
+                         games_per_task=2)
+        orphan = chunk_path(str(tmp_path), 3)
+        with open(orphan, 'wb') as output:
+            output.write(b'partial')
+
+        # Act
+        manifest = generate_dataset(DeciderExample, DeciderExample, 4, 5, 10, str(tmp_path),
+                                    chunk_rows=1, workers=1, games_per_task=2)
+        games = np.concatenate([chunk['game'] for chunk in iter_chunks(str(tmp_path))])
+
+        # Assert
+        assert manifest['games'] == 10
+        assert [chunk['first_game'] for chunk in manifest['chunks']] == [0, 2, 4, 6, 8]
+        assert sorted(set(games.tolist())) == list(range(10))
+        assert np.all(np.diff(games) >= 0)
+        assert load_manifest(str(tmp_path)) == manifest
+
+    # A directory generated with other settings is not extended
+    def test_mismatch(self, tmp_path):
+        # Arrange
+        generate_dataset(DeciderExample, DeciderExample, 3, 5, 2, str(tmp_path), workers=0)
+
+        # Act & Assert
+        with pytest.raises(DatasetMismatch):
+            generate_dataset(DeciderExample, DeciderNim, 3, 5, 4, str(tmp_path), workers=0)
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from decider_example import DeciderExample
+from decider_nim import DeciderNim
+from decider_remote import ADDRESS_ENV, RemoteDecider
+from definitions.board import Board, Move, Pawn
+from definitions.decider_base import DeciderBase
+from definitions.decider_server import DeciderClient, DeciderServer
+from definitions.game import NO_MOVES, play_game
+
+
+class FailingDecider(DeciderBase):
+    def find_move(self) -> None:
+        raise RuntimeError('awaria')
+
+
+class TestDeciderServer:
+
+    # Pipelined requests over TCP are answered in request order
+    def test_pipelined_tcp(self):
+        # Arrange
+        boards = [Board(3, 4 + i) for i in range(5)]
+        for board in boards[1:]:
+            board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 1))
+
+        with DeciderServer(DeciderNim, ('127.0.0.1', 0), workers=0).running() as address:
+            client = DeciderClient(address, pool_size=2)
+
+            # Act
+            moves = client.choose_many([(board, Pawn.Color.WHITE) for board in boards])
+            client.close()
+
+        # Assert
+        for board, (column, amount) in zip(boards, moves):
+            board.move_pawn(Move(board, Pawn.Color.WHITE, column, amount))
+            assert board.nim_sum == 0
+
+    # A process pool behind a Unix socket serves a remote decider in a full game
+    def test_unix_process_pool(self, tmp_path):
+        # Arrange
+        address = str(tmp_path / 'decider.sock')
+
+        with DeciderServer(DeciderNim, address, workers=1).running():
+            class Remote(RemoteDecider):
+                pass
+            Remote.address = address
+
+            # Act
+            result = play_game(Remote, DeciderExample, 3, 6)
+            empty = Board(2, 2)
+            no_move = DeciderClient(address).choose(empty, Pawn.Color.WHITE)
+
+        # Assert
+        assert (result.winner, result.reason) == (Pawn.Color.WHITE, NO_MOVES)
+        assert no_move is None
+
+    # The server address comes from the argument, the class or the environment and is required
+    def test_remote_address(self, monkeypatch):
+        # Arrange
+        class Remote(RemoteDecider):
+            address = '/run/class.sock'
+
+        board = Board(3, 3)
+        monkeypatch.setenv(ADDRESS_ENV, '127.0.0.1:8765')
+
+        # Act
+        given = RemoteDecider(board, Pawn.Color.WHITE, address='/run/given.sock').address
+        inherited = Remote(board, Pawn.Color.WHITE).address
+        from_env = RemoteDecider(board, Pawn.Color.WHITE).address
+        monkeypatch.delenv(ADDRESS_ENV)
+
+        # Assert
+        assert (given, inherited, from_env) == ('/run/given.sock', '/run/class.sock', ('127.0.0.1', 8765))
+        with pytest.raises(ValueError):
+            RemoteDecider(board, Pawn.Color.WHITE)
+
+    # A process does not reuse the connections of the process it was forked from
+    def test_client_per_process(self, monkeypatch):
+        # Arrange
+        decider = RemoteDecider(Board(3, 3), Pawn.Color.WHITE, address='/run/decider.sock')
+        parent = decider.client
+
+        # Act
+        monkeypatch.setattr(os, 'getpid', lambda: -1)
+        child = decider.client
+
+        # Assert
+        assert child is not parent
+        assert decider.client is child
+
+    # Decider errors are reported to the client
+    def test_remote_error(self):
+        with DeciderServer(FailingDecider, ('127.0.0.1', 0), workers=0).running() as address:
+            with pytest.raises(DeciderClient.RemoteError, match='awaria'):
+                DeciderClient(address).choose(Board(3, 3), Pawn.Color.WHITE)
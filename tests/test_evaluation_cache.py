@@ -0,0 +1,175 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from decider_negamax import DeciderNegamax
+from definitions.board import Board, Pawn
+from definitions.evaluation_cache import EvaluationCache, SharedEvaluationTable, cached_evaluation
+from definitions.shared_board import SharedMemoryBlock
+
+
+class DeciderCounting(DeciderNegamax):
+    calls = 0
+
+    @cached_evaluation(max_bytes=1 << 20)
+    def evaluate(self, color: Pawn.Color) -> float:
+        DeciderCounting.calls += 1
+        return super().evaluate(color)
+
+
+class DeciderDepth(DeciderNegamax):
+
+    @cached_evaluation(max_bytes=1 << 20)
+    def evaluate_at(self, color: Pawn.Color, depth: int) -> float:
+        return depth
+
+    @cached_evaluation(max_bytes=1 << 20)
+    def evaluate_with(self, color: Pawn.Color, *, bonus: int = 0, scale: int = 1) -> float:
+        return bonus * scale
+
+
+class TestEvaluationCache:
+
+    # Least recently used entries are evicted first
+    def test_lru_eviction(self):
+        # Arrange
+        cache = EvaluationCache(max_bytes=2 * EvaluationCache.ENTRY_SIZE)
+
+        # Act
+        cache.put(1, 0.5)
+        cache.put(2, -0.5)
+        cache.get(1)
+        cache.put(3, 1.0)
+
+        # Assert
+        assert 1 in cache and 3 in cache
+        assert cache.get(2) is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 1, 1, 2)
+        assert stats.hit_rate == 0.5
+
+    # A budget smaller than one entry is rejected
+    def test_too_small(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            EvaluationCache(max_bytes=1)
+
+    # The decorator evaluates each position once across decider instances; the symmetric start
+    # position with black to move shares the canonical key
+    def test_decorator(self):
+        # Arrange
+        board = Board(5, 5, compact=True)
+        cache = DeciderCounting.evaluate.cache
+        cache.clear()
+        DeciderCounting.calls = 0
+        first = DeciderCounting(board, Pawn.Color.WHITE)
+        second = DeciderCounting(board.clone(), Pawn.Color.WHITE)
+
+        # Act
+        values = [first.evaluate(Pawn.Color.WHITE), second.evaluate(Pawn.Color.WHITE),
+                  first.evaluate(Pawn.Color.BLACK)]
+
+        # Assert
+        assert values[0] == values[1] == DeciderNegamax(board, Pawn.Color.WHITE).evaluate(Pawn.Color.WHITE)
+        assert DeciderCounting.calls == 1
+        assert cache.stats().hits == 2
+
+    # Arguments after the color are part of the key
+    def test_extra_arguments(self):
+        # Arrange
+        decider = DeciderDepth(Board(4, 4, compact=True), Pawn.Color.WHITE)
+
+        # Act
+        values = [decider.evaluate_at(Pawn.Color.WHITE, depth) for depth in (1, 2, 1)]
+
+        # Assert
+        assert values == [1, 2, 1]
+        assert DeciderDepth.evaluate_at.cache.stats().hits == 1
+        with pytest.raises(TypeError):
+            decider.evaluate_at(Pawn.Color.WHITE, [1])
+
+    # Keyword arguments are part of the key regardless of their order
+    def test_keyword_arguments(self):
+        # Arrange
+        decider = DeciderDepth(Board(4, 4, compact=True), Pawn.Color.WHITE)
+        cache = DeciderDepth.evaluate_with.cache
+
+        # Act
+        first = decider.evaluate_with(Pawn.Color.WHITE, bonus=2, scale=3)
+        swapped = decider.evaluate_with(color=Pawn.Color.WHITE, scale=3, bonus=2)
+        other = decider.evaluate_with(Pawn.Color.WHITE, bonus=1)
+        depth = decider.evaluate_at(Pawn.Color.WHITE, depth=4)
+
+        # Assert
+        assert (first, swapped, other, depth) == (6, 6, 1, 4)
+        assert (cache.stats().hits, cache.stats().size) == (1, 2)
+        assert decider.evaluate_at(Pawn.Color.WHITE, 4) == 4
+        with pytest.raises(TypeError):
+            decider.evaluate_with(Pawn.Color.WHITE, bonus=[1])
+
+    # A search with the cached evaluation picks the same move
+    def test_search(self):
+        # Arrange
+        board = Board(4, 6, compact=True)
+
+        # Act
+        cached = DeciderCounting(board, Pawn.Color.WHITE, max_depth=3, time_budget=10).find_move()
+        plain = DeciderNegamax(board, Pawn.Color.WHITE, max_depth=3, time_budget=10).find_move()
+
+        # Assert
+        assert cached == plain
+        assert DeciderCounting.evaluate.cache.stats().hits > 0
+
+
+class TestSharedEvaluationTable:
+
+    # Evaluations stored in one process are visible in a worker process
+    def test_shared_between_processes(self):
+        with SharedEvaluationTable(max_bytes=1 << 12) as table:
+            # Arrange
+            table.put(12345, 0.25)
+
+            # Act
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                seen = pool.submit(table.get, 12345).result()
+                pool.submit(table.put, 777, -1.5).result()
+
+            # Assert
+            assert seen == 0.25
+            assert table.get(777) == -1.5
+            assert table.get(778) is None
+            assert len(pickle.dumps(table)) < 200
+
+    # A local miss falls back to the shared table
+    def test_second_level(self):
+        with SharedEvaluationTable(max_bytes=1 << 12) as table:
+            # Arrange
+            writer = EvaluationCache(shared=table)
+            reader = EvaluationCache(shared=SharedEvaluationTable.attach(table.name))
+            writer.put(42, 3.0)
+
+            # Act
+            value = reader.get(42)
+            table.clear()
+
+            # Assert
+            assert value == 3.0
+            assert reader.stats().shared_hits == 1
+            assert reader.get(42) == 3.0
+            assert table.get(42) is None
+            assert table.get(0) is None
+
+    # The table shares the shared-memory lifecycle of the board: only the owner removes the block
+    def test_lifecycle(self):
+        with SharedEvaluationTable(max_bytes=1 << 12) as table:
+            # Act
+            reader = SharedEvaluationTable.attach(table.name)
+
+            # Assert
+            assert isinstance(table, SharedMemoryBlock)
+            assert reader is SharedEvaluationTable.attach(table.name)
+            assert table.is_owner and not reader.is_owner
+            with pytest.raises(SharedMemoryBlock.NotOwner):
+                reader.unlink()
+        assert reader._closed
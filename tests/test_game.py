@@ -0,0 +1,145 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from decider_example import DeciderExample
+from decider_negamax import DeciderNegamax
+from decider_nim import DeciderNim
+from definitions.board import Board, Pawn
+from definitions.decider_base import DeciderBase
+from definitions.game import ERROR, ILLEGAL, NO_MOVES, TIMEOUT, PendingMove, play_game
+
+
+class SlowDecider(DeciderExample):
+    def move(self) -> None:
+        time.sleep(0.05)
+        super().move()
+
+
+class HangingDecider(DeciderExample):
+    def move(self) -> None:
+        time.sleep(5)
+        super().move()
+
+
+class PassingDecider(DeciderExample):
+    def move(self) -> None:
+        pass
+
+
+class FailingDecider(DeciderBase):
+    def find_move(self) -> None:
+        raise RuntimeError()
+
+
+class TestPlayGame:
+
+    # Optimal decider wins a winning position against a random one
+    def test_nim_beats_random(self):
+        # Act
+        result = play_game(DeciderNim, DeciderExample, 3, 6)
+
+        # Assert
+        assert result.winner == Pawn.Color.WHITE
+        assert result.reason == NO_MOVES
+        assert result.plies == len(result.white_times) + len(result.black_times)
+        assert result.plies % 2 == 1
+
+    # Exceeding the move time limit loses the game and the late move is not played
+    def test_timeout(self):
+        result = play_game(DeciderExample, SlowDecider, 3, 6, move_time_limit=0.01)
+        assert result.winner == Pawn.Color.WHITE
+        assert result.reason == TIMEOUT
+        assert result.plies == 1
+
+    # A hanging decider loses when the deadline passes instead of stalling the game
+    def test_hanging_decider(self):
+        # Act
+        start = time.perf_counter()
+        result = play_game(HangingDecider, DeciderExample, 3, 6, move_time_limit=0.05)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert (result.winner, result.reason, result.plies) == (Pawn.Color.BLACK, TIMEOUT, 0)
+        assert elapsed < 1
+
+    # Moves played within the limit count the same as without it
+    def test_limit_keeps_moves(self):
+        # Act
+        result = play_game(DeciderNim, DeciderExample, 3, 6, move_time_limit=5)
+
+        # Assert
+        assert (result.winner, result.reason) == (Pawn.Color.WHITE, NO_MOVES)
+        assert result.plies == len(result.white_times) + len(result.black_times)
+        result = play_game(DeciderExample, FailingDecider, 3, 6, move_time_limit=5)
+        assert (result.winner, result.reason, result.plies) == (Pawn.Color.WHITE, ERROR, 1)
+
+    # Observers see every committed move once, but not the moves tried during a search
+    @pytest.mark.parametrize("move_time_limit", [None, 5])
+    def test_observers(self, move_time_limit):
+        # Arrange
+        class Observer:
+            def __init__(self):
+                self.seen = []
+
+            def on_commit(self, board, move):
+                self.seen.append((len(board.moves), move.color, move.board))
+
+        observer = Observer()
+
+        # Act
+        result = play_game(DeciderNegamax, DeciderExample, 3, 6, move_time_limit=move_time_limit,
+                           observers=[observer])
+
+        # Assert
+        assert len(observer.seen) == result.plies
+        assert observer.seen[:2] == [(1, Pawn.Color.WHITE, None), (2, Pawn.Color.BLACK, None)]
+
+    # Not moving or raising loses the game
+    def test_illegal_and_error(self):
+        result = play_game(PassingDecider, DeciderExample, 3, 6)
+        assert (result.winner, result.reason, result.plies) == (Pawn.Color.BLACK, ILLEGAL, 0)
+        result = play_game(DeciderExample, FailingDecider, 3, 6)
+        assert (result.winner, result.reason, result.plies) == (Pawn.Color.WHITE, ERROR, 1)
+
+
+class TestPendingMove:
+
+    # The move is made on a clone and reaches the game board only on commit
+    @pytest.mark.parametrize('pool', [False, True])
+    def test_commit(self, pool):
+        # Arrange
+        board = Board(3, 6)
+        decider = DeciderExample(board, Pawn.Color.WHITE)
+        executor = ThreadPoolExecutor(1) if pool else None
+
+        # Act
+        pending = PendingMove(decider, board, Pawn.Color.WHITE, executor)
+        pending.future.result(5)
+        played = len(board.moves)
+        failure = pending.failure()
+        move = pending.commit()
+
+        # Assert
+        assert played == 0
+        assert failure is None
+        assert board.moves == [move]
+        if executor is not None:
+            executor.shutdown()
+
+    # A decider that does not move or raises is reported, and the board is left unchanged
+    def test_failure(self):
+        # Arrange
+        board = Board(3, 6)
+
+        # Act
+        passing = PendingMove(PassingDecider(board, Pawn.Color.WHITE), board, Pawn.Color.WHITE)
+        failing = PendingMove(FailingDecider(board, Pawn.Color.WHITE), board, Pawn.Color.WHITE)
+        passing.future.exception(5)
+        failing.future.exception(5)
+
+        # Assert
+        assert passing.failure() == ILLEGAL
+        assert failing.failure() == ERROR
+        assert board.moves == []
@@ -0,0 +1,68 @@
+import pstats
+
+from decider_example import DeciderExample
+from definitions import instrumentation
+from definitions.board import Board, Move, Pawn
+from definitions.game import play_game
+
+
+class TestInstrumentation:
+
+    # Disabled instrumentation leaves the original methods in place
+    def test_disabled_is_free(self):
+        # Arrange
+        original = Board.__dict__['get']
+
+        # Act
+        instrumentation.enable()
+        patched = Board.__dict__['get']
+        instrumentation.disable()
+
+        # Assert
+        assert patched is not original
+        assert Board.__dict__['get'] is original
+        assert DeciderExample.__dict__['find_move'] is not patched
+
+    # Calls of the hot-path methods are counted only while enabled
+    def test_counts_calls(self):
+        # Arrange
+        board = Board(4, 4, compact=True)
+
+        # Act
+        with instrumentation.instrumented() as stats:
+            board.get(0, 0)
+            board.get(1, 1)
+            board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 1))
+        board.get(2, 2)
+        summary = stats()
+
+        # Assert
+        assert summary['Board.get']['calls'] == 2
+        assert summary['Move._find_from_field']['calls'] == 1
+        assert summary['Move.validate']['calls'] >= 1
+        assert summary['Board.move_pawn']['seconds'] >= 0
+        assert not instrumentation.is_enabled()
+
+    # A game played with instrument=True carries its own summary
+    def test_game_profile(self):
+        # Act
+        result = play_game(DeciderExample, DeciderExample, 5, 5, instrument=True)
+        plain = play_game(DeciderExample, DeciderExample, 5, 5)
+
+        # Assert
+        assert result.profile['DeciderBase.move']['calls'] == result.plies
+        assert result.profile['DeciderExample.find_move']['calls'] == result.plies
+        assert plain.profile is None
+
+    # Summary can be exported and cProfile stats are written to a file
+    def test_export_and_profiled(self, tmp_path):
+        # Act
+        with instrumentation.instrumented():
+            Board(3, 3).get(0, 0)
+            instrumentation.export_summary(str(tmp_path / 'summary.json'))
+        with instrumentation.profiled(str(tmp_path / 'run.prof')):
+            play_game(DeciderExample, DeciderExample, 4, 4)
+
+        # Assert
+        assert 'Board.get' in (tmp_path / 'summary.json').read_text()
+        assert pstats.Stats(str(tmp_path / 'run.prof')).total_calls > 0
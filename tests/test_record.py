@@ -0,0 +1,170 @@
+import io
+
+import pytest
+
+from decider_example import DeciderExample
+from decider_negamax import DeciderNegamax
+from definitions.board import Board, Move, Pawn
+from definitions.record import GameWriter, InvalidRecord, encode_varint, read_games
+
+
+def play_random_game(board: Board) -> None:
+    deciders = [DeciderExample(board, Pawn.Color.WHITE), DeciderExample(board, Pawn.Color.BLACK)]
+    while board.count_legal_moves(deciders[0].color):
+        deciders[0].move()
+        deciders.reverse()
+
+
+class TestGameRecord:
+
+    # Varints use 7 bits per byte
+    def test_varint(self):
+        # Assert
+        assert encode_varint(0) == b'\x00'
+        assert encode_varint(127) == b'\x7f'
+        assert encode_varint(300) == b'\xac\x02'
+
+    # Several games written to one stream are read back move by move
+    def test_round_trip(self):
+        # Arrange
+        stream = io.BytesIO()
+        writer = GameWriter(stream)
+        boards = [Board(8, 8, compact=True), Board(200, 300, compact=True)]
+
+        # Act
+        for board in boards:
+            with writer.recording(board):
+                play_random_game(board)
+        stream.seek(0)
+        records = list(read_games(stream))
+
+        # Assert
+        assert writer.games == 2
+        for board, record in zip(boards, records):
+            assert (record.n, record.m) == (board.n, board.m)
+            assert record.moves == [(move.column, move.amount) for move in board.moves]
+            assert record.to_board().zobrist_hash == board.zobrist_hash
+
+    # A move takes two bytes on a small board
+    def test_compact_size(self):
+        # Arrange
+        stream = io.BytesIO()
+        board = Board(8, 8)
+        board.apply_moves([(Pawn.Color.WHITE, 0, 1), (Pawn.Color.BLACK, 1, 2)])
+
+        # Act
+        GameWriter(stream).write_game(board)
+
+        # Assert
+        assert len(stream.getvalue()) == 4 + 2 + 2 * 2 + 1
+
+    # Undone moves, e.g. from a search on the live board, are not recorded
+    def test_undo_is_not_recorded(self):
+        # Arrange
+        stream = io.BytesIO()
+        writer = GameWriter(stream)
+        board = Board(4, 6)
+
+        # Act
+        with writer.recording(board):
+            board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 2))
+            board.undo()
+            DeciderNegamax(board, Pawn.Color.WHITE, time_budget=0.05).move()
+        stream.seek(0)
+        record = next(read_games(stream))
+
+        # Assert
+        assert record.moves == [(move.column, move.amount) for move in board.moves]
+
+    # Moves out of turn are refused before they are made
+    def test_out_of_turn(self):
+        # Arrange
+        board = Board(4, 4)
+        writer = GameWriter(io.BytesIO())
+        writer.start(board)
+
+        # Act
+        with pytest.raises(GameWriter.OutOfTurn):
+            board.move_pawn(Move(board, Pawn.Color.BLACK, 0, 1))
+
+        # Assert
+        assert board.moves == []
+        assert board.pawn_row(Pawn.Color.BLACK, 0) == 3
+
+    # Moves older than the undo depth reach the stream before the game is finished
+    def test_streams_moves(self):
+        # Arrange
+        stream = io.BytesIO()
+        writer = GameWriter(stream, undo_depth=2)
+        board = Board(8, 8)
+        writer.start(board)
+
+        # Act
+        header = len(stream.getvalue())
+        for column in range(3):
+            board.move_pawn(Move(board, Pawn.Color.WHITE, column, 1))
+            board.move_pawn(Move(board, Pawn.Color.BLACK, column, 1))
+        streamed = stream.getvalue()
+        writer.finish()
+
+        # Assert
+        assert len(streamed) > header > 0
+        assert stream.getvalue().startswith(streamed)
+        assert next(read_games(io.BytesIO(stream.getvalue()))).moves == [
+            (move.column, move.amount) for move in board.moves]
+
+    # A move stopped by a listener registered after the writer is not recorded
+    def test_vetoed_move_is_not_recorded(self):
+        # Arrange
+        class Veto:
+            def on_move(self, board, move):
+                if move.column == 1:
+                    raise ValueError(move)
+
+            def on_undo(self, board, move):
+                pass
+
+        stream = io.BytesIO()
+        writer = GameWriter(stream)
+        board = Board(4, 4)
+
+        # Act
+        with writer.recording(board):
+            board.add_listener(Veto())
+            with pytest.raises(ValueError):
+                board.move_pawn(Move(board, Pawn.Color.WHITE, 1, 1))
+            board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 1))
+        stream.seek(0)
+        record = next(read_games(stream))
+
+        # Assert
+        assert record.moves == [(0, 1)]
+
+    # Undoing a move that was already streamed is refused
+    def test_undo_beyond_depth(self):
+        # Arrange
+        board = Board(4, 4)
+        writer = GameWriter(io.BytesIO(), undo_depth=1)
+        writer.start(board)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 1))
+        board.move_pawn(Move(board, Pawn.Color.BLACK, 0, 1))
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 1, 1))
+        board.undo()
+        board.undo()
+
+        # Act & Assert
+        with pytest.raises(GameWriter.AlreadyWritten):
+            board.undo()
+
+    # Truncated or foreign data is rejected
+    def test_invalid_record(self):
+        # Arrange
+        stream = io.BytesIO()
+        GameWriter(stream).write_game(Board(4, 4))
+        data = stream.getvalue()
+
+        # Act & Assert
+        with pytest.raises(InvalidRecord):
+            list(read_games(io.BytesIO(data[:-1])))
+        with pytest.raises(InvalidRecord):
+            list(read_games(io.BytesIO(b'XXXX' + data[4:])))
@@ -0,0 +1,142 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from definitions.board import Board, BoardView, Move, Pawn
+from definitions.shared_board import SharedBoard
+
+
+@pytest.fixture
+def shared():
+    with SharedBoard(5, 6) as board:
+        yield board
+
+
+class TestSharedBoard:
+
+    # A shared board keeps the same state as an ordinary board
+    def test_matches_board(self, shared):
+        # Arrange
+        board = Board(5, 6, compact=True)
+
+        # Act
+        for target in (shared, board):
+            target.move_pawn(Move(target, Pawn.Color.WHITE, 1, 2))
+            target.move_pawn(Move(target, Pawn.Color.BLACK, 3, 1))
+
+        # Assert
+        assert shared.to_text() == board.to_text()
+        assert shared.nim_sum == board.nim_sum
+        assert shared.zobrist_hash == board.zobrist_hash
+        assert shared.canonical_key(Pawn.Color.WHITE) == board.canonical_key(Pawn.Color.WHITE)
+        assert shared.mobility(Pawn.Color.BLACK) == board.mobility(Pawn.Color.BLACK)
+        assert shared.open_columns == board.open_columns
+
+    # Moves of the owner are visible to an attached board without copying
+    def test_attached_reads_moves(self, shared):
+        # Arrange
+        reader = SharedBoard.attach(shared.name)
+
+        # Act
+        shared.move_pawn(Move(shared, Pawn.Color.WHITE, 0, 3))
+
+        # Assert
+        assert reader.pawn_row(Pawn.Color.WHITE, 0) == 3
+        assert reader.to_move == Pawn.Color.BLACK
+        assert reader.plies == 1
+        assert reader.nim_sum == shared.nim_sum
+        assert SharedBoard.attach(shared.name) is reader
+
+    # Every move and undo bumps the version by two and stale reads are detected
+    def test_version(self, shared):
+        # Arrange
+        reader = SharedBoard.attach(shared.name)
+        version = reader.version
+
+        # Act
+        shared.move_pawn(Move(shared, Pawn.Color.WHITE, 0, 1))
+        moved = reader.version
+        shared.undo()
+
+        # Assert
+        assert version % 2 == 0
+        assert moved == version + 2
+        assert reader.version == version + 4
+        assert reader.changed_since(version)
+        assert not reader.changed_since(reader.version)
+
+    # An attached board cannot be changed
+    def test_attached_is_read_only(self, shared):
+        # Arrange
+        reader = SharedBoard.attach(shared.name)
+
+        # Act & Assert
+        with pytest.raises(BoardView.ReadOnly):
+            reader.move_pawn(Move(reader, Pawn.Color.WHITE, 0, 1))
+        with pytest.raises(SharedBoard.NotOwner):
+            reader.clear_all_pawns()
+        with pytest.raises(SharedBoard.NotOwner):
+            reader.unlink()
+        assert shared.pawn_row(Pawn.Color.WHITE, 0) == 0
+
+    # Pickling sends only the name and the clone is an independent board
+    def test_pickle_and_clone(self, shared):
+        # Act
+        data = pickle.dumps(shared)
+        reader = pickle.loads(data)
+        clone = reader.clone()
+        shared.move_pawn(Move(shared, Pawn.Color.WHITE, 2, 1))
+
+        # Assert
+        assert shared.name.encode() in data
+        assert len(data) < 200
+        assert type(clone) is Board
+        assert clone.pawn_row(Pawn.Color.WHITE, 2) == 0
+        assert reader.pawn_row(Pawn.Color.WHITE, 2) == 1
+
+    # Worker processes read the current position of the owner
+    def test_worker_processes(self, shared):
+        # Arrange
+        shared.move_pawn(Move(shared, Pawn.Color.WHITE, 4, 2))
+
+        # Act
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(shared.read, SharedBoard.to_text).result()
+            shared.move_pawn(Move(shared, Pawn.Color.BLACK, 4, 1))
+            second = pool.submit(shared.read, SharedBoard.to_text).result()
+
+        # Assert
+        assert first == '5x6 0/5 0/5 0/5 0/5 2/5'
+        assert second == shared.to_text() == '5x6 0/5 0/5 0/5 0/5 2/4'
+
+    # A shared board can be created from an existing board
+    def test_from_board(self):
+        # Arrange
+        board = Board.from_text('3x5 0/4 2/4 ./1')
+
+        # Act
+        with SharedBoard.from_board(board) as shared:
+            text = shared.to_text()
+            nim_sum = shared.nim_sum
+            version = shared.version
+
+        # Assert
+        assert text == board.to_text()
+        assert nim_sum == board.nim_sum
+        assert version % 2 == 0
+
+    # An attached board finds open columns in the current position of the owner
+    def test_attached_heap_index(self, shared):
+        # Arrange
+        reader = SharedBoard.attach(shared.name)
+        assert reader.any_open_column() is not None
+
+        # Act
+        for column in range(shared.n):
+            shared.move_pawn(Move(shared, Pawn.Color.WHITE, column, 4))
+        column = shared.any_open_column()
+
+        # Assert
+        assert column is None
+        assert reader.any_open_column() is None
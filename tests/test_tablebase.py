@@ -0,0 +1,135 @@
+import os
+from functools import reduce
+from itertools import combinations_with_replacement
+from operator import xor
+
+import pytest
+
+import decider_tablebase
+from decider_tablebase import DeciderTablebase
+from definitions.board import Board, Move, Pawn
+from definitions.tablebase import Tablebase, build_tablebase, main, position_count, rank
+
+
+@pytest.fixture(scope='module')
+def tablebase_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('tablebase') / 'tablebase.bin')
+    build_tablebase(path, 3, 7)
+    return path
+
+
+class TestTablebase:
+
+    # Sorted heap multisets are numbered 0..C(H + K, K) - 1 without gaps
+    def test_rank_is_a_perfect_hash(self):
+        # Act
+        ranks = sorted(rank(heaps) for heaps in combinations_with_replacement(range(8), 3))
+
+        # Assert
+        assert ranks == list(range(position_count(3, 7)))
+
+    # Every result matches the nim sum and every winning move leaves a zero nim sum
+    def test_results_are_exact(self, tablebase_path):
+        # Arrange
+        with Tablebase(tablebase_path) as tablebase:
+            for heaps in combinations_with_replacement(range(8), 3):
+                # Act
+                entry = tablebase.probe(heaps)
+
+                # Assert
+                nim_sum = reduce(xor, heaps)
+                assert entry.win == (nim_sum != 0)
+                if entry.win:
+                    after = list(heaps)
+                    assert after[entry.index] > entry.new_heap
+                    after[entry.index] = entry.new_heap
+                    assert reduce(xor, after) == 0
+
+    # Positions beyond the limits are not in the table
+    def test_probe_outside_limits(self, tablebase_path):
+        # Arrange
+        tablebase = Tablebase.shared(tablebase_path)
+
+        # Act & Assert
+        assert tablebase is Tablebase.shared(tablebase_path)
+        assert tablebase.probe([1, 2, 3, 4]) is None
+        assert tablebase.probe([8]) is None
+        assert tablebase.probe([0, 0, 0, 0, 5]) == tablebase.probe([5])
+
+    # The table is read on a board with many empty columns
+    def test_probe_board(self, tablebase_path):
+        # Arrange
+        board = Board(20, 6, with_pawns=False, compact=True)
+        for column, (white, black) in {3: (0, 4), 11: (1, 3)}.items():
+            board.get(column, white).add_pawn(Pawn(Pawn.Color.WHITE))
+            board.get(column, black).add_pawn(Pawn(Pawn.Color.BLACK))
+
+        # Act
+        win, (column, amount) = Tablebase.shared(tablebase_path).probe_board(board)
+
+        # Assert
+        assert win
+        assert (column, amount) == (3, 2)
+
+    # Invalid files are rejected
+    def test_invalid_file(self, tmp_path):
+        # Arrange
+        path = tmp_path / 'broken.bin'
+        path.write_bytes(b'not a tablebase at all')
+
+        # Act & Assert
+        with pytest.raises(Tablebase.InvalidFile):
+            Tablebase(str(path))
+
+    # Tablebase can be built from the command line
+    def test_main(self, tmp_path):
+        # Act
+        main(['--columns', '2', '--max-heap', '3', '--output', str(tmp_path / 'tb.bin')])
+
+        # Assert
+        assert len(Tablebase(str(tmp_path / 'tb.bin'))) == position_count(2, 3)
+
+
+class TestDeciderTablebase:
+
+    # Decider plays from the table when the position fits and searches otherwise
+    def test_table_then_search(self, tablebase_path):
+        # Arrange
+        board = Board(3, 7)
+        board.move_pawn(Move(board, Pawn.Color.WHITE, 0, 1))
+        decider = DeciderTablebase(board, Pawn.Color.BLACK, tablebase_path, time_budget=0.05)
+        wide = Board(6, 4)
+        searching = DeciderTablebase(wide, Pawn.Color.WHITE, tablebase_path, time_budget=0.05)
+
+        # Act
+        decider.move()
+        searching.move()
+
+        # Assert
+        assert decider.tablebase_hits == 1
+        assert board.nim_sum == 0
+        assert searching.tablebase_hits == 0
+        assert len(wide.moves) == 1
+
+    # Without a table file the decider only searches
+    def test_missing_file(self, tmp_path):
+        # Arrange
+        board = Board(3, 5)
+
+        # Act
+        decider = DeciderTablebase(board, Pawn.Color.WHITE, str(tmp_path / 'missing.bin'), time_budget=0.05)
+        decider.move()
+
+        # Assert
+        assert decider.tablebase is None
+        assert len(board.moves) == 1
+
+    # The default table path does not depend on the working directory
+    def test_default_path(self, tmp_path, monkeypatch):
+        # Act
+        monkeypatch.chdir(tmp_path)
+        decider = DeciderTablebase(Board(3, 5), Pawn.Color.WHITE, time_budget=0.05)
+
+        # Assert
+        project = os.path.dirname(os.path.abspath(decider_tablebase.__file__))
+        assert decider.tablebase_path == os.path.join(project, 'tablebase.bin')
@@ -0,0 +1,86 @@
+import json
+import time
+
+from decider_example import DeciderExample
+from decider_nim import DeciderNim
+from definitions.game import TIMEOUT
+from tournament import (MATCH_TIMEOUT, completed_matches, decider_name, load_decider, run_tournament,
+                        schedule, standings)
+
+
+class DeciderHanging(DeciderExample):
+    def move(self) -> None:
+        time.sleep(60)
+
+
+class TestTournament:
+
+    # Round-robin schedule alternates colors for every pair and size
+    def test_schedule(self):
+        matches = list(schedule([DeciderExample, DeciderNim], [(3, 5), (4, 4)], rounds=2))
+        assert len(matches) == 2 * 2 * 2
+        assert len({match['id'] for match in matches}) == len(matches)
+        assert sum(match['white'] == decider_name(DeciderNim) for match in matches) == 4
+        assert load_decider(decider_name(DeciderNim)) is DeciderNim
+
+    # Results are streamed to disk and a rerun resumes from them
+    def test_results_are_resumable(self, tmp_path):
+        # Arrange
+        output = str(tmp_path / 'results.jsonl')
+
+        # Act
+        first = run_tournament([DeciderExample, DeciderNim], [(3, 5)], output, rounds=2, workers=0)
+        with open(output, 'a') as results:
+            results.write('{"id": "broken')
+        second = run_tournament([DeciderExample, DeciderNim], [(3, 5), (5, 5)], output, workers=0)
+
+        # Assert
+        assert len(first) == 4
+        assert len(second) == 2
+        assert len(completed_matches(output)) == 6
+        lines = open(output).read().splitlines()
+        result = json.loads(lines[0])
+        assert {'winner', 'reason', 'plies', 'white_time_per_move', 'max_time_per_move'} <= result.keys()
+        table = standings(output)
+        assert table[decider_name(DeciderNim)]['wins'] + table[decider_name(DeciderExample)]['wins'] == 6
+
+    # Matches run in a process pool
+    def test_process_pool(self, tmp_path):
+        output = str(tmp_path / 'results.jsonl')
+        results = run_tournament([DeciderExample, DeciderNim], [(3, 5)], output, workers=2)
+        assert sorted(result['white'] for result in results) == sorted(
+            [decider_name(DeciderExample), decider_name(DeciderNim)])
+
+    # A decider exceeding the move time limit loses without stalling the pool
+    def test_move_time_limit(self, tmp_path):
+        # Arrange
+        output = str(tmp_path / 'results.jsonl')
+
+        # Act
+        results = run_tournament([DeciderExample, DeciderHanging], [(3, 5)], output, workers=1,
+                                 move_time_limit=0.05)
+
+        # Assert
+        assert [result['reason'] for result in results] == [TIMEOUT, TIMEOUT]
+        assert standings(output)[decider_name(DeciderExample)]['wins'] == 2
+
+    # A match exceeding the match timeout is recorded without a winner and the pool is rebuilt
+    def test_match_timeout(self, tmp_path):
+        # Arrange
+        output = str(tmp_path / 'results.jsonl')
+
+        # Act
+        start = time.perf_counter()
+        results = run_tournament([DeciderNim, DeciderExample, DeciderHanging], [(3, 5)], output,
+                                 workers=1, match_timeout=0.5)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert len(results) == len(completed_matches(output)) == 6
+        timed_out = [result for result in results if result['reason'] == MATCH_TIMEOUT]
+        assert len(timed_out) == 4
+        assert all(result['winner'] is None for result in timed_out)
+        assert all(decider_name(DeciderHanging) in (result['white'], result['black'])
+                   for result in timed_out)
+        assert sum(score['wins'] for score in standings(output).values()) == 2
+        assert elapsed < 20
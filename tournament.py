@@ -0,0 +1,280 @@
+"""
+Turniej programów decyzyjnych. Każda para programów rozgrywa partie na każdym z podanych rozmiarów
+plansz, raz białymi i raz czarnymi. Partie rozgrywane są równolegle w puli procesów, a wynik każdej
+z nich jest dopisywany do pliku JSON Lines zaraz po jej zakończeniu. Plik wyników jest jednocześnie
+punktem kontrolnym - ponowne uruchomienie turnieju z tym samym plikiem pomija partie już zapisane.
+
+Limit czasu na ruch egzekwowany jest w trakcie ruchu (`game.play_game`). Dodatkowo limit czasu
+partii (`match_timeout`) chroni turniej przed procesem, który przestał odpowiadać: partia, która go
+przekroczy, zapisywana jest bez zwycięzcy z powodem `match_timeout`, a procesy puli są zabijane
+i tworzone od nowa dla pozostałych partii.
+
+Przykład uruchomienia::
+
+    python tournament.py decider_example:DeciderExample decider_nim:DeciderNim \\
+        --sizes 8x8 16x16 --rounds 2 --output results.jsonl --move-time-limit 1
+"""
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations
+from time import monotonic
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type
+
+from decider_remote import ADDRESS_ENV
+from definitions.cli import decider_name, load_decider, parse_size
+from definitions.decider_base import DeciderBase
+from definitions.game import play_game
+
+MATCH_TIMEOUT = 'match_timeout'
+
+
+def schedule(deciders: Sequence[Type[DeciderBase]],
+             sizes: Sequence[Tuple[int, int]],
+             rounds: int = 1) -> Iterator[Dict]:
+    """
+    Generuje wszystkie partie turnieju: każda para programów gra na każdym rozmiarze planszy
+    `rounds` razy każdym kolorem.
+
+    :return: Opisy partii ze stabilnym identyfikatorem `id`
+    :type: Iterator[Dict]
+    """
+    for n, m in sizes:
+        for first, second in combinations(deciders, 2):
+            for round_number in range(rounds):
+                for white, black in ((first, second), (second, first)):
+                    white_name, black_name = decider_name(white), decider_name(black)
+                    yield {
+                        'id': f'{white_name}|{black_name}|{n}x{m}|{round_number}',
+                        'white': white_name,
+                        'black': black_name,
+                        'n': n,
+                        'm': m,
+                        'round': round_number,
+                    }
+
+
+def completed_matches(path: str) -> Set[str]:
+    """
+    Odczytuje identyfikatory partii zapisanych już w pliku wyników. Niekompletna ostatnia linia
+    (np. po awarii w trakcie zapisu) jest pomijana.
+
+    :param path: Ścieżka do pliku wyników
+    :type path: str
+
+    :return: Identyfikatory zakończonych partii
+    :type: Set[str]
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as results:
+        for line in results:
+            try:
+                done.add(json.loads(line)['id'])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _drop_partial_line(path: str) -> None:
+    """
+    Usuwa z końca pliku wyników linię przerwaną w trakcie zapisu, aby kolejne wyniki nie zostały do
+    niej doklejone.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as results:
+        end = position = results.seek(0, os.SEEK_END)
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            results.seek(position)
+            chunk = results.read(step)
+            if position + step == end and chunk.endswith(b'\n'):
+                return
+            newline = chunk.rfind(b'\n')
+            if newline >= 0:
+                results.truncate(position + newline + 1)
+                return
+        results.truncate(0)
+
+
+def play_match(match: Dict, move_time_limit: Optional[float]) -> Dict:
+    """
+    Rozgrywa jedną partię turnieju. Funkcja jest wykonywana w procesach puli.
+
+    :return: Opis partii uzupełniony o jej wynik
+    :type: Dict
+    """
+    result = play_game(load_decider(match['white']), load_decider(match['black']),
+                       match['n'], match['m'], move_time_limit)
+    times = result.white_times + result.black_times
+    return {
+        **match,
+        'winner': result.winner.name,
+        'reason': result.reason,
+        'plies': result.plies,
+        'white_time_per_move': sum(result.white_times) / max(len(result.white_times), 1),
+        'black_time_per_move': sum(result.black_times) / max(len(result.black_times), 1),
+        'max_time_per_move': max(times, default=0.0),
+    }
+
+
+def _terminate(executor: ProcessPoolExecutor) -> None:
+    """
+    Zamyka pulę bez czekania na trwające partie i zabija jej procesy.
+    """
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+
+def _play_in_pool(pending: Sequence[Dict],
+                  record: Callable[[Dict], None],
+                  workers: Optional[int],
+                  move_time_limit: Optional[float],
+                  match_timeout: Optional[float]) -> None:
+    """
+    Rozgrywa partie w puli procesów. Do puli trafia najwyżej tyle partii, ile jest procesów, więc
+    czas partii liczony jest od jej przekazania do puli. Po przekroczeniu `match_timeout` partia
+    zapisywana jest z powodem `MATCH_TIMEOUT`, a pula jest tworzona od nowa; pozostałe przerwane
+    partie są rozgrywane ponownie.
+    """
+    workers = workers or os.cpu_count() or 1
+    queue = deque(pending)
+    while queue:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        running: Dict = {}
+        expired = False
+        try:
+            while (queue or running) and not expired:
+                while queue and len(running) < workers:
+                    match = queue.popleft()
+                    running[executor.submit(play_match, match, move_time_limit)] = (match, monotonic())
+                timeout = None
+                if match_timeout is not None:
+                    first_started = min(started for _, started in running.values())
+                    timeout = max(first_started + match_timeout - monotonic(), 0.0)
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    record(future.result())
+                for future, (match, started) in list(running.items()):
+                    if match_timeout is not None and monotonic() - started >= match_timeout:
+                        running.pop(future)
+                        record({**match, 'winner': None, 'reason': MATCH_TIMEOUT})
+                        expired = True
+        finally:
+            if expired or running:
+                queue.extendleft(reversed([match for match, _ in running.values()]))
+                _terminate(executor)
+            else:
+                executor.shutdown()
+
+
+def run_tournament(deciders: Sequence[Type[DeciderBase]],
+                   sizes: Sequence[Tuple[int, int]],
+                   output: str,
+                   rounds: int = 1,
+                   workers: Optional[int] = None,
+                   move_time_limit: Optional[float] = None,
+                   match_timeout: Optional[float] = None) -> List[Dict]:
+    """
+    Rozgrywa turniej każdy z każdym. Wyniki partii są dopisywane do pliku `output` w kolejności
+    ich zakończenia; partie zapisane w nim wcześniej nie są rozgrywane ponownie.
+
+    :param deciders: Klasy programów decyzyjnych (zdefiniowane na poziomie modułu)
+    :type deciders: Sequence[Type[DeciderBase]]
+    :param sizes: Rozmiary plansz jako pary (n, m)
+    :type sizes: Sequence[Tuple[int, int]]
+    :param output: Ścieżka do pliku wyników w formacie JSON Lines
+    :type output: str
+    :param rounds: Liczba partii każdej pary każdym kolorem na każdym rozmiarze planszy
+    :type rounds: int
+    :param workers: Liczba procesów; domyślnie liczba rdzeni. 0 oznacza grę w bieżącym procesie
+    :type workers: Optional[int]
+    :param move_time_limit: Limit czasu na jeden ruch w sekundach
+    :type move_time_limit: Optional[float]
+    :param match_timeout: Limit czasu całej partii w puli procesów w sekundach
+    :type match_timeout: Optional[float]
+
+    :return: Wyniki partii rozegranych w tym wywołaniu
+    :type: List[Dict]
+    """
+    _drop_partial_line(output)
+    done = completed_matches(output)
+    pending = [match for match in schedule(deciders, sizes, rounds) if match['id'] not in done]
+    results = []
+
+    with open(output, 'a', encoding='utf-8') as results_file:
+        def record(result: Dict) -> None:
+            results_file.write(json.dumps(result) + '\n')
+            results_file.flush()
+            os.fsync(results_file.fileno())
+            results.append(result)
+
+        if workers == 0:
+            for match in pending:
+                record(play_match(match, move_time_limit))
+        else:
+            _play_in_pool(pending, record, workers, move_time_limit, match_timeout)
+    return results
+
+
+def standings(path: str) -> Dict[str, Dict[str, int]]:
+    """
+    Podsumowuje wszystkie partie zapisane w pliku wyników.
+
+    Partie przerwane po przekroczeniu limitu czasu partii nie mają zwycięzcy i są pomijane.
+
+    :return: Liczba wygranych i przegranych każdego programu
+    :type: Dict[str, Dict[str, int]]
+    """
+    table: Dict[str, Dict[str, int]] = {}
+    with open(path, encoding='utf-8') as results:
+        for line in results:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result.get('winner') is None:
+                continue
+            winner = result[result['winner'].lower()]
+            loser = result['black' if winner == result['white'] else 'white']
+            table.setdefault(winner, {'wins': 0, 'losses': 0})['wins'] += 1
+            table.setdefault(loser, {'wins': 0, 'losses': 0})['losses'] += 1
+    return table
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Turniej programów decyzyjnych każdy z każdym.')
+    parser.add_argument('deciders', nargs='+', help='programy w postaci moduł:Klasa')
+    parser.add_argument('--sizes', nargs='+', default=['8x8'], help='rozmiary plansz, np. 8x8 16x32')
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--output', default='tournament.jsonl')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--move-time-limit', type=float, default=None)
+    parser.add_argument('--match-timeout', type=float, default=None)
+    parser.add_argument('--decider-address', default=None,
+                        help='adres serwera programu decider_remote:RemoteDecider '
+                             '(host:port lub ścieżka gniazda Unix)')
+    args = parser.parse_args(argv)
+
+    if args.decider_address is not None:
+        os.environ[ADDRESS_ENV] = args.decider_address
+
+    run_tournament([load_decider(name) for name in args.deciders],
+                   [parse_size(size) for size in args.sizes],
+                   args.output, args.rounds, args.workers, args.move_time_limit, args.match_timeout)
+    for name, score in sorted(standings(args.output).items(), key=lambda item: -item[1]['wins']):
+        print(f"{name}: {score['wins']} wygranych, {score['losses']} przegranych")
+
+
+if __name__ == '__main__':
+    main()